@@ -0,0 +1,5 @@
+# pypolys package
+
+from pypolys.profiling import profile
+
+# EOF
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+# Testy wydajnosci wielomianow, uruchamianie:
+# python3 -m pypolys.bench [--quick] [--filter mul] [--output base.json]
+# python3 -m pypolys.bench --compare base.json [--tolerance 0.2]
+# Wynik to JSON {nazwa: czas jednego wywolania w sekundach}.
+
+import argparse
+import json
+import platform
+import random
+import sys
+import timeit
+from fractions import Fraction
+from pypolys import polys
+from pypolys import mpolys
+from pypolys.factory import PolyFactory
+
+KINDS = ("int", "Fraction", "float", "complex")
+
+
+def random_coefficient(kind, rng):
+    """Return a random nonzero coefficient of the given kind."""
+    value = rng.choice([-1, 1]) * rng.randint(1, 99)
+    if kind == "int":
+        return value
+    elif kind == "Fraction":
+        return Fraction(value, rng.randint(1, 99))
+    elif kind == "float":
+        return value / 7.0
+    elif kind == "complex":
+        return complex(value, rng.randint(-99, 99)) / 7.0
+    raise ValueError("unknown coefficient kind")
+
+
+def random_poly(degree, density=1.0, kind="int", nvars=1, seed=0):
+    """Return a random poly (polys.Poly for nvars=1, else mpolys.Poly)."""
+    # density - udzial niezerowych wyrazow wsrod mozliwych.
+    rng = random.Random(seed)
+    if nvars == 1:
+        data = dict((k, random_coefficient(kind, rng))
+            for k in range(degree + 1) if rng.random() < density)
+        data[degree] = random_coefficient(kind, rng)
+        return polys.Poly._fromdict(data)
+    poly = mpolys.Poly()
+    n = max(1, int(density * (degree + 1) ** nvars))
+    for i in range(n):
+        key = [rng.randint(0, degree) for j in range(nvars)]
+        poly += mpolys.Poly(random_coefficient(kind, rng), *key)
+    return poly
+
+
+def _cases(quick=False):
+    """Yield (name, callable) for all benchmarks."""
+    scale = 1 if quick else 4
+    for kind in KINDS:
+        for (degree, density) in [(25 * scale, 1.0), (100 * scale, 1.0),
+                                  (100 * scale, 0.05)]:
+            p = random_poly(degree, density, kind, seed=1)
+            q = random_poly(degree, density, kind, seed=2)
+            suffix = "{}/deg={}/density={}".format(kind, degree, density)
+            yield ("polys.mul/" + suffix, lambda p=p, q=q: p * q)
+            x = Fraction(1, 3) if kind == "Fraction" else 0.5
+            yield ("polys.eval/" + suffix, lambda p=p, x=x: p.eval(x))
+            yield ("polys.diff/" + suffix, p.diff)
+            yield ("polys.integrate/" + suffix, p.integrate)
+            yield ("polys.repr/" + suffix, lambda p=p: repr(p))
+        p = random_poly(4 * scale, 1.0, kind, seed=3)
+        q = random_poly(3, 1.0, kind, seed=4)
+        suffix = "{}/deg={}".format(kind, 4 * scale)
+        yield ("polys.power1/" + suffix, lambda p=p: p._power1(6))
+        yield ("polys.power3/" + suffix, lambda p=p: p._power3(6))
+        yield ("polys.combine1/" + suffix, lambda p=p, q=q: p._combine1(q))
+        yield ("polys.combine2/" + suffix, lambda p=p, q=q: p._combine2(q))
+        for nvars in (2, 3):
+            degree = 3 * scale
+            for density in (1.0, 0.1):
+                p = random_poly(degree, density, kind, nvars, seed=5)
+                q = random_poly(degree, density, kind, nvars, seed=6)
+                suffix = "{}/nvars={}/deg={}/density={}".format(
+                    kind, nvars, degree, density)
+                yield ("mpolys.mul/" + suffix, lambda p=p, q=q: p * q)
+                yield ("mpolys.power3/" + suffix, lambda p=p: p._power3(3))
+                points = [(0.5,) * nvars]
+                yield ("mpolys.eval/" + suffix,
+                    lambda p=p, points=points: p.eval_many(points))
+                yield ("mpolys.diff/" + suffix, p.diff)
+                yield ("mpolys.integrate/" + suffix, p.integrate)
+                yield ("mpolys.combine1/" + suffix,
+                    lambda p=p, q=q: p._combine1(q))
+                yield ("mpolys.combine2/" + suffix,
+                    lambda p=p, q=q: p._combine2(q))
+                yield ("mpolys.repr/" + suffix, lambda p=p: repr(p))
+        p = random_poly(3, 1.0, kind, 2, seed=7)
+        suffix = "{}/nvars=2/deg=3".format(kind)
+        yield ("mpolys.power1/" + suffix, lambda p=p: p._power1(6))
+    n = 25 * scale
+    for name in ("natural", "geometric", "hermite", "chebyshev", "legendre"):
+        for cls in (polys.Poly, mpolys.Poly):
+            # Nowa fabryka w kazdym wywolaniu, bez pamieci podrecznej.
+            yield ("factory.{}/{}/n={}".format(name, cls.__module__, n),
+                lambda name=name, cls=cls:
+                    getattr(PolyFactory(cls), name)(n=n))
+
+
+def _measure(function, repeat, min_time):
+    """Return the best time of one call (seconds)."""
+    # Liczbe wywolan podwajamy, az pomiar trwa co najmniej min_time.
+    timer = timeit.Timer(function)
+    number = 1
+    while True:
+        total = timer.timeit(number)
+        if total >= min_time:
+            break
+        number = 2 * number
+    return min([total] + timer.repeat(repeat - 1, number)) / number
+
+
+def run(pattern=None, quick=False, repeat=3, stream=None, min_time=None):
+    """Return {name: seconds per call} for benchmarks matching pattern."""
+    if min_time is None:
+        min_time = 0.01 if quick else 0.1
+    results = dict()
+    for (name, function) in _cases(quick):
+        if pattern is not None and pattern not in name:
+            continue
+        best = _measure(function, repeat, min_time)
+        results[name] = best
+        if stream is not None:
+            stream.write("{} {:.3e}\n".format(name, best))
+    return results
+
+
+def compare(results, baseline, tolerance=0.2):
+    """Return the comparison of results with the baseline (dicts)."""
+    # ratio > 1 + tolerance to regresja, ratio < 1 - tolerance to poprawa.
+    report = dict()
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        ratio = results[name] / baseline[name]
+        if ratio > 1 + tolerance:
+            status = "slower"
+        elif ratio < 1 - tolerance:
+            status = "faster"
+        else:
+            status = "same"
+        report[name] = {"baseline": baseline[name], "time": results[name],
+            "ratio": ratio, "status": status}
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m pypolys.bench",
+        description="Benchmarks of pypolys.")
+    parser.add_argument("--filter", default=None,
+        help="run benchmarks with names containing the string")
+    parser.add_argument("--quick", action="store_true",
+        help="smaller inputs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=None,
+        help="the minimal time of one measurement (seconds)")
+    parser.add_argument("--output", default=None,
+        help="write the JSON results to the file")
+    parser.add_argument("--compare", default=None,
+        help="compare with the JSON baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--verbose", action="store_true",
+        help="print timings to stderr")
+    arguments = parser.parse_args(argv)
+    results = run(arguments.filter, arguments.quick, arguments.repeat,
+        sys.stderr if arguments.verbose else None, arguments.min_time)
+    document = {"python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "results": results}
+    if arguments.output is not None:
+        with open(arguments.output, "w") as outfile:
+            json.dump(document, outfile, indent=1, sort_keys=True)
+    if arguments.compare is not None:
+        with open(arguments.compare) as infile:
+            baseline = json.load(infile)["results"]
+        report = compare(results, baseline, arguments.tolerance)
+        json.dump(report, sys.stdout, indent=1, sort_keys=True)
+        sys.stdout.write("\n")
+        # Kod wyjscia 1, jezeli cos jest wolniejsze.
+        return int(any(item["status"] == "slower"
+            for item in report.values()))
+    json.dump(document, sys.stdout, indent=1, sort_keys=True)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+
+    sys.exit(main())
+
+# EOF
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+
+# Algorytmy na gestych listach wspolczynnikow [c0, c1, c2, ...].
+# Listy nie musza byc przyciete, wynik ma dlugosc len(a) + len(b) - 1.
+
+from fractions import Fraction
+from math import gcd
+
+try:
+    range = xrange
+except NameError:   # Python 3
+    pass
+
+# Progi mozna zmieniac, np. pypolys.dense.KARATSUBA_THRESHOLD = 64.
+KARATSUBA_THRESHOLD = 32
+TOOM3_THRESHOLD = 200
+KRONECKER_THRESHOLD = 24
+NEWTON_DIVISION_THRESHOLD = 48
+
+
+def _add(a, b):
+    """Return the sum of two coefficient lists."""
+    if len(a) < len(b):
+        a, b = b, a
+    result = list(a)
+    for (i, item) in enumerate(b):
+        result[i] += item
+    return result
+
+
+def _sub(a, b):
+    """Return the difference of two coefficient lists."""
+    result = list(a)
+    if len(result) < len(b):
+        result.extend([0] * (len(b) - len(result)))
+    for (i, item) in enumerate(b):
+        result[i] -= item
+    return result
+
+
+def _add_shifted(result, a, k):
+    """Add a * x**k to result (in place)."""
+    for (i, item) in enumerate(a):
+        result[i + k] += item
+
+
+def _divexact(a, d):
+    """Divide coefficients by a small integer, exactly for ints."""
+    # Dla int dzielenie jest dokladne, dla Fraction/float/complex zwykle.
+    return [item // d if isinstance(item, int) else item / d for item in a]
+
+
+def mul_school(a, b):
+    """Return the product of coefficient lists, O(n*m)."""
+    if not a or not b:
+        return []
+    result = [0] * (len(a) + len(b) - 1)
+    for (i, item1) in enumerate(a):
+        if item1 == 0:
+            continue
+        for (j, item2) in enumerate(b):
+            result[i + j] += item1 * item2
+    return result
+
+
+def mul_karatsuba(a, b):
+    """Return the product of coefficient lists (Karatsuba)."""
+    if len(a) < len(b):
+        a, b = b, a
+    n, m = len(a), len(b)
+    if m < KARATSUBA_THRESHOLD:
+        return mul_school(a, b)
+    if 2 * m <= n:   # niezrownowazone, tniemy a na kawalki dlugosci m
+        result = [0] * (n + m - 1)
+        for i in range(0, n, m):
+            _add_shifted(result, mul_karatsuba(a[i:i+m], b), i)
+        return result
+    h = n // 2   # m > h, wiec b1 nie jest puste
+    a0, a1 = a[:h], a[h:]
+    b0, b1 = b[:h], b[h:]
+    z0 = mul_karatsuba(a0, b0)
+    z2 = mul_karatsuba(a1, b1)
+    z1 = _sub(_sub(mul_karatsuba(_add(a0, a1), _add(b0, b1)), z0), z2)
+    result = [0] * (n + m - 1)
+    _add_shifted(result, z0, 0)
+    _add_shifted(result, z1[:n + m - 1 - h], h)
+    _add_shifted(result, z2, 2 * h)
+    return result
+
+
+def mul_toom3(a, b):
+    """Return the product of coefficient lists (Toom-3)."""
+    if len(a) < len(b):
+        a, b = b, a
+    n, m = len(a), len(b)
+    k = (n + 2) // 3
+    if m < TOOM3_THRESHOLD or m <= 2 * k:
+        return mul_karatsuba(a, b)
+    a0, a1, a2 = a[:k], a[k:2*k], a[2*k:]
+    b0, b1, b2 = b[:k], b[k:2*k], b[2*k:]
+    # Wartosci w punktach 0, 1, -1, -2, inf.
+    tmp = _add(a0, a2)
+    pa1, pam1 = _add(tmp, a1), _sub(tmp, a1)
+    pam2 = _add(pam1, a2)
+    pam2 = _sub(_add(pam2, pam2), a0)
+    tmp = _add(b0, b2)
+    pb1, pbm1 = _add(tmp, b1), _sub(tmp, b1)
+    pbm2 = _add(pbm1, b2)
+    pbm2 = _sub(_add(pbm2, pbm2), b0)
+    r0 = mul_toom3(a0, b0)
+    r1 = mul_toom3(pa1, pb1)
+    rm1 = mul_toom3(pam1, pbm1)
+    rm2 = mul_toom3(pam2, pbm2)
+    rinf = mul_toom3(a2, b2)
+    # Interpolacja wg Bodrato.
+    s3 = _divexact(_sub(rm2, r1), 3)
+    s1 = _divexact(_sub(r1, rm1), 2)
+    s2 = _sub(rm1, r0)
+    s3 = _divexact(_sub(s2, s3), 2)
+    s3 = _add(s3, _add(rinf, rinf))
+    s2 = _sub(_add(s2, s1), rinf)
+    s1 = _sub(s1, s3)
+    size = n + m - 1
+    result = [0] * (size + 4 * k)   # zapas na zera wiodace
+    for (i, part) in enumerate([r0, s1, s2, s3, rinf]):
+        _add_shifted(result, part, i * k)
+    del result[size:]
+    return result
+
+
+def _pack(a, nbytes):
+    """Pack nonnegative ints into one int, nbytes per coefficient."""
+    return int.from_bytes(
+        b"".join(item.to_bytes(nbytes, "little") for item in a), "little")
+
+
+def _pack_signed(a, nbytes):
+    """Pack ints into one int (a signed sum of shifted coefficients)."""
+    if all(item >= 0 for item in a):
+        return _pack(a, nbytes)
+    positive = _pack([(item if item > 0 else 0) for item in a], nbytes)
+    negative = _pack([(-item if item < 0 else 0) for item in a], nbytes)
+    return positive - negative
+
+
+def _unpack_signed(number, nbytes, size):
+    """Unpack size coefficients from a Kronecker product."""
+    # Cyfry zrownowazone: kazdy wspolczynnik jest w [-half, half).
+    data = number.to_bytes((size + 1) * nbytes, "little", signed=True)
+    width = 8 * nbytes
+    half = 1 << (width - 1)
+    full = 1 << width
+    result = [0] * size
+    carry = 0
+    for i in range(size):
+        item = int.from_bytes(data[i*nbytes:(i+1)*nbytes], "little") + carry
+        if item >= half:
+            item -= full
+            carry = 1
+        else:
+            carry = 0
+        result[i] = item
+    return result
+
+
+def mul_kronecker(a, b):
+    """Return the product of int coefficient lists (Kronecker)."""
+    # Podstawiamy x = 2**width i mnozymy jedna duza liczbe calkowita.
+    if not a or not b:
+        return []
+    max1 = max(abs(item) for item in a)
+    max2 = max(abs(item) for item in b)
+    # Miejsce na wspolczynniki czynnikow i iloczynu (ze znakiem).
+    bound = max(max1, max2, max1 * max2 * min(len(a), len(b)))
+    nbytes = (bound.bit_length() + 1) // 8 + 1
+    number = _pack_signed(a, nbytes) * _pack_signed(b, nbytes)
+    return _unpack_signed(number, nbytes, len(a) + len(b) - 1)
+
+
+def common_denominator(a):
+    """Return the common denominator of Fraction/int coefficients."""
+    result = 1
+    for item in a:
+        if isinstance(item, Fraction):
+            d = item.denominator
+            result = result * d // gcd(result, d)
+    return result
+
+
+def _scale(item, d):
+    """Return item * d as int, d is a multiple of the denominator."""
+    if isinstance(item, Fraction):
+        return item.numerator * (d // item.denominator)
+    return item * d
+
+
+def to_integers(a):
+    """Return (b, d), where b = a * d is a list of ints."""
+    d = common_denominator(a)
+    return [_scale(item, d) for item in a], d
+
+
+def mul_rational(a, b):
+    """Return the product of Fraction/int coefficient lists."""
+    # Sprowadzamy do wspolnego mianownika i mnozymy liczby calkowite.
+    a, d1 = to_integers(a)
+    b, d2 = to_integers(b)
+    d = d1 * d2
+    return [Fraction(item, d) for item in mul_kronecker(a, b)]
+
+
+def is_integer_list(a):
+    return all(isinstance(item, int) for item in a)
+
+
+def is_rational_list(a):
+    return all(isinstance(item, (int, Fraction)) for item in a)
+
+
+def mul(a, b):
+    """Return the product of coefficient lists, the best method."""
+    size = min(len(a), len(b))
+    if size >= KRONECKER_THRESHOLD:
+        if is_integer_list(a) and is_integer_list(b):
+            return mul_kronecker(a, b)
+        if is_rational_list(a) and is_rational_list(b):
+            return mul_rational(a, b)
+    if size < KARATSUBA_THRESHOLD:
+        return mul_school(a, b)
+    return mul_toom3(a, b)
+
+
+def _inverse(item):
+    """Return 1/item, exactly for int and Fraction."""
+    if isinstance(item, (int, Fraction)):
+        return Fraction(1, item)
+    else:   # float, complex
+        return 1.0 / item
+
+
+def trim(a):
+    """Remove leading zeros (in place)."""
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+
+def divmod_school(a, b):
+    """Return the quotient and the remainder (long division)."""
+    # b[-1] != 0, O(len(b) * (len(a) - len(b))).
+    m = len(b) - 1
+    if len(a) <= m:
+        return [], list(a)
+    remainder = list(a)
+    quotient = [0] * (len(a) - m)
+    inverse = _inverse(b[-1])
+    for i in range(len(a) - m - 1, -1, -1):
+        item = remainder[i + m] * inverse
+        quotient[i] = item
+        if item == 0:
+            continue
+        for (j, item2) in enumerate(b):
+            remainder[i + j] -= item * item2
+    return quotient, remainder[:m]
+
+
+def inverse_series(a, n):
+    """Return the power series 1/a modulo x**n (Newton iteration)."""
+    # a[0] != 0, g_{2k} = g_k * (2 - a * g_k) mod x**(2k).
+    result = [_inverse(a[0])]
+    k = 1
+    while k < n:
+        k = min(2 * k, n)
+        error = mul(a[:k], result)[:k]
+        error = [-item for item in error]
+        error[0] += 2
+        result = mul(result, error)[:k]
+    return result
+
+
+def divmod_newton(a, b):
+    """Return the quotient and the remainder (Newton iteration)."""
+    # rev(a) = rev(b) * rev(q) mod x**(n-m+1), koszt jak kilka mnozen.
+    m = len(b) - 1
+    if len(a) <= m:
+        return [], list(a)
+    k = len(a) - m
+    reversed_a = a[::-1][:k]
+    inverse = inverse_series(b[::-1], k)
+    quotient = mul(reversed_a, inverse)[:k]
+    quotient.extend([0] * (k - len(quotient)))
+    quotient.reverse()
+    remainder = _sub(a[:m], mul(b, quotient)[:m])
+    return quotient, remainder
+
+
+def divmod(a, b):
+    """Return the quotient and the remainder, the best method."""
+    if not b or b[-1] == 0:
+        raise ValueError("the leading coefficient of the divisor is zero")
+    if min(len(b), len(a) - len(b) + 1) < NEWTON_DIVISION_THRESHOLD:
+        return divmod_school(a, b)
+    return divmod_newton(a, b)
+
+
+def horner(a, x):
+    """Return the value of the poly at x (Horner)."""
+    result = 0
+    for item in reversed(a):
+        result = result * x + item
+    return result
+
+
+def taylor_shift(a, c):
+    """Return the coefficients of a(x + c), O(n**2) additions."""
+    # Nad Z i Q dziel i rzadz nie jest szybsze (dlugie liczby),
+    # dla float jest niestabilne numerycznie.
+    result = list(a)
+    n = len(result)
+    for i in range(n - 1):
+        for j in range(n - 2, i - 1, -1):
+            result[j] += c * result[j+1]
+    return result
+
+
+def interpolate_newton(points, values):
+    """Return the interpolating poly (Newton divided differences)."""
+    n = len(points)
+    differences = list(values)
+    for j in range(1, n):
+        for i in range(n - 1, j - 1, -1):
+            differences[i] = ((differences[i] - differences[i-1]) *
+                _inverse(points[i] - points[i-j]))
+    result = [differences[-1]] if n else []
+    for i in range(n - 2, -1, -1):
+        # result = result * (x - points[i]) + differences[i]
+        result = _sub([0] + result, [points[i] * item for item in result])
+        result[0] += differences[i]
+    # Wspolczynniki calkowite bez ulamkow Fraction(n, 1).
+    result = [item.numerator if isinstance(item, Fraction) and
+        item.denominator == 1 else item for item in result]
+    return trim(result)
+
+# EOF
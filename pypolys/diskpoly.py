@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+
+# Wielomiany wielu zmiennych w pliku mapowanym do pamieci (mmap),
+# dla wynikow wiekszych niz pamiec operacyjna. Plik:
+#
+# naglowek: b"PYPD", wersja, nvars, liczba wyrazow, poczatek indeksu,
+#     dziedzina
+# wspolczynniki: kodowanie z pypolys.serialize
+# indeks: rekordy (nvars wykladnikow ">I", przesuniecie wspolczynnika ">Q")
+#
+# Rekordy sa posortowane leksykograficznie wg wykladnikow dopelnionych
+# zerami do nvars. Bajty big endian porownuja sie jak krotki wykladnikow.
+
+import heapq
+import io
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from pypolys import serialize
+from pypolys.mpolys import Poly, _normalize
+
+MAGIC = b"PYPD"
+VERSION = 1
+
+# Mnozenie: liczba wyrazow pierwszego czynnika na jedna serie
+# i liczba serii scalanych naraz.
+MERGE_BLOCK = 1024
+MERGE_FANIN = 64
+
+_header = struct.Struct(">4sBIQQ")
+_offset = struct.Struct(">Q")
+
+
+def _common_domain(domain1, domain2):
+    if domain1 is None:
+        return domain2
+    if domain2 is None or domain2 == domain1:
+        return domain1
+    raise ValueError("different domains")
+
+
+class _Writer(object):
+    """The writer of a term file, keys have to be increasing."""
+
+    def __init__(self, path, nvars, domain=None):
+        self.path = path
+        self.nvars = nvars
+        self.domain = domain
+        self.count = 0
+        self.last = None
+        self._key = struct.Struct(">{}I".format(nvars))
+        # Plik tymczasowy obok path, podmieniany w close(): path moze
+        # byc plikiem argumentu, ktory jest jeszcze mapowany do pamieci.
+        descriptor, self._temporary = tempfile.mkstemp(prefix="diskpoly",
+            dir=os.path.dirname(os.path.abspath(path)))
+        self._file = os.fdopen(descriptor, "wb")
+        data = bytearray(_header.size)   # naglowek zapisany w close()
+        serialize._write_domain(data, domain)
+        self._data = data
+        self._position = 0   # zapisane bajty pliku
+        self._records = bytearray()
+        self._index = tempfile.TemporaryFile()
+
+    def write(self, key, coefficient):
+        """Add the term (padded key, coefficient), zeros are skipped."""
+        if self.domain is not None:
+            coefficient = self.domain.convert(coefficient)
+        if coefficient == 0:
+            return
+        if self.last is not None and key <= self.last:
+            raise ValueError("keys are not increasing")
+        self.last = key
+        try:
+            self._records += self._key.pack(*key)
+        except struct.error:
+            raise ValueError("exponent out of range")
+        self._records += _offset.pack(self._position + len(self._data))
+        serialize._write_coefficient(self._data, coefficient)
+        self.count += 1
+        if len(self._data) >= serialize.BUFFER_SIZE:
+            self._flush()
+
+    def _flush(self):
+        self._file.write(bytes(self._data))
+        self._position += len(self._data)
+        del self._data[:]
+        self._index.write(bytes(self._records))
+        del self._records[:]
+
+    def close(self):
+        """Finish the file and return it as DiskPoly."""
+        self._flush()
+        self._index.seek(0)
+        shutil.copyfileobj(self._index, self._file)
+        self._index.close()
+        self._file.seek(0)
+        self._file.write(_header.pack(MAGIC, VERSION, self.nvars,
+            self.count, self._position))
+        self._file.close()
+        os.replace(self._temporary, self.path)
+        return DiskPoly(self.path)
+
+    def abort(self):
+        """Remove the unfinished file."""
+        self._index.close()
+        self._file.close()
+        os.remove(self._temporary)
+
+
+def _merge(streams, writer):
+    """Write the sum of sorted term streams, return DiskPoly."""
+    key = None
+    total = 0
+    try:
+        for (k, coefficient) in heapq.merge(*streams,
+                key=lambda item: item[0]):
+            if k == key:
+                total = total + coefficient
+            else:
+                if key is not None:
+                    writer.write(key, total)
+                key, total = k, coefficient
+        if key is not None:
+            writer.write(key, total)
+    except Exception:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def _shifted(terms, key, coefficient):
+    """Yield the terms times the monomial (sorted, if terms are)."""
+    for (k, item) in terms:
+        yield (tuple(a + b for (a, b) in zip(k, key)), item * coefficient)
+
+
+class DiskPoly(object):
+    """The read-only poly in a memory-mapped sorted term file."""
+
+    def __init__(self, path):
+        """Open the term file."""
+        self.path = path
+        with open(path, "rb") as infile:
+            self._mmap = mmap.mmap(infile.fileno(), 0,
+                access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.nvars, self._count,
+                self._index) = _header.unpack_from(self._mmap, 0)
+        except struct.error:
+            raise ValueError("not a pypolys term file")
+        if magic != MAGIC:
+            raise ValueError("not a pypolys term file")
+        if version != VERSION:
+            raise ValueError("unsupported version")
+        self.domain = serialize._read_domain(self._reader(_header.size))
+        self._key = struct.Struct(">{}I".format(self.nvars))
+        self._size = self._key.size + _offset.size   # rozmiar rekordu
+
+    @classmethod
+    def frompoly(cls, poly, path):
+        """Write the mpolys.Poly to the file, return DiskPoly."""
+        nvars = max([len(key) for key in poly] + [1])
+        terms = sorted((key + (0,) * (nvars - len(key)), coefficient)
+            for (key, coefficient) in poly.items() if coefficient != 0)
+        return _merge([terms], _Writer(path, nvars, poly.domain))
+
+    def close(self):
+        """Close the memory map."""
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def __repr__(self):
+        return "DiskPoly({!r})".format(self.path)
+
+    def __len__(self):
+        return self._count
+
+    def _reader(self, position):
+        """Return the serialize reader at the position of the map."""
+        reader = serialize._Reader(io.BytesIO())
+        reader.buffer = self._mmap
+        reader.position = position
+        return reader
+
+    def _record(self, i):
+        """Return (padded key, coefficient offset) of the i-th term."""
+        start = self._index + i * self._size
+        key = self._key.unpack_from(self._mmap, start)
+        return key, _offset.unpack_from(self._mmap, start + self._key.size)[0]
+
+    def _terms(self, nvars=None):
+        """Yield (key padded to nvars, coefficient) in increasing order."""
+        padding = (0,) * ((nvars or self.nvars) - self.nvars)
+        reader = self._reader(0)
+        for i in range(self._count):
+            key, reader.position = self._record(i)
+            yield (key + padding,
+                serialize._read_coefficient(reader, reader.byte()))
+
+    def iterterms(self):
+        """The generator for terms (key, coefficient), lex order."""
+        for (key, coefficient) in self._terms():
+            yield (_normalize(key), coefficient)
+
+    items = iterterms
+
+    def __iter__(self):
+        for (key, coefficient) in self.iterterms():
+            yield key
+
+    def _find(self, key):
+        """Return the coefficient offset for the key or None."""
+        if not isinstance(key, tuple):
+            key = (key,)
+        key = _normalize(key)
+        if len(key) > self.nvars:
+            if key[self.nvars:] != (0,) * (len(key) - self.nvars):
+                return None
+            key = key[:self.nvars]
+        key = key + (0,) * (self.nvars - len(key))
+        low, high = 0, self._count
+        while low < high:   # wyszukiwanie binarne
+            middle = (low + high) // 2
+            k, offset = self._record(middle)
+            if k == key:
+                return offset
+            elif k < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def __getitem__(self, key):
+        """Return the coefficient (binary search)."""
+        offset = self._find(key)
+        if offset is None:
+            return 0
+        reader = self._reader(offset)
+        return serialize._read_coefficient(reader, reader.byte())
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def topoly(self):
+        """Return the poly in memory (mpolys.Poly)."""
+        return Poly._fromdict(dict(self.iterterms()), domain=self.domain)
+
+    def _operand(self, other):
+        """Return (nvars, domain, terms(nvars)) for DiskPoly or Poly."""
+        if isinstance(other, DiskPoly):
+            return other.nvars, other.domain, other._terms
+        nvars = max([len(key) for key in other] + [1])
+        data = sorted((key + (0,) * (nvars - len(key)), coefficient)
+            for (key, coefficient) in other.items() if coefficient != 0)
+        return nvars, other.domain, lambda n: ((key + (0,) * (n - nvars),
+            coefficient) for (key, coefficient) in data)
+
+    def add(self, other, path):
+        """Return self + other in the file (DiskPoly), external merge."""
+        nvars, domain, terms = self._operand(other)
+        nvars = max(nvars, self.nvars)
+        writer = _Writer(path, nvars, _common_domain(self.domain, domain))
+        return _merge([self._terms(nvars), terms(nvars)], writer)
+
+    def mul(self, other, path):
+        """Return self * other in the file (DiskPoly), external merge."""
+        # Wyrazy other razy jednomian pozostaja posortowane. Bloki
+        # MERGE_BLOCK wyrazow self daja posortowane serie w plikach
+        # tymczasowych, serie sa scalane po MERGE_FANIN.
+        nvars, domain, terms = self._operand(other)
+        nvars = max(nvars, self.nvars)
+        domain = _common_domain(self.domain, domain)
+        directory = tempfile.mkdtemp(prefix="diskpoly",
+            dir=os.path.dirname(os.path.abspath(path)))
+        runs = []
+        try:
+            block = []
+            for term in self._terms(nvars):
+                block.append(term)
+                if len(block) == MERGE_BLOCK:
+                    runs.append(self._run(block, terms, nvars, domain,
+                        directory, len(runs)))
+                    block = []
+            if block or not runs:
+                runs.append(self._run(block, terms, nvars, domain,
+                    directory, len(runs)))
+            while len(runs) > 1:
+                if len(runs) <= MERGE_FANIN:
+                    target = path
+                else:
+                    target = os.path.join(directory,
+                        "run{}".format(len(runs)))
+                group, runs = runs[:MERGE_FANIN], runs[MERGE_FANIN:]
+                result = _merge([run._terms() for run in group],
+                    _Writer(target, nvars, domain))
+                for run in group:
+                    run.close()
+                    os.remove(run.path)
+                runs.append(result)
+            if runs[0].path == path:
+                return runs.pop()
+            runs[0].close()
+            os.replace(runs[0].path, path)
+            runs = []
+            return DiskPoly(path)
+        finally:
+            for run in runs:
+                run.close()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def _run(self, block, terms, nvars, domain, directory, number):
+        """Return the sorted run of block * other."""
+        path = os.path.join(directory, "block{}".format(number))
+        return _merge([_shifted(terms(nvars), key, coefficient)
+            for (key, coefficient) in block], _Writer(path, nvars, domain))
+
+# EOF
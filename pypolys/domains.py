@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+# Dziedziny wspolczynnikow: ZZ, QQ, GF(p), RR.
+# Wielomian z dziedzina trzyma tylko jej elementy (int, Fraction,
+# int z przedzialu [0, p), float), wiec petle nie sprawdzaja typow.
+
+from fractions import Fraction
+from pypolys import modular
+
+try:
+    integer_types = (int, long)
+except NameError:   # Python 3
+    integer_types = (int,)
+
+
+class Domain(object):
+    """The base class for coefficient domains."""
+
+    # Podklasy definiuja convert(a) (a jako element dziedziny)
+    # i div(a, b) (a / b w ciele ulamkow).
+    is_field = False
+    modulus = None
+
+    def normalize(self, data):
+        """Return the dict {key: coefficient} without zeros."""
+        return dict((k, a) for (k, a) in data.items() if a != 0)
+
+    @property
+    def field(self):
+        """Return the field of fractions."""
+        return self
+
+
+class IntegerRing(Domain):
+    """The ring of integers ZZ."""
+
+    def __repr__(self):
+        return "ZZ"
+
+    def convert(self, a):
+        if isinstance(a, integer_types):
+            return a
+        if isinstance(a, Fraction) and a.denominator == 1:
+            return a.numerator
+        if isinstance(a, float) and a.is_integer():
+            return int(a)
+        raise ValueError("{!r} is not an integer".format(a))
+
+    def div(self, a, b):
+        return Fraction(a, b)
+
+    @property
+    def field(self):
+        return QQ
+
+
+class RationalField(Domain):
+    """The field of rationals QQ (Fraction)."""
+
+    is_field = True
+
+    def __repr__(self):
+        return "QQ"
+
+    def convert(self, a):
+        return Fraction(a)
+
+    def div(self, a, b):
+        # Jedno skracanie ulamka zamiast dwoch, jak w a * Fraction(1, b).
+        if isinstance(b, integer_types):
+            a = Fraction(a)
+            return Fraction(a.numerator, a.denominator * b)
+        return Fraction(a) / b
+
+
+class RealField(Domain):
+    """The field of reals RR (float)."""
+
+    is_field = True
+
+    def __repr__(self):
+        return "RR"
+
+    def convert(self, a):
+        return float(a)
+
+    def div(self, a, b):
+        return a / float(b)
+
+
+class FiniteField(Domain):
+    """The prime field GF(p), elements are ints from [0, p)."""
+
+    is_field = True
+
+    def __init__(self, p):
+        if not modular.is_prime(p):
+            raise ValueError("p is not a prime")
+        self.modulus = p
+
+    def __repr__(self):
+        return "GF({})".format(self.modulus)
+
+    def __eq__(self, other):
+        return (isinstance(other, FiniteField) and
+            self.modulus == other.modulus)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(("GF", self.modulus))
+
+    def convert(self, a):
+        p = self.modulus
+        if isinstance(a, integer_types):
+            return a % p
+        a = Fraction(a)
+        if a.denominator == 1:
+            return a.numerator % p
+        return a.numerator * self.inverse(a.denominator) % p
+
+    def normalize(self, data):
+        p = self.modulus
+        result = dict()
+        for (k, a) in data.items():
+            a = a % p
+            if a:
+                result[k] = a
+        return result
+
+    def inverse(self, a):
+        """Return 1 / a modulo p."""
+        a = a % self.modulus
+        if a == 0:
+            raise ZeroDivisionError("division by zero in GF(p)")
+        return pow(a, self.modulus - 2, self.modulus)
+
+    def div(self, a, b):
+        return a * self.inverse(self.convert(b)) % self.modulus
+
+
+ZZ = IntegerRing()
+QQ = RationalField()
+RR = RealField()
+
+_FIELDS = dict()
+
+
+def GF(p):
+    """Return the prime field GF(p) (one instance for each p)."""
+    if p not in _FIELDS:
+        _FIELDS[p] = FiniteField(p)
+    return _FIELDS[p]
+
+
+def common_domain(domain1, domain2):
+    """Return the domain containing both domains (None is no domain)."""
+    if domain1 is None:
+        return domain2
+    if domain2 is None or domain2 == domain1:
+        return domain1
+    if domain2.field == domain1.field:   # ZZ i QQ
+        return domain1.field
+    raise ValueError("different domains")
+
+# EOF
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+from fractions import Fraction
+from pypolys import dense
+from pypolys import polys
+
+try:
+    rational_types = (int, long, Fraction)
+    range = xrange
+except NameError:   # Python 3
+    rational_types = (int, Fraction)
+
+
+class DensePoly(object):
+    """The class defining a dense poly (a list of coefficients)."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, coefficient=0, n=0):
+        """Load up a poly instance."""
+        # Tworzymy wielomian c*(x**n), data[k] to wspolczynnik przy x**k.
+        if coefficient != 0:
+            self.data = [0] * n
+            self.data.append(coefficient)
+        else:
+            self.data = []
+
+    @classmethod
+    def _fromlist(cls, data):
+        """Create a poly from a list (the list is not copied)."""
+        new_poly = cls()
+        while data and data[-1] == 0:   # usuwamy zera wiodace
+            data.pop()
+        new_poly.data = data
+        return new_poly
+
+    @classmethod
+    def fromiterable(cls, data):
+        """Create a poly from coefficients."""
+        return cls._fromlist(list(data))
+
+    @classmethod
+    def frompoly(cls, poly):
+        """Create a dense poly from polys.Poly."""
+        return cls._fromlist(poly.tolist())
+
+    def topoly(self):
+        """Return the poly as polys.Poly."""
+        return polys.Poly.fromiterable(self.data)
+
+    def tolist(self):
+        """Return the list of coefficients [c0, c1, ..., cn]."""
+        return list(self.data)
+
+    def _coerce(self, other):
+        if isinstance(other, DensePoly):
+            return other
+        elif isinstance(other, polys.Poly):
+            return DensePoly.frompoly(other)
+        else:
+            return DensePoly(other)
+
+    def is_zero(self):
+        """Test if the poly is the zero polynomial."""
+        return all(item == 0 for item in self.data)
+
+    def degree(self):
+        """Return the degree of the poly."""
+        k = len(self.data) - 1
+        while k > 0 and self.data[k] == 0:
+            k = k - 1
+        return max(k, 0)
+
+    key_deg = degree
+
+    key_lex = degree
+
+    key_deglex = degree
+
+    def cancel(self):
+        """Remove leading zeros."""
+        while self.data and self.data[-1] == 0:
+            self.data.pop()
+
+    def __repr__(self):
+        """Compute the string representation of the poly."""
+        L = list()
+        for (k, item) in enumerate(self.data):
+            if item == 0:
+                continue
+            if isinstance(item, Fraction) and item.denominator == 1:
+                item = item.numerator
+            if k == 0:
+                L.append("DensePoly({})".format(repr(item)))
+            else:
+                L.append("DensePoly({}, {})".format(repr(item), k))
+        if L:
+            return " + ".join(L)
+        else:
+            return "DensePoly()"
+
+    def __len__(self):
+        """Return the number of nonzero terms."""
+        return sum(1 for item in self.data if item != 0)
+
+    def __iter__(self):
+        """Iterate over the exponents of nonzero terms."""
+        for (k, item) in enumerate(self.data):
+            if item != 0:
+                yield k
+
+    def __getitem__(self, k):   # poly[k]
+        """Return the coefficient."""
+        if 0 <= k < len(self.data):
+            return self.data[k]
+        else:
+            return 0
+
+    def __setitem__(self, k, coefficient):   # poly[k] = coefficient
+        """Set the coefficient."""
+        if k < 0:
+            raise ValueError("negative exponent")
+        if k >= len(self.data):
+            if coefficient == 0:
+                return
+            self.data.extend([0] * (k + 1 - len(self.data)))
+        self.data[k] = coefficient
+        self.cancel()
+
+    def __add__(self, other):   # poly1 + poly2, poly + number, number + poly
+        """Return the sum of polys."""
+        other = self._coerce(other)
+        return DensePoly._fromlist(dense._add(self.data, other.data))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):       # poly1 - poly2
+        """Return the difference of polys."""
+        other = self._coerce(other)
+        return DensePoly._fromlist(dense._sub(self.data, other.data))
+
+    def __rsub__(self, other):       # number - poly
+        """Return the difference of polys."""
+        other = self._coerce(other)
+        return DensePoly._fromlist(dense._sub(other.data, self.data))
+
+    def __iadd__(self, other):   # poly1 += poly2, w miejscu
+        """Add other to the poly in place."""
+        other = self._coerce(other)
+        data = self.data
+        if len(data) < len(other.data):
+            data.extend([0] * (len(other.data) - len(data)))
+        for (i, item) in enumerate(other.data):
+            data[i] += item
+        self.cancel()
+        return self
+
+    def __isub__(self, other):   # poly1 -= poly2, w miejscu
+        """Subtract other from the poly in place."""
+        other = self._coerce(other)
+        data = self.data
+        if len(data) < len(other.data):
+            data.extend([0] * (len(other.data) - len(data)))
+        for (i, item) in enumerate(other.data):
+            data[i] -= item
+        self.cancel()
+        return self
+
+    def add_mul(self, poly1, poly2, scalar=1):
+        """Add scalar * poly1 * poly2 to the poly in place."""
+        product = dense.mul(self._coerce(poly1).data, self._coerce(poly2).data)
+        data = self.data
+        if len(data) < len(product):
+            data.extend([0] * (len(product) - len(data)))
+        for (i, item) in enumerate(product):
+            data[i] += scalar * item
+        self.cancel()
+        return self
+
+    def copy(self):
+        """Return a copy of the poly."""
+        return DensePoly._fromlist(list(self.data))
+
+    def __eq__(self, other):   # poly1 == poly2
+        """Test if polys are equal."""
+        other = self._coerce(other)
+        n = max(len(self.data), len(other.data))
+        return all(self[k] == other[k] for k in range(n))
+
+    def __ne__(self, other):   # poly1 != poly2
+        """Test if polys are not equal."""
+        return not self == other
+
+    __hash__ = None   # obiekt zmienny
+
+    def __mul__(self, other):        # poly1 * poly2
+        """Return the product of polys."""
+        if isinstance(other, (DensePoly, polys.Poly)):
+            other = self._coerce(other)
+            return DensePoly._fromlist(dense.mul(self.data, other.data))
+        else:   # mnozenie przez liczbe
+            return DensePoly._fromlist([item * other for item in self.data])
+
+    __rmul__ = __mul__
+
+    def __imul__(self, other):        # poly1 *= poly2
+        """Multiply the poly by other in place."""
+        if isinstance(other, (DensePoly, polys.Poly)):
+            self.data = dense.mul(self.data, self._coerce(other).data)
+        else:
+            data = self.data
+            for i in range(len(data)):
+                data[i] *= other
+        self.cancel()
+        return self
+
+    def __pos__(self):
+        """Return +poly (a copy)."""
+        return self.copy()
+
+    def __neg__(self):
+        """Return -poly."""
+        return DensePoly._fromlist([-item for item in self.data])
+
+    def eval(self, x):   # schemat Hornera
+        """Return the value of the poly at x."""
+        result = 0
+        for item in reversed(self.data):
+            result = result * x + item
+        return result
+
+    def combine(self, other):  # zlozenie funkcji/wielomianow
+        """Return the composition of two polys."""
+        other = self._coerce(other)
+        new_poly = DensePoly()
+        for item in reversed(self.data):   # schemat Hornera
+            new_poly = new_poly * other + item
+        return new_poly
+
+    def __pow__(self, n):       # poly1 ** n, binary
+        if n < 0:
+            raise ValueError("negative power")
+        result = DensePoly(1)
+        poly = self
+        while n > 0:
+            if n % 2 == 1:
+                result = result * poly
+            n = n // 2
+            if n > 0:
+                poly = poly * poly
+        return result
+
+    def diff(self):   # rozniczkowanie
+        """Return the derivative of the poly."""
+        return DensePoly._fromlist(
+            [k * self.data[k] for k in range(1, len(self.data))])
+
+    def integrate(self):   # calkowanie
+        """Return the integral of the poly."""
+        data = [0]
+        for (k, item) in enumerate(self.data):
+            if isinstance(item, rational_types):
+                data.append(item * Fraction(1, k+1))
+            else:
+                data.append(item / (k+1.0))
+        return DensePoly._fromlist(data)
+
+    def __div__(self, other):        # poly / number, monomial / monomial
+        """Dividing polys."""
+        if isinstance(other, (DensePoly, polys.Poly)):
+            other = self._coerce(other)
+            return DensePoly.frompoly(self.topoly() / other.topoly())
+        # Python 2.7: Fraction(Fraction, Fraction)
+        elif isinstance(other, rational_types):
+            return self * Fraction(1, other)
+        else:
+            return self * (1.0 / other)
+
+    __truediv__ = __div__
+
+    def lcm(self, other):
+        """Return the least common multiple of two monomials."""
+        other = self._coerce(other)
+        return DensePoly.frompoly(self.topoly().lcm(other.topoly()))
+
+    def __call__(self, x):
+        if isinstance(x, (DensePoly, polys.Poly)):
+            return self.combine(x)
+        else:
+            return self.eval(x)
+
+    def leading_term(self, key=None):
+        """Return the leading term of the poly."""
+        if self.is_zero():
+            raise ValueError("zero poly")
+        else:
+            k_max = self.degree()
+            return DensePoly(self.data[k_max], k_max)
+
+    def leading_monomial(self, key=None):
+        """Return the leading monomial of the poly."""
+        if self.is_zero():
+            raise ValueError("zero poly")
+        else:
+            return DensePoly(1, self.degree())
+
+    def leading_coefficient(self, key=None):
+        """Return the leading coefficient of the poly."""
+        if self.is_zero():
+            raise ValueError("zero poly")
+        else:
+            return self.data[self.degree()]
+
+    def iterterms(self):
+        """The generator for terms from the poly."""
+        for (k, item) in enumerate(self.data):
+            if item != 0:
+                yield DensePoly(item, k)
+
+# EOF
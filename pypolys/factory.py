@@ -1,53 +1,96 @@
 #!/usr/bin/env python3
 
 import random
+import threading
+from collections import OrderedDict
 from fractions import Fraction
 
+# Domyslna liczba zapamietanych wielomianow (LRU), None - bez limitu.
+CACHE_SIZE = 128
+
+# Rodziny wielomianow ortogonalnych: p_0 = 1, p_1 = c * x,
+# p_k = a_k * x * p_{k-1} + b_k * p_{k-2},
+# FAMILIES[nazwa] = (c, funkcja k -> (a_k, b_k)).
+FAMILIES = {
+    "hermite": (2, lambda k: (2, 2*k-2)),
+    "chebyshev": (1, lambda k: (2, -1)),
+    "legendre": (1, lambda k: (Fraction(2*k-1, k), Fraction(-k+1, k))),
+}
+
 
 class PolyFactory:
     """The class for poly generators."""
 
-    def __init__(self, poly_class):
+    def __init__(self, poly_class, cache_size=CACHE_SIZE):
         """Get a poly class."""
         self.cls = poly_class
-        self.HERMITE = {0: self.cls(1), 1: self.cls(2, 1)}
-        self.CHEBYSHEV = {0: self.cls(1), 1: self.cls(1, 1)}
-        self.LEGENDRE = {0: self.cls(1), 1: self.cls(1, 1)}
+        self.cache_size = cache_size
+        # (rodzina, n) -> (p_{n-1}, p_n), para pozwala kontynuowac rekurencje.
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
 
     def natural(self, n=1):
         """Create a poly (x-1)*(x-2)*...*(x-n)."""
         poly = self.cls(1)
         for i in range(1, n+1):
-            poly = poly * (self.cls(1, 1) -i)
+            poly *= self.cls(1, 1) - i
         return poly
 
     def geometric(self, n=1):
         """Create a poly 1 + x + x**2 + ... + x**n."""
         poly = self.cls(1)
         for i in range(1, n+1):
-            poly = poly + self.cls(1, i)
+            poly += self.cls(1, i)
         return poly
 
+    def clear_cache(self):
+        """Remove all remembered polys."""
+        with self._lock:
+            self._cache.clear()
+
+    def _recurrence(self, family, n):
+        """Return p_n, p_n = a_n * x * p_{n-1} + b_n * p_{n-2}."""
+        # Iteracyjnie od najblizszej zapamietanej pary (p_{m-1}, p_m), m <= n.
+        if n < 0:
+            raise ValueError("negative degree")
+        first, coefficients = FAMILIES[family]
+        p0 = self.cls(1)
+        if n == 0:
+            return p0
+        p1 = self.cls(first, 1)
+        with self._lock:
+            start = max([m for (name, m) in self._cache
+                if name == family and m <= n] + [1])
+            if start > 1:
+                self._cache.move_to_end((family, start))
+                previous, current = self._cache[(family, start)]
+            else:
+                previous, current = p0, p1
+        x = self.cls(1, 1)
+        for k in range(start + 1, n + 1):
+            a, b = coefficients(k)
+            new = previous * b
+            new.add_mul(x, current, a)
+            previous, current = current, new
+        if n > start:
+            with self._lock:
+                self._cache[(family, n)] = (previous, current)
+                if self.cache_size is not None:
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        # Wielomiany z pamieci sa wspolne, uzytkownik dostaje kopie.
+        return current.copy()
+
     def hermite(self, n=1):
         """Create a Hermite polynomial."""
-        if n not in self.HERMITE:
-            self.HERMITE[n] = (self.cls(2, 1) * self.hermite(n-1) 
-                            + self.cls(2*n-2) * self.hermite(n-2))
-        return self.HERMITE[n]
+        return self._recurrence("hermite", n)
 
     def chebyshev(self, n=1):
         """Create a Chebyshev polynomial."""
-        if n not in self.CHEBYSHEV:
-            self.CHEBYSHEV[n] = (self.cls(2, 1) * self.chebyshev(n-1) 
-                                 + self.cls(-1) * self.chebyshev(n-2))
-        return self.CHEBYSHEV[n]
+        return self._recurrence("chebyshev", n)
 
     def legendre(self, n=1):
         """Create a Legendre polynomial."""
-        if n not in self.LEGENDRE:
-            self.LEGENDRE[n] = (
-                self.cls(Fraction(2*n-1, n), 1) * self.legendre(n-1) 
-                   + self.cls(Fraction(-n+1, n)) * self.legendre(n-2))
-        return self.LEGENDRE[n]
+        return self._recurrence("legendre", n)
 
 # EOF
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+
+# Bazy Grobnera dla wielomianow z pypolys.mpolys.
+# Jednomiany to krotki wykladnikow tej samej dlugosci (uzupelnione zerami),
+# wielomiany to slowniki {jednomian: wspolczynnik}.
+
+import heapq
+from fractions import Fraction
+from pypolys import dense
+from pypolys.mpolys import Poly, _heap_order, _normalize
+
+
+def _divides(monomial1, monomial2):
+    """Test if monomial1 divides monomial2."""
+    return all(x <= y for (x, y) in zip(monomial1, monomial2))
+
+
+def _lcm(monomial1, monomial2):
+    return tuple(max(x, y) for (x, y) in zip(monomial1, monomial2))
+
+
+def _coprime(monomial1, monomial2):
+    return all(x == 0 or y == 0 for (x, y) in zip(monomial1, monomial2))
+
+
+def _shift(monomial1, monomial2):
+    """Return monomial1 / monomial2."""
+    return tuple(x - y for (x, y) in zip(monomial1, monomial2))
+
+
+def _times(monomial1, monomial2):
+    return tuple(x + y for (x, y) in zip(monomial1, monomial2))
+
+
+class _Field(object):
+    """Arithmetic of coefficients: Q (modulus=None) or GF(p)."""
+
+    def __init__(self, modulus=None):
+        self.modulus = modulus
+
+    def convert(self, coefficient):
+        if self.modulus is None:
+            if isinstance(coefficient, (int, Fraction)):
+                return Fraction(coefficient)
+            return coefficient   # float, complex
+        p = self.modulus
+        coefficient = Fraction(coefficient)
+        return (coefficient.numerator *
+            pow(coefficient.denominator, p - 2, p) % p)
+
+    def inverse(self, coefficient):
+        if self.modulus is None:
+            return dense._inverse(coefficient)
+        return pow(coefficient, self.modulus - 2, self.modulus)
+
+    def reduce(self, coefficient):
+        if self.modulus is None:
+            return coefficient
+        return coefficient % self.modulus
+
+
+class _Element(object):
+    """The monic poly in the basis: the leading monomial and the tail."""
+
+    __slots__ = ("lead", "tail", "sugar")
+
+    def __init__(self, lead, tail, sugar):
+        self.lead = lead
+        self.tail = tail   # lista (jednomian, wspolczynnik)
+        self.sugar = sugar
+
+    def terms(self):
+        result = dict(self.tail)
+        result[self.lead] = 1
+        return result
+
+
+class _Pair(object):
+    """The critical pair (i, j) with the lcm of leading monomials."""
+
+    __slots__ = ("i", "j", "lcm", "sugar")
+
+    def __init__(self, i, j, basis):
+        self.i = i
+        self.j = j
+        self.lcm = _lcm(basis[i].lead, basis[j].lead)
+        degree = sum(self.lcm)
+        self.sugar = max(basis[i].sugar - sum(basis[i].lead),
+            basis[j].sugar - sum(basis[j].lead)) + degree
+
+
+def _make_element(terms, sugar, field, order):
+    """Return the monic element made from nonzero terms."""
+    lead = min(terms, key=order)   # najwiekszy jednomian
+    inverse = field.inverse(terms[lead])
+    tail = [(monomial, field.reduce(coefficient * inverse))
+        for (monomial, coefficient) in terms.items() if monomial != lead]
+    return _Element(lead, tail, sugar)
+
+
+def _normal_form(terms, sugar, active, basis, field, order):
+    """Return the normal form of terms w.r.t. the active basis."""
+    pending = dict(terms)
+    heap = [(order(monomial), monomial) for monomial in pending]
+    heapq.heapify(heap)
+    remainder = dict()
+    while heap:
+        monomial = heapq.heappop(heap)[1]
+        coefficient = field.reduce(pending.pop(monomial))
+        if coefficient == 0:
+            continue
+        for i in active:
+            element = basis[i]
+            if _divides(element.lead, monomial):
+                shift = _shift(monomial, element.lead)
+                sugar = max(sugar, sum(shift) + element.sugar)
+                for (monomial2, coefficient2) in element.tail:
+                    new_monomial = _times(shift, monomial2)
+                    if new_monomial in pending:
+                        pending[new_monomial] -= coefficient * coefficient2
+                    else:
+                        pending[new_monomial] = -coefficient * coefficient2
+                        heapq.heappush(heap, (order(new_monomial), new_monomial))
+                break
+        else:   # wyraz zostaje w reszcie
+            remainder[monomial] = coefficient
+    return remainder, sugar
+
+
+def _update(active, pairs, h, basis):
+    """Add h to the basis, the Gebauer-Moller criteria."""
+    lead = basis[h].lead
+    candidates = list(active)
+    kept = []
+    while candidates:
+        g = candidates.pop()
+        lcm1 = _lcm(lead, basis[g].lead)
+        if (_coprime(lead, basis[g].lead) or
+            not any(_divides(_lcm(lead, basis[g2].lead), lcm1)
+                for g2 in candidates + kept)):
+                    kept.append(g)
+    new_pairs = [pair for pair in pairs
+        if not _divides(lead, pair.lcm)
+        or _lcm(basis[pair.i].lead, lead) == pair.lcm
+        or _lcm(lead, basis[pair.j].lead) == pair.lcm]
+    new_pairs.extend(_Pair(h, g, basis) for g in kept
+        if not _coprime(lead, basis[g].lead))
+    new_active = [g for g in active if not _divides(lead, basis[g].lead)]
+    new_active.append(h)
+    return new_active, new_pairs
+
+
+def _spoly(pair, basis, field):
+    """Return the S-polynomial of the pair (dict of terms)."""
+    element1 = basis[pair.i]
+    element2 = basis[pair.j]
+    shift1 = _shift(pair.lcm, element1.lead)
+    shift2 = _shift(pair.lcm, element2.lead)
+    terms = dict()
+    for (monomial, coefficient) in element1.tail:
+        new_monomial = _times(shift1, monomial)
+        terms[new_monomial] = terms.get(new_monomial, 0) + coefficient
+    for (monomial, coefficient) in element2.tail:
+        new_monomial = _times(shift2, monomial)
+        terms[new_monomial] = terms.get(new_monomial, 0) - coefficient
+    return dict((monomial, field.reduce(coefficient))
+        for (monomial, coefficient) in terms.items()
+        if field.reduce(coefficient) != 0)
+
+
+def _buchberger(basis, active, pairs, field, order):
+    while pairs:
+        # Strategia cukru: najpierw para o najmniejszym cukrze.
+        pair = min(pairs, key=lambda pair: (pair.sugar, sum(pair.lcm)))
+        pairs.remove(pair)
+        terms = _spoly(pair, basis, field)
+        terms, sugar = _normal_form(terms, pair.sugar, active, basis,
+            field, order)
+        if terms:
+            basis.append(_make_element(terms, sugar, field, order))
+            active, pairs = _update(active, pairs, len(basis) - 1, basis)
+    return active
+
+
+def _echelon(rows, pivots, field):
+    """Add rows to the row echelon form, return new leading columns."""
+    # Wiersze to slowniki {kolumna: wspolczynnik}, kolumna 0 jest najwieksza,
+    # pivots to {kolumna wiodaca: wiersz unormowany}.
+    new = []
+    for row in rows:
+        row = dict(row)
+        heap = list(row)
+        heapq.heapify(heap)
+        lead = None
+        while heap:
+            column = heapq.heappop(heap)
+            coefficient = row[column]
+            if coefficient == 0:
+                del row[column]
+                continue
+            if column not in pivots:
+                if lead is None:
+                    lead = column
+                continue
+            del row[column]
+            for (k, value) in pivots[column].items():
+                if k == column:
+                    continue
+                if k in row:
+                    row[k] = field.reduce(row[k] - coefficient * value)
+                else:
+                    row[k] = field.reduce(-coefficient * value)
+                    heapq.heappush(heap, k)
+        if lead is not None:
+            inverse = field.inverse(row[lead])
+            pivots[lead] = dict((k, field.reduce(value * inverse))
+                for (k, value) in row.items() if value != 0)
+            new.append(lead)
+    return new
+
+
+def _f4(basis, active, pairs, field, order):
+    while pairs:
+        # Wszystkie pary o najmniejszym cukrze redukujemy razem.
+        sugar = min(pair.sugar for pair in pairs)
+        batch = [pair for pair in pairs if pair.sugar == sugar]
+        pairs = [pair for pair in pairs if pair.sugar != sugar]
+        rows = [_spoly(pair, basis, field) for pair in batch]
+        # Preprocessing symboliczny: wiersze redukujace z bazy.
+        reducers = dict()
+        done = set()
+        todo = set(monomial for row in rows for monomial in row)
+        while todo:
+            monomial = todo.pop()
+            done.add(monomial)
+            for i in active:
+                if _divides(basis[i].lead, monomial):
+                    shift = _shift(monomial, basis[i].lead)
+                    row = dict((_times(shift, monomial2), coefficient)
+                        for (monomial2, coefficient) in basis[i].tail)
+                    row[monomial] = 1
+                    reducers[monomial] = row
+                    todo.update(m for m in row if m not in done)
+                    break
+        columns = sorted(done, key=order)
+        index = dict((monomial, i) for (i, monomial) in enumerate(columns))
+        pivots = dict((index[monomial], dict((index[m], coefficient)
+            for (m, coefficient) in row.items()))
+            for (monomial, row) in reducers.items())
+        rows = [dict((index[monomial], coefficient)
+            for (monomial, coefficient) in row.items()) for row in rows]
+        new = _echelon(rows, pivots, field)
+        # Wieksze najpierw, wtedy _update() usunie wielokrotnosci.
+        for column in sorted(new):
+            terms = dict((columns[k], coefficient)
+                for (k, coefficient) in pivots[column].items())
+            basis.append(_make_element(terms, sugar, field, order))
+            active, pairs = _update(active, pairs, len(basis) - 1, basis)
+    return active
+
+
+def groebner(polys, key=None, modulus=None, method="buchberger"):
+    """Return the reduced Groebner basis of polys (mpolys.Poly)."""
+    # key - porzadek jednomianow (Poly.key_lex, Poly.key_deglex),
+    # modulus - liczba pierwsza p dla obliczen w GF(p),
+    # method - "buchberger" albo "f4".
+    if method not in ("buchberger", "f4"):
+        raise ValueError("unknown method")
+    field = _Field(modulus)
+    polys = [poly if isinstance(poly, Poly) else Poly(poly) for poly in polys]
+    nvars = max([len(k) for poly in polys for k in poly] + [1])
+    order = _heap_order(key)
+    pad = lambda k: tuple(k) + (0,) * (nvars - len(k))
+    basis = []
+    active = []
+    pairs = []
+    for poly in polys:
+        terms = dict()
+        for (k, coefficient) in poly.items():
+            coefficient = field.convert(coefficient)
+            if coefficient != 0:
+                terms[pad(k)] = terms.get(pad(k), 0) + coefficient
+        terms = dict((monomial, coefficient)
+            for (monomial, coefficient) in terms.items() if coefficient != 0)
+        if not terms:
+            continue
+        terms, sugar = _normal_form(terms, max(sum(m) for m in terms),
+            active, basis, field, order)
+        if not terms:
+            continue
+        basis.append(_make_element(terms, sugar, field, order))
+        active, pairs = _update(active, pairs, len(basis) - 1, basis)
+    if method == "f4":
+        active = _f4(basis, active, pairs, field, order)
+    else:
+        active = _buchberger(basis, active, pairs, field, order)
+    # Baza minimalna, a potem zredukowana.
+    active = [i for i in active if not any(j != i and
+        _divides(basis[j].lead, basis[i].lead) for j in active)]
+    result = []
+    for i in active:
+        others = [j for j in active if j != i]
+        tail, sugar = _normal_form(dict(basis[i].tail), 0, others,
+            basis, field, order)
+        tail[basis[i].lead] = 1
+        result.append((order(basis[i].lead), tail))
+    result.sort(key=lambda item: item[0])
+    return [Poly._fromdict(dict((_normalize(monomial), coefficient)
+        for (monomial, coefficient) in terms.items()))
+        for (_, terms) in result]
+
+# EOF
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+
+# Wielomiany nad GF(p) i NWD wielomianow o wspolczynnikach calkowitych.
+# Wielomian to lista [c0, c1, ..., cn] bez zer wiodacych, [] to zero.
+
+from math import gcd
+from pypolys import dense
+
+try:
+    range = xrange
+except NameError:   # Python 3
+    pass
+
+# Od tego stopnia gf_gcd() uzywa algorytmu half-GCD.
+HGCD_THRESHOLD = 128
+# Ponizej tego stopnia gcd() uzywa ciagu podreszt zamiast CRT.
+MODULAR_GCD_THRESHOLD = 8
+# Od tylu punktow gf_multi_eval() i gf_interpolate() uzywaja drzewa.
+SUBPRODUCT_THRESHOLD = 128
+# Od tej dlugosci gf_taylor_shift() uzywa metody dziel i rzadz.
+TAYLOR_SHIFT_THRESHOLD = 64
+
+
+def is_prime(n):
+    """Test if n is a prime (deterministic for n < 3.3e24)."""
+    if n < 2:
+        return False
+    small = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for p in small:
+        if n % p == 0:
+            return n == p
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d = d // 2
+        s = s + 1
+    for a in small:   # test Millera-Rabina
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for i in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primes(start=2**31):
+    """Generate primes smaller than start, in decreasing order."""
+    n = start - 1
+    while n > 2:
+        if is_prime(n):
+            yield n
+        n = n - 1
+
+
+def degree(a):
+    """Return the degree of the list poly, -1 for zero."""
+    return len(a) - 1
+
+
+def gf_reduce(a, p):
+    """Return the list poly modulo p."""
+    return dense.trim([item % p for item in a])
+
+
+def gf_add(a, b, p):
+    return gf_reduce(dense._add(a, b), p)
+
+
+def gf_sub(a, b, p):
+    return gf_reduce(dense._sub(a, b), p)
+
+
+def gf_mul(a, b, p):
+    return gf_reduce(dense.mul(a, b), p)
+
+
+def gf_monic(a, p):
+    """Return the monic poly (the leading coefficient is 1)."""
+    if not a:
+        return []
+    inverse = pow(a[-1], p - 2, p)
+    return [item * inverse % p for item in a]
+
+
+def gf_inverse_series(a, n, p):
+    """Return the power series 1/a modulo (x**n, p), Newton iteration."""
+    result = [pow(a[0], p - 2, p)]
+    k = 1
+    while k < n:
+        k = min(2 * k, n)
+        error = [-item for item in dense.mul(a[:k], result)[:k]]
+        error[0] += 2
+        result = [item % p for item in dense.mul(result, error)[:k]]
+    return result
+
+
+def gf_divmod_newton(a, b, p):
+    """Return the quotient and the remainder modulo p (Newton)."""
+    m = len(b) - 1
+    k = len(a) - m
+    inverse = gf_inverse_series(b[::-1], k, p)
+    quotient = [item % p for item in dense.mul(a[::-1][:k], inverse)[:k]]
+    quotient.extend([0] * (k - len(quotient)))
+    quotient.reverse()
+    remainder = gf_reduce(dense._sub(a[:m], dense.mul(b, quotient)[:m]), p)
+    return dense.trim(quotient), remainder
+
+
+def gf_divmod(a, b, p):
+    """Return the quotient and the remainder modulo p."""
+    m = len(b) - 1
+    if m < 0:
+        raise ZeroDivisionError("division by zero poly")
+    if len(a) <= m:
+        return [], list(a)
+    if min(len(b), len(a) - m) >= dense.NEWTON_DIVISION_THRESHOLD:
+        return gf_divmod_newton(a, b, p)
+    remainder = list(a)
+    quotient = [0] * (len(a) - m)
+    inverse = pow(b[-1], p - 2, p)
+    for i in range(len(a) - m - 1, -1, -1):
+        item = remainder[i + m] * inverse % p
+        quotient[i] = item
+        if item == 0:
+            continue
+        for (j, item2) in enumerate(b):
+            remainder[i + j] = (remainder[i + j] - item * item2) % p
+    return quotient, dense.trim(remainder[:m])
+
+
+def _gf_taylor_shift(a, powers, i, p):
+    # a(x + c) = lo(x + c) + (x + c)**k * hi(x + c), k = 2**i < len(a).
+    if len(a) < TAYLOR_SHIFT_THRESHOLD:
+        return [item % p for item in dense.taylor_shift(a, powers[0][0])]
+    while 2 ** i >= len(a):
+        i = i - 1
+    k = 2 ** i
+    lo = _gf_taylor_shift(a[:k], powers, i - 1, p)
+    hi = _gf_taylor_shift(a[k:], powers, i - 1, p)
+    return [item % p for item in dense._add(lo, dense.mul(hi, powers[i]))]
+
+
+def gf_taylor_shift(a, c, p):
+    """Return the coefficients of a(x + c) modulo p."""
+    # Dziel i rzadz z potegami (x + c)**(2**i), koszt O(M(n) log n).
+    c = c % p
+    if len(a) < TAYLOR_SHIFT_THRESHOLD:
+        return gf_reduce(dense.taylor_shift(a, c), p)
+    powers = [[c, 1]]
+    while 2 ** len(powers) < len(a):
+        powers.append(gf_mul(powers[-1], powers[-1], p))
+    return dense.trim(_gf_taylor_shift(a, powers, len(powers) - 1, p))
+
+
+def gf_subproduct_tree(points, p):
+    """Return the levels of the tree of products of (x - point) mod p."""
+    # tree[0] to liscie [-a, 1], tree[-1] == [prod(x - a)].
+    level = [[-point % p, 1] for point in points]
+    tree = [level]
+    while len(level) > 1:
+        next_level = [gf_mul(level[i], level[i+1], p)
+            for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2 == 1:
+            next_level.append(level[-1])
+        level = next_level
+        tree.append(level)
+    return tree
+
+
+def _gf_remainders(a, tree, p):
+    """Return a modulo the leaves of the tree (going down)."""
+    remainders = [gf_divmod(a, tree[-1][0], p)[1]]
+    for level in reversed(tree[:-1]):
+        remainders = [gf_divmod(remainders[i // 2], node, p)[1]
+            for (i, node) in enumerate(level)]
+    return [remainder[0] if remainder else 0 for remainder in remainders]
+
+
+def gf_multi_eval(a, points, p):
+    """Return the values of the poly at many points modulo p."""
+    # Drzewo podiloczynow, O(M(n) log n); dla malych n schemat Hornera.
+    points = [point % p for point in points]
+    if min(len(a), len(points)) < SUBPRODUCT_THRESHOLD:
+        values = []
+        for x in points:
+            result = 0
+            for item in reversed(a):
+                result = (result * x + item) % p
+            values.append(result)
+        return values
+    return _gf_remainders(gf_reduce(a, p), gf_subproduct_tree(points, p), p)
+
+
+def gf_interpolate(points, values, p):
+    """Return the interpolating poly modulo p."""
+    # f = sum c_i m/(x - a_i), c_i = v_i/m'(a_i),
+    # sumy liczone od lisci drzewa do korzenia.
+    points = [point % p for point in points]
+    if len(points) != len(values):
+        raise ValueError("different numbers of points and values")
+    if len(set(points)) != len(points):
+        raise ValueError("points are not distinct")
+    if len(points) < SUBPRODUCT_THRESHOLD:   # ilorazy roznicowe Newtona
+        n = len(points)
+        differences = [value % p for value in values]
+        for j in range(1, n):
+            for i in range(n - 1, j - 1, -1):
+                differences[i] = ((differences[i] - differences[i-1]) *
+                    pow(points[i] - points[i-j], p - 2, p) % p)
+        result = []
+        for i in range(n - 1, -1, -1):
+            result = gf_sub([0] + result,
+                [points[i] * item for item in result], p)
+            result = gf_add(result, [differences[i]], p)
+        return result
+    tree = gf_subproduct_tree(points, p)
+    root = tree[-1][0]
+    derivative = [i * item % p for (i, item) in enumerate(root)][1:]
+    weights = _gf_remainders(derivative, tree, p)
+    combined = [[value * pow(weight, p - 2, p) % p]
+        for (value, weight) in zip(values, weights)]
+    for products in tree[:-1]:
+        new = [gf_add(gf_mul(combined[i], products[i+1], p),
+            gf_mul(combined[i+1], products[i], p), p)
+            for i in range(0, len(combined) - 1, 2)]
+        if len(combined) % 2 == 1:
+            new.append(combined[-1])
+        combined = new
+    return combined[0]
+
+
+def _gf_apply(matrix, a, b, p):
+    """Return matrix * (a, b)."""
+    ((m00, m01), (m10, m11)) = matrix
+    return (gf_add(gf_mul(m00, a, p), gf_mul(m01, b, p), p),
+            gf_add(gf_mul(m10, a, p), gf_mul(m11, b, p), p))
+
+
+def _gf_matmul(m1, m2, p):
+    """Return the product of 2x2 matrices of polys."""
+    return tuple(tuple(
+        gf_add(gf_mul(m1[i][0], m2[0][j], p), gf_mul(m1[i][1], m2[1][j], p), p)
+        for j in range(2)) for i in range(2))
+
+
+def gf_hgcd(a, b, p):
+    """Return the half-GCD matrix M, (c, d) = M * (a, b)."""
+    # deg(a) >= deg(b), wynik: deg(c) >= m > deg(d), m = ceil(deg(a)/2).
+    m = (degree(a) + 1) // 2
+    matrix = (([1], []), ([], [1]))
+    if degree(a) < HGCD_THRESHOLD:   # male stopnie, zwykly Euklides
+        while degree(b) >= m:
+            q, r = gf_divmod(a, b, p)
+            a, b = b, r
+            matrix = _gf_matmul(
+                (([], [1]), ([1], gf_sub([], q, p))), matrix, p)
+        return matrix
+    if degree(b) < m:
+        return matrix
+    matrix = gf_hgcd(a[m:], b[m:], p)
+    a, b = _gf_apply(matrix, a, b, p)
+    if degree(b) < m:
+        return matrix
+    q, r = gf_divmod(a, b, p)
+    a, b = b, r
+    matrix = _gf_matmul((([], [1]), ([1], gf_sub([], q, p))), matrix, p)
+    if degree(b) < m:
+        return matrix
+    k = 2 * m - degree(a)
+    return _gf_matmul(gf_hgcd(a[k:], b[k:], p), matrix, p)
+
+
+def gf_gcd(a, b, p):
+    """Return the monic gcd of polys modulo p."""
+    a = gf_reduce(a, p)
+    b = gf_reduce(b, p)
+    if degree(a) < degree(b):
+        a, b = b, a
+    while b:
+        if degree(b) >= HGCD_THRESHOLD and 2 * degree(b) > degree(a):
+            a, b = _gf_apply(gf_hgcd(a, b, p), a, b, p)
+            if not b:
+                break
+        a, b = b, gf_divmod(a, b, p)[1]
+    return gf_monic(a, p)
+
+
+def gf_resultant(a, b, p):
+    """Return the resultant of polys modulo p (Euclidean algorithm)."""
+    a = gf_reduce(a, p)
+    b = gf_reduce(b, p)
+    if not a or not b:
+        return 0
+    result = 1
+    while degree(b) > 0:
+        r = gf_divmod(a, b, p)[1]
+        if not r:
+            return 0
+        if degree(a) * degree(b) % 2 == 1:
+            result = -result
+        result = result * pow(b[-1], degree(a) - degree(r), p) % p
+        a, b = b, r
+    return result * pow(b[-1], degree(a), p) % p
+
+
+def crt(r1, m1, r2, m2):
+    """Return x mod m1*m2 with x = r1 mod m1, x = r2 mod m2 (m2 prime)."""
+    # Chinskie twierdzenie o resztach, m2 nie dzieli m1.
+    return (r1 + m1 * ((r2 - r1) * pow(m1, m2 - 2, m2) % m2)) % (m1 * m2)
+
+
+def symmetric(a, m):
+    """Return the coefficients from the range (-m/2, m/2]."""
+    half = m // 2
+    return [item - m if item > half else item for item in a]
+
+
+def content(a):
+    """Return the gcd of integer coefficients (the sign of a[-1])."""
+    result = 0
+    for item in a:
+        result = gcd(result, item)
+    if a and a[-1] < 0:
+        result = -result
+    return result
+
+
+def primitive(a):
+    """Return the primitive part of the integer poly."""
+    c = content(a)
+    if c == 0:
+        return []
+    return [item // c for item in a]
+
+
+def prem(a, b):
+    """Return the pseudo-remainder of integer polys."""
+    # lc(b)**(deg(a)-deg(b)+1) * a = q * b + r.
+    m = degree(b)
+    remainder = list(a)
+    lc = b[-1]
+    for i in range(len(a) - m - 1, -1, -1):
+        item = remainder[i + m]
+        remainder = [x * lc for x in remainder]
+        for (j, item2) in enumerate(b):
+            remainder[i + j] -= item * item2
+    return dense.trim(remainder[:m])
+
+
+def _divides(b, a):
+    """Test if the integer poly b divides the integer poly a."""
+    if degree(b) > degree(a):
+        return not a
+    quotient, remainder = dense.divmod_school(a, b)
+    return (all(item == 0 for item in remainder) and
+        all(item.denominator == 1 for item in quotient))
+
+
+def gcd_subresultant(a, b):
+    """Return the gcd of integer polys (subresultant PRS)."""
+    if degree(a) < degree(b):
+        a, b = b, a
+    if not b:
+        return primitive(a) if a else []
+    c = gcd(content(a), content(b))
+    a = primitive(a)
+    b = primitive(b)
+    g = h = 1
+    while True:
+        delta = degree(a) - degree(b)
+        r = prem(a, b)
+        if not r:
+            break
+        if degree(r) == 0:
+            return [c]
+        a, b = b, [item // (g * h ** delta) for item in r]
+        g = a[-1]
+        h = g ** delta // h ** (delta - 1) if delta > 0 else h
+    return [c * item for item in primitive(b)]
+
+
+def gcd_modular(a, b):
+    """Return the gcd of integer polys (modular algorithm, CRT)."""
+    # Obrazy modulo duze liczby pierwsze, sklejanie przez CRT,
+    # sprawdzenie przez dzielenie probne.
+    if not a or not b:
+        return primitive(a or b)
+    c = gcd(content(a), content(b))
+    a = primitive(a)
+    b = primitive(b)
+    lc = gcd(a[-1], b[-1])
+    result = None   # biezace (wielomian, modul)
+    previous = None
+    for p in primes():
+        if a[-1] % p == 0 or b[-1] % p == 0:
+            continue   # p dzieli wspolczynniki wiodace
+        image = gf_gcd(a, b, p)
+        if degree(image) == 0:
+            return [c]
+        image = [item * lc % p for item in image]
+        if result is None or degree(image) < degree(result[0]):
+            result = (image, p)   # poprzednie liczby pierwsze byly pechowe
+            previous = None
+            continue
+        if degree(image) > degree(result[0]):
+            continue   # p jest pechowa
+        (h, m) = result
+        h = [crt(x, m, y, p) for (x, y) in zip(h, image)]
+        result = (h, m * p)
+        candidate = primitive(symmetric(h, m * p))
+        if candidate == previous:   # CRT sie ustabilizowalo
+            if _divides(candidate, a) and _divides(candidate, b):
+                return [c * item for item in candidate]
+        previous = candidate
+
+
+def gcd_integer(a, b):
+    """Return the gcd of integer polys, the best method."""
+    if min(degree(a), degree(b)) < MODULAR_GCD_THRESHOLD:
+        return gcd_subresultant(a, b)
+    return gcd_modular(a, b)
+
+
+def resultant_integer(a, b):
+    """Return the resultant of integer polys (subresultant PRS)."""
+    if not a or not b:
+        return 0
+    ca = content(a)
+    cb = content(b)
+    t = ca ** degree(b) * cb ** degree(a)
+    a = [item // ca for item in a]
+    b = [item // cb for item in b]
+    g = h = s = 1
+    if degree(a) < degree(b):
+        a, b = b, a
+        if degree(a) % 2 == 1 and degree(b) % 2 == 1:
+            s = -1
+    while degree(b) > 0:
+        delta = degree(a) - degree(b)
+        if degree(a) % 2 == 1 and degree(b) % 2 == 1:
+            s = -s
+        r = prem(a, b)
+        if not r:
+            return 0
+        a, b = b, [item // (g * h ** delta) for item in r]
+        g = a[-1]
+        h = g ** delta // h ** (delta - 1) if delta > 0 else h
+    h = b[-1] ** degree(a) // h ** (degree(a) - 1) if degree(a) > 0 else h
+    return s * t * h
+
+# EOF
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+# Jednomiany wielu zmiennych upakowane w jednej liczbie calkowitej.
+# Kazda zmienna ma pole bits bitow i bit ochronny nad nim, pierwsza
+# zmienna jest najstarsza, na gorze jest pole stopnia calkowitego.
+# Porownanie liczb to wtedy porzadek deglex, mnozenie to dodawanie.
+# Pola maja 8, 16, 32 lub 64 bity, wtedy dziala szybkie struct.
+
+import struct
+
+try:
+    range = xrange
+except NameError:   # Python 3
+    pass
+
+_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+class MonomialPacker(object):
+    """The packed encoding of monomials with nvars variables."""
+
+    def __init__(self, nvars, bits=16):
+        """Load up a packer instance."""
+        self.nvars = nvars
+        nbytes = 1   # bity pola z ochronnym, zaokraglone do bajtow
+        while 8 * nbytes < bits + 1:
+            nbytes = 2 * nbytes
+        width = 8 * nbytes
+        self.bits = bits = width - 1
+        self.offsets = [(nvars - 1 - i) * width for i in range(nvars)]
+        self.degree_offset = nvars * width
+        self.field_mask = (1 << bits) - 1
+        self.guard_mask = sum(1 << (offset + bits) for offset in self.offsets)
+        # Wszystkie pola zmiennych razem z bitami ochronnymi.
+        self.lex_mask = (1 << self.degree_offset) - 1
+        if nbytes in _FORMATS:
+            self._struct = struct.Struct(">{}{}".format(nvars, _FORMATS[nbytes]))
+        else:
+            self._struct = None
+
+    @classmethod
+    def fromkeys(cls, keys, factor=1):
+        """Return a packer for keys and their products (factor keys)."""
+        nvars = 1
+        exponent = 0
+        for key in keys:
+            nvars = max(nvars, len(key))
+            exponent = max(exponent, max(key))
+        bits = max(1, (factor * exponent).bit_length())
+        return cls(nvars, bits)
+
+    def __repr__(self):
+        return "MonomialPacker({}, {})".format(self.nvars, self.bits)
+
+    def pack(self, key):
+        """Return the int for the exponent tuple (nonnegative ints)."""
+        if len(key) > self.nvars:
+            raise ValueError("too many variables")
+        if min(key) < 0 or max(key) > self.field_mask:
+            raise ValueError("exponent out of range")
+        if self._struct is not None:
+            key = tuple(key) + (0,) * (self.nvars - len(key))
+            return (int.from_bytes(self._struct.pack(*key), "big") |
+                (sum(key) << self.degree_offset))
+        result = sum(key) << self.degree_offset
+        for (exponent, offset) in zip(key, self.offsets):
+            result |= exponent << offset
+        return result
+
+    def unpack(self, monomial):
+        """Return the exponent tuple without trailing zeros."""
+        if self._struct is not None:
+            key = self._struct.unpack((monomial & self.lex_mask).to_bytes(
+                self._struct.size, "big"))
+        else:
+            mask = self.field_mask
+            key = tuple((monomial >> offset) & mask for offset in self.offsets)
+        if key[-1] != 0:
+            return key
+        n = len(key)
+        while n > 1 and key[n-1] == 0:
+            n = n - 1
+        return key[:n]
+
+    def degree(self, monomial):
+        """Return the total degree of the monomial."""
+        return monomial >> self.degree_offset
+
+    def lex(self, monomial):
+        """Return the int giving the lexicographic order."""
+        return monomial & self.lex_mask
+
+    def overflow(self, monomial):
+        """Test if some exponent does not fit into its field."""
+        return monomial & self.guard_mask != 0
+
+    def divides(self, monomial1, monomial2):
+        """Test if monomial1 divides monomial2."""
+        # Bit ochronny zostaje, jezeli w polu nie bylo pozyczki.
+        guards = self.guard_mask
+        return ((monomial2 | guards) - (monomial1 & self.lex_mask)) & guards == guards
+
+    def lcm(self, monomial1, monomial2):
+        """Return the least common multiple of monomials."""
+        guards = self.guard_mask
+        fields1 = monomial1 & self.lex_mask
+        fields2 = monomial2 & self.lex_mask
+        larger = ((fields1 | guards) - fields2) & guards
+        mask = larger - (larger >> self.bits)   # pola, gdzie m1 >= m2
+        fields = (fields1 & mask) | (fields2 & ~mask & self.lex_mask)
+        degree = sum((fields >> offset) & self.field_mask
+            for offset in self.offsets)
+        return fields | (degree << self.degree_offset)
+
+# EOF
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 
 import itertools
+import heapq
 from fractions import Fraction
+from pypolys import parser
+from pypolys.domains import common_domain
+from pypolys.monomials import MonomialPacker
 
 try:
     rational_types = (int, long, Fraction)
@@ -11,32 +15,265 @@ except NameError:   # Python 3
     rational_types = (int, Fraction)
     from itertools import zip_longest
 
+try:
+    import numpy
+except ImportError:   # numpy jest opcjonalne
+    numpy = None
+
+# Do tylu wyrazow compile() generuje kod zrodlowy funkcji.
+COMPILE_SOURCE_LIMIT = 32
+
+# Brak klucza w slowniku (inny niz kazdy wspolczynnik).
+_MISSING = object()
+
+
+def _normalize(key):
+    """Return the key without trailing zeros."""
+    n = len(key)
+    while n > 1 and key[n-1] == 0:
+        n = n - 1
+    return tuple(key[:n])
+
+
+def _order_value(coefficient):
+    """Return the coefficient as a pair for the order of polys."""
+    # Liczby zespolone leksykograficznie wg (Re, Im), zgodnie z dodawaniem.
+    if isinstance(coefficient, complex):
+        return (coefficient.real, coefficient.imag)
+    return (coefficient, 0)
+
+
+def _divide(coefficient1, coefficient2):
+    """Return the quotient of coefficients, Fraction for rationals."""
+    if (isinstance(coefficient1, rational_types) and
+        isinstance(coefficient2, rational_types)):   # AND
+            return Fraction(coefficient1, coefficient2)
+    else:   # float, complex
+        return coefficient1 / coefficient2
+
+
+class _Descending(object):
+    """The wrapper reversing the order (max-heap from heapq)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def _heap_order(key):
+    """Return a function giving heap keys for padded monomials."""
+    # Najwiekszy jednomian (wg porzadku key) ma najmniejszy klucz.
+    if key is None or key is Poly.key_deglex:
+        return lambda monomial: ((-sum(monomial),) +
+            tuple(-item for item in monomial))
+    elif key is Poly.key_lex:
+        return lambda monomial: tuple(-item for item in monomial)
+    else:   # dowolny porzadek zadany przez funkcje key(poly)
+        return lambda monomial: _Descending(key(Poly(1, *monomial)))
+
+
+def _horner_scheme(terms, var, nvars):
+    """Return the nested Horner scheme for terms (key, coefficient)."""
+    # Wezel to lista par (wykladnik, dziecko) wg malejacych wykladnikow
+    # zmiennej var, lisc (var == nvars) to liczba.
+    if var == nvars:
+        return sum(coefficient for (key, coefficient) in terms)
+    groups = dict()
+    for (key, coefficient) in terms:
+        k = key[var] if var < len(key) else 0
+        groups.setdefault(k, []).append((key, coefficient))
+    return [(k, _horner_scheme(groups[k], var+1, nvars))
+        for k in sorted(groups, reverse=True)]
+
+
+def _power_source(name, k):
+    if k == 1:
+        return name
+    else:
+        return "{} ** {}".format(name, k)
+
+
+def _horner_source(node, var, nvars, namespace):
+    """Return the source of the expression for the Horner scheme."""
+    if var == nvars:
+        name = "c{}".format(len(namespace))
+        namespace[name] = node
+        return name
+    x = "x{}".format(var)
+    result = None
+    last = None
+    for (k, child) in node:
+        value = _horner_source(child, var+1, nvars, namespace)
+        if result is None:
+            result = value
+        else:
+            result = "({}) * {} + {}".format(
+                result, _power_source(x, last - k), value)
+        last = k
+    if last:
+        result = "({}) * {}".format(result, _power_source(x, last))
+    return result
+
+
+def _horner_eval(node, point, var, nvars):
+    """Evaluate the nested Horner scheme at the point."""
+    if var == nvars:
+        return node
+    x = point[var]
+    result = 0
+    last = None
+    for (k, child) in node:
+        value = _horner_eval(child, point, var+1, nvars)
+        if last is None:
+            result = value
+        elif last - k == 1:
+            result = result * x + value
+        else:
+            result = result * x ** (last - k) + value
+        last = k
+    if last:
+        result = result * x ** last
+    return result
+
+
 class Poly(dict):
     """The class defining a poly."""
 
+    # Zapamietane is_zero(), degree() itp., kasowane przy kazdej zmianie.
+    _cache = None
+
+    # Dziedzina wspolczynnikow (pypolys.domains), None - dowolne liczby.
+    domain = None
+
     def __init__(self, coefficient=0, *arguments):
         """Load up a poly instance."""
         # Tworzymy wielomian c*(x**n0)*(y**n1)*(z**n2)*...
         # Wielomiany maja byc unormowane, bez zer przy wspolczynnikach.
         if coefficient != 0 and arguments:   # normalizacja klucza
-            new_key = list(arguments)
-            while new_key[-1] == 0 and len(new_key) > 1:
-                new_key.pop()
-            self[tuple(new_key)] = coefficient
+            if arguments[-1] != 0:
+                dict.__setitem__(self, arguments, coefficient)
+            else:
+                dict.__setitem__(self, _normalize(arguments), coefficient)
         elif coefficient != 0:
-            self[(0,)] = coefficient
+            dict.__setitem__(self, (0,), coefficient)
+
+    @classmethod
+    def _fromdict(cls, data, cancel=False, domain=None):
+        """Create a poly from a dict {key: coefficient}."""
+        # Petle obliczeniowe pracuja na zwyklym slowniku,
+        # bo Poly.__setitem__ jest wolniejsze.
+        new_poly = cls()
+        if domain is not None:
+            dict.update(new_poly, domain.normalize(data))
+            new_poly.domain = domain
+        elif cancel:
+            dict.update(new_poly, ((key, coefficient)
+                for (key, coefficient) in data.items() if coefficient != 0))
+        else:
+            dict.update(new_poly, data)
+        return new_poly
+
+    def todomain(self, domain):
+        """Return the poly with coefficients from the domain."""
+        if domain is None:
+            return Poly._fromdict(self)
+        return Poly._fromdict(dict((key, domain.convert(coefficient))
+            for (key, coefficient) in self.items()), domain=domain)
+
+    def _coerce(self, other):
+        """Return (self, other, domain), polys from the common domain."""
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        domain = common_domain(self.domain, other.domain)
+        if self.domain != domain:
+            self = self.todomain(domain)
+        if other.domain != domain:
+            other = other.todomain(domain)
+        return self, other, domain
+
+    def _coerce_inplace(self, other):
+        """Return other from the domain of self, self can be converted."""
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        if other.domain != self.domain:
+            domain = common_domain(self.domain, other.domain)
+            if self.domain != domain:
+                converted = self.todomain(domain)
+                dict.clear(self)
+                dict.update(self, converted)
+                self.domain = domain
+                self._cache = None
+            if other.domain != domain:
+                other = other.todomain(domain)
+        elif other is self:
+            other = other.copy()
+        return other
+
+    def _get_cache(self):
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = dict()
+        return cache
+
+    def __setitem__(self, key, coefficient):   # poly[key] = coefficient
+        dict.__setitem__(self, key, coefficient)
+        self._cache = None
+
+    def __delitem__(self, key):   # del poly[key]
+        dict.__delitem__(self, key)
+        self._cache = None
+
+    def update(self, *arguments, **kwargs):
+        dict.update(self, *arguments, **kwargs)
+        self._cache = None
+
+    def setdefault(self, key, coefficient=None):
+        self._cache = None
+        return dict.setdefault(self, key, coefficient)
+
+    def pop(self, *arguments):
+        self._cache = None
+        return dict.pop(self, *arguments)
+
+    def popitem(self):
+        self._cache = None
+        return dict.popitem(self)
+
+    def clear(self):
+        dict.clear(self)
+        self._cache = None
+
+    def __ior__(self, other):   # poly |= dict
+        dict.update(self, other)
+        self._cache = None
+        return self
 
     def is_zero(self):
         """Test if the poly is the zero polynomial."""
-        return all(self[key] == 0 for key in self) # moze beda zera, bezpieczne
-        #return not self   # nie trzymamy zer
+        cache = self._get_cache()
+        if "is_zero" not in cache:
+            # moze beda zera, bezpieczne
+            cache["is_zero"] = all(self[key] == 0 for key in self)
+            #cache["is_zero"] = not self   # nie trzymamy zer
+        return cache["is_zero"]
 
     def degree(self):
         """Return the degree of the poly."""
-        if self.is_zero():
-            return 0
-        else:   # jest zabezpieczenie na zerowe wspolczynniki
-            return max(sum(key) for key in self if self[key] != 0)
+        cache = self._get_cache()
+        if "degree" not in cache:
+            if self.is_zero():
+                cache["degree"] = 0
+            else:   # jest zabezpieczenie na zerowe wspolczynniki
+                cache["degree"] = max(sum(key) for key in self
+                    if self[key] != 0)
+        return cache["degree"]
 
     def cancel(self):
         """Remove all zeros."""
@@ -67,13 +304,28 @@ class Poly(dict):
             return " + ".join(L)
 
     @classmethod
-    def fromiterable(cls, data):
+    def fromiterable(cls, data, domain=None):
         """Create a poly from a list of coefficients."""
-        new_poly = cls()
-        for (i, coefficient) in enumerate(data): # wielomian jednej zmiennej
-            if coefficient != 0:   # zer nie trzymamy
-                new_poly += cls(coefficient, i)
-        return new_poly
+        # wielomian jednej zmiennej, zer nie trzymamy
+        if domain is not None:
+            return cls._fromdict(dict(((i,), domain.convert(coefficient))
+                for (i, coefficient) in enumerate(data)), domain=domain)
+        return cls._fromdict(dict(((i,), coefficient)
+            for (i, coefficient) in enumerate(data) if coefficient != 0))
+
+    @classmethod
+    def parse(cls, text, variables=(), domain=None):
+        """Create a poly from text like 3*x**2 + 5*y*z - 1/2 or repr() output."""
+        # variables - nazwy kolejnych zmiennych, lista lub "x, y, z".
+        # Jeden przebieg po tekscie, liczba/liczba daje Fraction.
+        if isinstance(variables, str):
+            variables = variables.replace(",", " ").split()
+        poly = cls._fromdict(dict(((key or (0,)), coefficient)
+            for (key, coefficient) in parser.parse(text, variables).items()
+            if coefficient != 0))
+        if domain is not None:
+            return poly.todomain(domain)
+        return poly
 
     def __getitem__(self, key):   # poly[key]
         """Return the coefficient."""
@@ -81,84 +333,358 @@ class Poly(dict):
         # user moze podac int zamiast tuple.
         if not isinstance(key, tuple):
             key = (key,)
-        # Normujemy klucz.
-        new_key = list(key)
-        while new_key[-1] == 0 and len(new_key) > 1:
-            new_key.pop()
-        return self.get(tuple(new_key), 0)
+        # Normujemy klucz, zwykle jest juz unormowany.
+        if key[-1] == 0 and len(key) > 1:
+            key = _normalize(key)
+        return self.get(key, 0)
 
     def __add__(self, other):      # poly1 + poly2
         """Return the sum of polys."""
-        if not isinstance(other, Poly):
-            other = Poly(other)
-        new_poly = Poly()
-        for key in self:
-            new_poly[key] = new_poly.get(key, 0) + self[key]
-        for key in other:
-            new_poly[key] = new_poly.get(key, 0) + other[key]
-        new_poly.cancel()
-        return new_poly
+        self, other, domain = self._coerce(other)
+        data = dict(self)
+        for (key, coefficient) in other.items():
+            data[key] = data.get(key, 0) + coefficient
+        return Poly._fromdict(data, cancel=True, domain=domain)
 
     __radd__ = __add__
 
     def __sub__(self, other):       # poly1 - poly2
         """Return the difference of polys."""
-        if not isinstance(other, Poly):
-            other = Poly(other)
-        new_poly = Poly()
-        for key in self:
-            new_poly[key] = new_poly.get(key, 0) + self[key]
-        for key in other:
-            new_poly[key] = new_poly.get(key, 0) - other[key]
-        new_poly.cancel()
-        return new_poly
+        self, other, domain = self._coerce(other)
+        data = dict(self)
+        for (key, coefficient) in other.items():
+            data[key] = data.get(key, 0) - coefficient
+        return Poly._fromdict(data, cancel=True, domain=domain)
 
     def __rsub__(self, other):       # poly1 - poly2
         """Return the difference of polys."""
-        if not isinstance(other, Poly):
-            other = Poly(other)
-        new_poly = Poly()
-        for key in self:
-            new_poly[key] = new_poly.get(key, 0) - self[key]
-        for key in other:
-            new_poly[key] = new_poly.get(key, 0) + other[key]
-        new_poly.cancel()
-        return new_poly
+        self, other, domain = self._coerce(other)
+        data = dict(other)
+        for (key, coefficient) in self.items():
+            data[key] = data.get(key, 0) - coefficient
+        return Poly._fromdict(data, cancel=True, domain=domain)
+
+    def __iadd__(self, other):      # poly1 += poly2, w miejscu
+        """Add other to the poly in place."""
+        other = self._coerce_inplace(other)
+        modulus = self.domain.modulus if self.domain is not None else None
+        for (key, coefficient) in other.items():
+            value = self.get(key, 0) + coefficient
+            if modulus is not None:
+                value = value % modulus
+            if value == 0:
+                dict.pop(self, key, None)
+            else:
+                dict.__setitem__(self, key, value)
+        self._cache = None
+        return self
+
+    def __isub__(self, other):      # poly1 -= poly2, w miejscu
+        """Subtract other from the poly in place."""
+        other = self._coerce_inplace(other)
+        modulus = self.domain.modulus if self.domain is not None else None
+        for (key, coefficient) in other.items():
+            value = self.get(key, 0) - coefficient
+            if modulus is not None:
+                value = value % modulus
+            if value == 0:
+                dict.pop(self, key, None)
+            else:
+                dict.__setitem__(self, key, value)
+        self._cache = None
+        return self
+
+    def add_mul(self, poly1, poly2, scalar=1):
+        """Add scalar * poly1 * poly2 to the poly in place."""
+        poly1 = self._coerce_inplace(poly1)
+        poly2 = self._coerce_inplace(poly2)
+        modulus = None
+        if self.domain is not None:
+            scalar = self.domain.convert(scalar)
+            modulus = self.domain.modulus
+        if len(poly1) == 1 or len(poly2) == 1:   # bez iloczynu posredniego
+            if len(poly1) != 1:
+                poly1, poly2 = poly2, poly1
+            ((key1, coefficient1),) = poly1.items()
+            coefficient1 = coefficient1 * scalar
+            terms = [(tuple(x + y for (x, y) in
+                zip_longest(key1, key2, fillvalue=0)),
+                coefficient1 * coefficient2)
+                for (key2, coefficient2) in poly2.items()]
+        else:
+            terms = [(key, scalar * coefficient)
+                for (key, coefficient) in poly1._mul1(poly2).items()]
+        for (key, coefficient) in terms:
+            if key[-1] == 0 and len(key) > 1:
+                key = _normalize(key)
+            value = self.get(key, 0) + coefficient
+            if modulus is not None:
+                value = value % modulus
+            if value == 0:
+                dict.pop(self, key, None)
+            else:
+                dict.__setitem__(self, key, value)
+        self._cache = None
+        return self
+
+    def copy(self):
+        """Return a copy of the poly."""
+        return self._fromdict(self, domain=self.domain)
+
+    def __reduce__(self):
+        """Support pickle (the pypolys.serialize format)."""
+        from pypolys import serialize   # serialize importuje ten modul
+        try:
+            return (serialize.loads, (serialize.dumps(self),))
+        except ValueError:   # wspolczynniki spoza formatu
+            return (_restore, (dict(self), self.domain,
+                isinstance(self, FrozenPoly)))
 
     def __eq__(self, other):   # poly1 == poly2
         """Test if polys are equal."""
-        return (self - other).is_zero()
+        # Bez wielomianu roznicy: porownujemy wyrazy, zera sa dopuszczone.
+        if not isinstance(other, Poly):   # liczba
+            for (key, coefficient) in self.items():
+                if key != (0,) and coefficient != 0:
+                    return False
+            return self.get((0,), 0) == other
+        if other.domain != self.domain:
+            try:
+                self, other, domain = self._coerce(other)
+            except ValueError:   # np. GF(5) i GF(7)
+                return False
+        missing = 0
+        for (key, coefficient) in self.items():
+            item = other.get(key, _MISSING)
+            if item is _MISSING:
+                if coefficient != 0:
+                    return False
+                missing += 1
+            elif item != coefficient:
+                return False
+        if missing == 0 and len(other) == len(self):
+            return True   # inne klucze nie istnieja
+        return all(coefficient == 0 for (key, coefficient) in other.items()
+            if key not in self)
 
     def __ne__(self, other):   # poly1 != poly2
         """Test if polys are not equal."""
         return not self == other
 
-    def __mul__(self, other):        # poly1 * poly2
-        """Return the product of polys."""
+    def __lt__(self, other):   # poly1 < poly2
+        """Compare polys (the total order of sort_key())."""
         if not isinstance(other, Poly):
             other = Poly(other)
-        new_poly = Poly()
-        for key1 in self:
-            for key2 in other:
+        return self.sort_key() < other.sort_key()
+
+    def __le__(self, other):   # poly1 <= poly2
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        return self.sort_key() <= other.sort_key()
+
+    def __gt__(self, other):   # poly1 > poly2
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        return self.sort_key() > other.sort_key()
+
+    def __ge__(self, other):   # poly1 >= poly2
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        return self.sort_key() >= other.sort_key()
+
+    def sort_key(self, key=None):
+        """Return the key of the total order of polys (lex or deglex)."""
+        # p < q, gdy wiodacy wyraz q - p ma dodatni wspolczynnik.
+        # Rangi jednomianow koncza sie -1, wiec zadna nie jest poczatkiem
+        # innej i zmiana znaku odwraca porzadek; (0, (), 0) zamyka klucz.
+        if key is None or key is Poly.key_deglex:
+            name = "sort_key_deglex"
+            rank = lambda k: (sum(k),) + k + (-1,)
+        elif key is Poly.key_lex:
+            name = "sort_key_lex"
+            rank = lambda k: k + (-1,)
+        else:
+            raise ValueError("unsupported monomial order")
+        cache = self._get_cache()
+        if name not in cache:
+            terms = sorted(((rank(_normalize(k)), coefficient)
+                for (k, coefficient) in self.items() if coefficient != 0),
+                reverse=True)
+            items = []
+            for (r, coefficient) in terms:
+                value = _order_value(coefficient)
+                if value > (0, 0):
+                    items.append((1, r, value))
+                else:
+                    items.append((-1, tuple(-x for x in r), value))
+            items.append((0, (), 0))
+            cache[name] = tuple(items)
+        return cache[name]
+
+    def _mul1(self, other):        # poly1 * poly2, slownik
+        """Return the product of polys."""
+        self, other, domain = self._coerce(other)
+        if not self or not other:
+            return Poly._fromdict({}, domain=domain)
+        if (min(min(key) for key in self) < 0 or
+            min(min(key) for key in other) < 0):   # wykladniki ujemne
+                return self._mul_tuples(other)
+        # Jednomiany upakowane, iloczyn jednomianow to suma liczb.
+        packer = MonomialPacker.fromkeys(itertools.chain(self, other),
+            factor=2)
+        pack = packer.pack
+        terms1 = [(pack(key), coefficient)
+            for (key, coefficient) in self.items()]
+        terms2 = [(pack(key), coefficient)
+            for (key, coefficient) in other.items()]
+        data = dict()
+        for (monomial1, coefficient1) in terms1:
+            for (monomial2, coefficient2) in terms2:
+                monomial = monomial1 + monomial2
+                if monomial in data:
+                    data[monomial] += coefficient1 * coefficient2
+                else:
+                    data[monomial] = coefficient1 * coefficient2
+        # (x-2)*(x+2)=x**2-4, znika x**1
+        unpack = packer.unpack
+        if domain is not None:
+            return Poly._fromdict(dict((unpack(monomial), coefficient)
+                for (monomial, coefficient) in data.items()), domain=domain)
+        return Poly._fromdict(dict((unpack(monomial), coefficient)
+            for (monomial, coefficient) in data.items() if coefficient != 0))
+
+    def _mul_tuples(self, other):   # jednomiany jako krotki
+        data = dict()
+        for (key1, coefficient1) in self.items():
+            for (key2, coefficient2) in other.items():
                 new_key = [x + y for (x, y) in zip_longest(key1, key2, fillvalue=0)]
                 new_key = tuple(new_key)
-                new_poly[new_key] = ( new_poly.get(new_key, 0) 
-                    + self[key1] * other[key2] )
-        new_poly.cancel()   # (x-2)*(x+2)=x**2-4, znika x**1
-        return new_poly
+                data[new_key] = ( data.get(new_key, 0) 
+                    + coefficient1 * coefficient2 )
+        return Poly._fromdict(data, cancel=True, domain=self.domain)
+
+    def _mul2(self, other):        # poly1 * poly2, kopiec
+        """Return the product of polys."""
+        self, other, domain = self._coerce(other)
+        return Poly._fromdict(dict(self.iterproduct(other)), domain=domain)
+
+    __mul__ = _mul1   # slownik jest szybszy, kopiec oszczedza pamiec
 
     __rmul__ = __mul__
 
-    def __pos__(self):
-        """Return +poly."""
+    def __imul__(self, other):        # poly1 *= poly2
+        """Multiply the poly by other in place."""
+        if isinstance(other, Poly):
+            product = self * other
+            dict.clear(self)
+            dict.update(self, product)
+            self.domain = product.domain
+        elif other == 0:
+            dict.clear(self)
+        elif self.domain is not None:
+            other = self.domain.convert(other)
+            data = self.domain.normalize(dict((key, coefficient * other)
+                for (key, coefficient) in self.items()))
+            dict.clear(self)
+            dict.update(self, data)
+        else:   # mnozenie przez liczbe bez nowego slownika
+            for (key, coefficient) in self.items():
+                dict.__setitem__(self, key, coefficient * other)
+        self._cache = None
         return self
 
+    def _packed_order(self, key, packer):
+        """Return a function giving heap keys for packed monomials."""
+        # Najwiekszy jednomian (wg porzadku key) ma najmniejszy klucz.
+        if key is None or key is Poly.key_deglex:
+            return lambda monomial: -monomial
+        elif key is Poly.key_lex:
+            lex_mask = packer.lex_mask
+            return lambda monomial: -(monomial & lex_mask)
+        else:   # dowolny porzadek zadany przez funkcje key(poly)
+            unpack = packer.unpack
+            return lambda monomial: _Descending(
+                key(Poly(1, *unpack(monomial))))
+
+    def sorted_terms(self, key=None):
+        """Return the list of terms (key, coefficient), the largest first."""
+        # Porzadek wg key (domyslnie key_deglex), bez zerowych wyrazow.
+        terms = [(k, coefficient) for (k, coefficient) in self.items()
+            if coefficient != 0]
+        if not terms:
+            return []
+        nvars = max(len(k) for (k, coefficient) in terms)
+        order = _heap_order(key)
+        return sorted(terms,
+            key=lambda term: order(term[0] + (0,) * (nvars - len(term[0]))))
+
+    def iterproduct(self, other, key=None):
+        """Generate terms of self * other, the largest first."""
+        # Algorytm Johnsona z kopcem Monagana-Pearce'a: kopiec ma najwyzej
+        # min(len(self), len(other)) elementow, wynik jest juz posortowany.
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        keys = list(itertools.chain(self, other))
+        if keys and min(min(k) for k in keys) < 0:   # wykladniki ujemne
+            for term in self._mul_tuples(other).sorted_terms(key):
+                yield term
+            return
+        packer = MonomialPacker.fromkeys(keys, factor=2)
+        order = self._packed_order(key, packer)
+        pack = packer.pack
+        terms1 = sorted(((order(pack(k)), pack(k), coefficient)
+            for (k, coefficient) in self.items() if coefficient != 0),
+            key=lambda term: term[0])
+        terms2 = sorted(((order(pack(k)), pack(k), coefficient)
+            for (k, coefficient) in other.items() if coefficient != 0),
+            key=lambda term: term[0])
+        if len(terms1) > len(terms2):
+            terms1, terms2 = terms2, terms1
+        if not terms1:
+            return
+        n, m = len(terms1), len(terms2)
+        unpack = packer.unpack
+        # Element kopca (klucz, i, j) to iloczyn terms1[i] * terms2[j].
+        heap = [(order(terms1[0][1] + terms2[0][1]), 0, 0)]
+        while heap:
+            (current, i, j) = heapq.heappop(heap)
+            monomial = terms1[i][1] + terms2[j][1]
+            coefficient = terms1[i][2] * terms2[j][2]
+            following = [(i, j)]
+            while heap and heap[0][0] == current:   # ten sam jednomian
+                (_, i, j) = heapq.heappop(heap)
+                coefficient += terms1[i][2] * terms2[j][2]
+                following.append((i, j))
+            for (i, j) in following:
+                if j + 1 < m:
+                    heapq.heappush(heap,
+                        (order(terms1[i][1] + terms2[j+1][1]), i, j + 1))
+                if j == 0 and i + 1 < n:
+                    heapq.heappush(heap,
+                        (order(terms1[i+1][1] + terms2[0][1]), i + 1, 0))
+            if coefficient != 0:
+                yield (unpack(monomial), coefficient)
+
+    def __pos__(self):
+        """Return +poly (a copy)."""
+        return self.copy()
+
+    def freeze(self):
+        """Return the immutable hashable copy of the poly."""
+        # Postac kanoniczna: klucze bez koncowych zer, bez zerowych wyrazow.
+        data = dict()
+        for (key, coefficient) in self.items():
+            key = _normalize(key)
+            data[key] = data.get(key, 0) + coefficient
+        new_poly = FrozenPoly._fromdict(data, cancel=True, domain=self.domain)
+        hash(new_poly)
+        return new_poly
+
     def __neg__(self):
         """Return -poly."""
-        new_poly = Poly()
-        for key in self:
-            new_poly[key] = -self[key]
-        return new_poly
+        return Poly._fromdict(
+            dict((key, -coefficient) for (key, coefficient) in self.items()),
+            domain=self.domain)
 
     def _power1(self, n):   # poly**n
         new_poly = Poly(1)
@@ -171,9 +697,9 @@ class Poly(dict):
         if n < 0:
             raise ValueError("negative power")
         elif n == 0:
-            return Poly(1)
+            return Poly._fromdict({(0,): 1}, domain=self.domain)
         elif n == 1:
-            return self
+            return self.copy()
         elif n == 2:
             return self * self
         else:
@@ -200,6 +726,9 @@ class Poly(dict):
             # Trzeba usunac zerowe wspolczynniki, jezeli byly dopuszczone.
             #self.cancel()
             #other.cancel()
+            domain = None
+            if self.domain is not None or other.domain is not None:
+                self, other, domain = self._coerce(other)
             if len(self) != 1 or len(other) != 1:
                 raise ValueError("only monomials can be divided")
             key1 = list(self)[0]
@@ -215,6 +744,10 @@ class Poly(dict):
             new_key = tuple(new_key)
             coefficient1 = self[key1]
             coefficient2 = other[key2]
+            if domain is not None:
+                field = domain.field
+                return Poly._fromdict({new_key:
+                    field.div(coefficient1, coefficient2)}, domain=field)
             if (isinstance(coefficient1, rational_types) and
                 isinstance(coefficient2, rational_types)):   # AND
                     # Python 2.7: Fraction(Fraction, Fraction)
@@ -222,6 +755,10 @@ class Poly(dict):
             else:   # float, complex
                 coefficient = coefficient1 / coefficient2
             return Poly(coefficient, *new_key)
+        elif self.domain is not None:
+            field = self.domain.field
+            return Poly._fromdict(dict((key, field.div(coefficient, other))
+                for (key, coefficient) in self.items()), domain=field)
         elif isinstance(other, rational_types):
             # Python 2.7: Fraction(Fraction, Fraction)
             return self * Poly(Fraction(1, other))
@@ -249,7 +786,7 @@ class Poly(dict):
     def diff(self, var=0):   # rozniczkowanie
         """Return the derivative of the poly."""
         # [c*x**n]' = c*n*x**(n-1)
-        new_poly = Poly()
+        data = dict()
         for key in self:
             if var > len(key)-1 or key[var] == 0:
                 continue   # nie ma tej zmiennej w wyrazie
@@ -261,13 +798,14 @@ class Poly(dict):
             while new_key[-1] == 0 and len(new_key) > 1:
                 new_key.pop()
             new_key = tuple(new_key)
-            new_poly[new_key] = coefficient
-        return new_poly
+            data[new_key] = coefficient
+        return Poly._fromdict(data, domain=self.domain)
 
     def integrate(self, var=0):   # calkowanie
         """Return the integral of the poly."""
         # integrate(c*x**n, x) = c*x**(n+1)/(n+1) + const
-        new_poly = Poly()
+        data = dict()
+        field = self.domain.field if self.domain is not None else None
         for key in self:
             coefficient = self[key]
             # Trzeba dobrac dlugosc nowego klucza.
@@ -275,15 +813,17 @@ class Poly(dict):
             # Odtwarzamy stare wartosci klucza.
             for i, item in enumerate(key):
                 new_key[i] += item
-            if isinstance(coefficient, rational_types):
+            if field is not None:
+                coefficient = field.div(coefficient, new_key[var] + 1)
+            elif isinstance(coefficient, rational_types):
                 coefficient *= Fraction(1, new_key[var] + 1)
             else:
                 coefficient /= new_key[var] + 1.0
             # Teraz pojawia sie nowa wartosc klucza.
             new_key[var] += 1
             new_key = tuple(new_key)
-            new_poly[new_key] = coefficient
-        return new_poly
+            data[new_key] = coefficient
+        return Poly._fromdict(data, domain=field)
 
     def _combine1(self, other, var=0):  # zlozenie wielomianow
         """Return the composition of two polys."""
@@ -299,43 +839,194 @@ class Poly(dict):
             new_key = list(key)
             new_key[var] = 0   # znika dana zmienna
             new_key = tuple(new_key)
-            new_poly += Poly(coefficient, *new_key) * pow(other, key[var])
+            new_poly.add_mul(Poly(coefficient, *new_key), pow(other, key[var]))
             # Normowanie jest zawarte w + i *.
         return new_poly
 
     def _combine2(self, other, var=0):  # zlozenie wielomianow
         """Return the composition of two polys."""
-        # Optymalizacja przez przechowywanie juz obliczonych poteg.
+        # Wyrazy grupujemy wg wykladnika zmiennej var, potegi other
+        # liczymy raz, kazda z poprzedniej (wspolna drabina poteg).
         if not isinstance(other, Poly):
             other = Poly(other)
-        new_poly = Poly()
-        powers = dict()
-        for key in self:
-            coefficient = self[key]
-            if var > len(key)-1 or key[var] == 0:
-                # Dodajemy wyraz bez zmian.
-                new_poly += Poly(coefficient, *key)
-                continue
-            new_key = list(key)
-            new_key[var] = 0   # znika dana zmienna
-            new_key = tuple(new_key)
-            if key[var] not in powers:
-                powers[key[var]] = pow(other, key[var])
-            new_poly += Poly(coefficient, *new_key) * powers[key[var]]
-            # Normowanie jest zawarte w + i *.
+        groups = dict()
+        for (key, coefficient) in self.items():
+            exponent = key[var] if var < len(key) else 0
+            if exponent != 0:
+                new_key = list(key)
+                new_key[var] = 0   # znika dana zmienna
+                key = _normalize(new_key)
+            groups.setdefault(exponent, dict())[key] = coefficient
+        new_poly = Poly._fromdict(groups.pop(0, dict()), domain=self.domain)
+        power = None
+        previous = 0
+        steps = dict()   # other ** roznica wykladnikow
+        for exponent in sorted(groups):
+            gap = exponent - previous
+            if gap not in steps:
+                steps[gap] = pow(other, gap)
+            power = steps[gap] if power is None else power * steps[gap]
+            new_poly.add_mul(Poly._fromdict(groups[exponent],
+                domain=self.domain), power)
+            previous = exponent
+        # Normowanie jest zawarte w + i *.
         return new_poly
 
     combine = _combine2
 
+    def compile(self):
+        """Return a fast callable f(x0, x1, ...) computing the poly."""
+        # Zagniezdzony schemat Hornera wg kolejnych zmiennych.
+        terms = [(key, self[key]) for key in self if self[key] != 0]
+        nvars = max([len(key) for (key, coefficient) in terms] + [0])
+        scheme = _horner_scheme(terms, 0, nvars)
+        if len(terms) <= COMPILE_SOURCE_LIMIT:
+            namespace = dict()
+            source = _horner_source(scheme, 0, nvars, namespace)
+            names = "".join("x{}, ".format(i) for i in range(nvars))
+            exec("def _compiled({}*rest):\n    return {}".format(
+                names, source), namespace)
+            function = namespace["_compiled"]
+        else:
+            def function(*point):
+                return _horner_eval(scheme, point, 0, nvars)
+        domain = self.domain
+        if domain is None or domain.modulus is None:
+            return function
+
+        def _compiled(*point):   # wartosc w GF(p)
+            return domain.convert(function(*[domain.convert(x)
+                for x in point]))
+
+        return _compiled
+
+    def eval_many(self, points):
+        """Return the values of the poly at many points."""
+        # points to ciag punktow (x0, x1, ...) albo numpy.ndarray,
+        # gdzie kolumna i zawiera wartosci zmiennej i.
+        terms = [(key, self[key]) for key in self if self[key] != 0]
+        nvars = max([len(key) for (key, coefficient) in terms] + [0])
+        scheme = _horner_scheme(terms, 0, nvars)
+        if numpy is not None and isinstance(points, numpy.ndarray):
+            if (points.dtype.kind in "biu" and
+                all(isinstance(item, rational_types)
+                    for (key, item) in terms)):
+                    # wynik ma byc dokladny, bez przepelnienia int64
+                    points = points.astype(object)
+            domain = self.domain
+            if domain is not None and domain.modulus is not None:
+                points = numpy.array([domain.convert(x)
+                    for x in points.astype(object).flat],
+                    dtype=object).reshape(points.shape)
+            columns = [points[:, i] for i in range(nvars)]
+            value = _horner_eval(scheme, columns, 0, nvars)
+            result = numpy.zeros_like(points[:, 0]) + value
+            if domain is not None and domain.modulus is not None:
+                result = result % domain.modulus
+            return result
+        function = self.compile()
+        return [function(*point) for point in points]
+
+    def reduce(self, divisors, key=None):
+        """Return (quotients, remainder) of the division by divisors."""
+        # Dzielenie wielomianow wielu zmiennych, porzadek wg key
+        # (domyslnie key_deglex). Wyrazy czekaja na kopcu, wspolczynniki
+        # sa sumowane w slowniku, bez tworzenia posrednich wielomianow.
+        divisors = [divisor if isinstance(divisor, Poly) else Poly(divisor)
+            for divisor in divisors]
+        # Z dziedzina dzielimy w jej ciele ulamkow, np. ZZ -> QQ.
+        domain = self.domain
+        for divisor in divisors:
+            domain = common_domain(domain, divisor.domain)
+        if domain is not None:
+            domain = domain.field
+            self = self.todomain(domain)
+            divisors = [divisor.todomain(domain) for divisor in divisors]
+        keys = [k for poly in [self] + divisors for k in poly]
+        if keys and min(min(k) for k in keys) < 0:
+            raise ValueError("negative exponent")
+        for divisor in divisors:
+            if divisor.is_zero():
+                raise ZeroDivisionError("division by zero poly")
+        factor = 2
+        while True:   # przy przepelnieniu pola zwiekszamy pola
+            packer = MonomialPacker.fromkeys(keys, factor=factor)
+            try:
+                return self._reduce_packed(divisors, key, packer, domain)
+            except OverflowError:
+                factor = factor * factor
+
+    def _reduce_packed(self, divisors, key, packer, domain=None):
+        # Jednomiany upakowane, dzielenie jednomianow to maska bitowa.
+        divide = _divide if domain is None else domain.div
+        pack = packer.pack
+        order = self._packed_order(key, packer)
+        leading = []   # (jednomian, wspolczynnik, pozostale wyrazy)
+        for divisor in divisors:
+            terms = [(order(pack(k)), pack(k), coefficient)
+                for (k, coefficient) in divisor.items() if coefficient != 0]
+            terms.sort(key=lambda term: term[0])
+            leading.append((terms[0][1], terms[0][2],
+                [(k, coefficient) for (_, k, coefficient) in terms[1:]]))
+        pending = dict()   # jednomian -> wspolczynnik
+        heap = []
+        guards = packer.guard_mask
+        lex_mask = packer.lex_mask
+
+        def push(monomial, coefficient):
+            if monomial in pending:
+                pending[monomial] += coefficient
+            else:
+                if monomial & guards:
+                    raise OverflowError("exponent too large")
+                pending[monomial] = coefficient
+                heapq.heappush(heap, (order(monomial), monomial))
+
+        for (k, coefficient) in self.items():
+            if coefficient != 0:
+                push(pack(k), coefficient)
+        quotients = [dict() for divisor in divisors]
+        remainder = dict()
+        while heap:
+            monomial = heapq.heappop(heap)[1]
+            coefficient = pending.pop(monomial)
+            if domain is not None:
+                coefficient = domain.convert(coefficient)
+            if coefficient == 0:
+                continue
+            for (i, (k1, coefficient1, rest)) in enumerate(leading):
+                # Test podzielnosci: bez pozyczki zostaja bity ochronne.
+                if ((monomial | guards) - (k1 & lex_mask)) & guards == guards:
+                    shift = monomial - k1
+                    factor = divide(coefficient, coefficient1)
+                    quotients[i][shift] = quotients[i].get(shift, 0) + factor
+                    for (k2, coefficient2) in rest:
+                        push(shift + k2, -factor * coefficient2)
+                    break
+            else:   # zaden wiodacy jednomian nie dzieli
+                remainder[monomial] = coefficient
+        unpack = packer.unpack
+        return ([Poly._fromdict(dict((unpack(k), coefficient)
+            for (k, coefficient) in quotient.items()), cancel=True,
+            domain=domain) for quotient in quotients],
+            Poly._fromdict(dict((unpack(k), coefficient)
+            for (k, coefficient) in remainder.items()), domain=domain))
+
     def key_lex(self):
         """The sorting key for lexicographic order."""
-        alist = max([0] + list(key) for key in self)
-        return tuple(alist)
+        cache = self._get_cache()
+        if "key_lex" not in cache:
+            alist = max([0] + list(key) for key in self)
+            cache["key_lex"] = tuple(alist)
+        return cache["key_lex"]
 
     def key_deglex(self):
         """The sorting key for graded lexicographic order."""
-        alist = max([sum(key)] + list(key) for key in self)
-        return tuple(alist)
+        cache = self._get_cache()
+        if "key_deglex" not in cache:
+            alist = max([sum(key)] + list(key) for key in self)
+            cache["key_deglex"] = tuple(alist)
+        return cache["key_deglex"]
 
     key_deg = key_deglex
 
@@ -372,4 +1063,69 @@ class Poly(dict):
         for key in self:
             yield Poly(self[key], *key)
 
+
+def _frozen(*arguments, **kwargs):
+    raise TypeError("frozen poly is immutable")
+
+
+class FrozenPoly(Poly):
+    """The immutable hashable poly, zero terms are removed."""
+
+    # Hash liczony raz, freeze() liczy go od razu.
+    _hash = None
+
+    __setitem__ = __delitem__ = update = _frozen
+    clear = pop = popitem = setdefault = __ior__ = _frozen
+    add_mul = _frozen
+
+    def __iadd__(self, other):   # p += q daje nowy wielomian
+        return NotImplemented
+
+    __isub__ = __imul__ = __iadd__
+
+    def cancel(self):   # zer nie ma
+        pass
+
+    def __hash__(self):
+        if self._hash is None:
+            # Stala ma hash liczby, bo Poly(5).freeze() == 5.
+            if not self:
+                self._hash = hash(0)
+            elif len(self) == 1 and dict.__contains__(self, (0,)):
+                self._hash = hash(dict.__getitem__(self, (0,)))
+            else:
+                self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __eq__(self, other):   # poly1 == poly2
+        """Test if polys are equal."""
+        # Bez zer przy wspolczynnikach wystarczy porownac slowniki.
+        if isinstance(other, FrozenPoly):
+            if hash(self) != hash(other):
+                return False
+            return dict.__eq__(self, other)
+        return Poly.__eq__(self, other)
+
+    def __ne__(self, other):   # poly1 != poly2
+        """Test if polys are not equal."""
+        return not self == other
+
+    def __pos__(self):
+        """Return +poly."""
+        return self
+
+    def freeze(self):
+        """Return the frozen poly (self)."""
+        return self
+
+    def thaw(self):
+        """Return a mutable copy of the poly."""
+        return Poly._fromdict(dict(self), domain=self.domain)
+
+
+def _restore(data, domain, frozen):
+    """Recreate the poly (pickle)."""
+    poly = Poly._fromdict(data, domain=domain)
+    return poly.freeze() if frozen else poly
+
 # EOF
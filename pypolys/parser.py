@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+# Parser wyrazen wielomianowych dla Poly.parse() z polys i mpolys:
+# 3*x**2 + 5*y*z - 1/2, x^2 - (1/3)*x, Poly(4) + Poly(Fraction(1, 2), 3).
+# Tokeny powstaja w jednym przebiegu, wyrazy trafiaja od razu
+# do slownika {klucz: wspolczynnik}, bez wielomianow posrednich.
+# Nawiasy moga zawierac liczby albo jeden jednomian (bez mnozenia sum).
+
+import re
+from fractions import Fraction
+
+try:
+    integer_types = (int, long)
+except NameError:   # Python 3
+    integer_types = (int,)
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?[jJ]?)
+    |(?P<name>[A-Za-z_]\w*)
+    |(?P<op>\*\*|[-+*/^(),])
+    )""", re.VERBOSE)
+
+_END = ("end", None)
+
+
+def _tokenize(text):
+    """Yield tokens (kind, value), numbers are converted."""
+    position = 0
+    end = len(text.rstrip())
+    while position < end:
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == match.start():
+            raise ValueError("unexpected character at position {}".format(
+                len(text) - len(text[position:].lstrip())))
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            if value[-1] in "jJ":
+                value = complex(value)
+            elif value.isdigit():
+                value = int(value)
+            else:
+                value = float(value)
+        elif kind == "op" and value == "^":
+            value = "**"
+        yield (kind, value)
+    yield _END
+
+
+def _divide(a, b):
+    """Return a / b, exact for rationals."""
+    if isinstance(a, integer_types + (Fraction,)) and isinstance(
+        b, integer_types + (Fraction,)):
+            result = Fraction(a, b)
+            return result.numerator if result.denominator == 1 else result
+    return a / b
+
+
+def _multiply_keys(key1, key2):
+    """Return the exponents of the product of monomials."""
+    if len(key1) < len(key2):
+        key1, key2 = key2, key1
+    if not key2:
+        return key1
+    return tuple(a + b for (a, b) in zip(key1, key2)) + key1[len(key2):]
+
+
+class _Parser(object):
+    """The recursive descent parser of poly expressions."""
+
+    def __init__(self, text, variables):
+        self.tokens = _tokenize(text)
+        self.token = next(self.tokens)
+        # nazwa -> krotka wykladnikow zmiennej
+        self.variables = dict((name, (0,) * i + (1,))
+            for (i, name) in enumerate(variables))
+
+    def advance(self):
+        token = self.token
+        self.token = next(self.tokens)
+        return token
+
+    def expect(self, value):
+        if self.token[1] != value or self.token[0] != "op":
+            self.error()
+        self.advance()
+
+    def error(self):
+        if self.token is _END:
+            raise ValueError("unexpected end of input")
+        raise ValueError("unexpected token {!r}".format(self.token[1]))
+
+    def parse(self):
+        """Return {exponents: coefficient} for the whole text."""
+        data = self.expression()
+        if self.token is not _END:
+            self.error()
+        return data
+
+    def expression(self):
+        """Return the dict for the sum of terms."""
+        data = dict()
+        key, coefficient = self.term()
+        data[key] = coefficient
+        while self.token[1] in ("+", "-") and self.token[0] == "op":
+            sign = self.advance()[1]
+            key, coefficient = self.term()
+            if sign == "-":
+                coefficient = -coefficient
+            data[key] = data.get(key, 0) + coefficient
+        return data
+
+    def term(self):
+        """Return (exponents, coefficient) for the product of factors."""
+        key, coefficient = self.factor()
+        while self.token[1] in ("*", "/") and self.token[0] == "op":
+            operator = self.advance()[1]
+            other, value = self.factor()
+            if operator == "*":
+                key = _multiply_keys(key, other)
+                coefficient = coefficient * value
+            elif any(other):
+                raise ValueError("division by a monomial")
+            else:
+                coefficient = _divide(coefficient, value)
+        while key and key[-1] == 0:   # jeden klucz dla jednomianu
+            key = key[:-1]
+        return key, coefficient
+
+    def factor(self):
+        """Return (exponents, coefficient) for a signed power."""
+        if self.token[1] in ("+", "-") and self.token[0] == "op":
+            sign = self.advance()[1]
+            key, coefficient = self.factor()
+            return key, (-coefficient if sign == "-" else coefficient)
+        key, coefficient = self.atom()
+        if self.token == ("op", "**"):
+            self.advance()
+            kind, n = self.advance()
+            if kind != "number" or not isinstance(n, integer_types):
+                raise ValueError("exponent is not a nonnegative integer")
+            key = tuple(item * n for item in key)
+            coefficient = coefficient ** n
+        return key, coefficient
+
+    def atom(self):
+        kind, value = self.token
+        if kind == "number":
+            self.advance()
+            return (), value
+        elif kind == "name":
+            self.advance()
+            if value == "Poly":
+                return self.poly()
+            elif value == "Fraction":
+                self.expect("(")
+                numerator = self.constant()
+                self.expect(",")
+                denominator = self.constant()
+                self.expect(")")
+                return (), Fraction(numerator, denominator)
+            elif value in self.variables:
+                return self.variables[value], 1
+            raise ValueError("unknown variable {!r}".format(value))
+        elif self.token == ("op", "("):
+            self.advance()
+            data = self.expression()
+            self.expect(")")
+            data = dict((key, coefficient)
+                for (key, coefficient) in data.items() if coefficient != 0)
+            if not data:
+                return (), 0
+            if len(data) > 1:
+                raise ValueError("products of sums are not supported")
+            return data.popitem()
+        self.error()
+
+    def constant(self):
+        key, coefficient = self.factor()
+        if any(key):
+            raise ValueError("constant expected")
+        return coefficient
+
+    def poly(self):
+        """Return (exponents, coefficient) for Poly(c, k1, k2, ...)."""
+        self.expect("(")
+        if self.token == ("op", ")"):
+            self.advance()
+            return (), 0
+        coefficient = self.constant()
+        key = []
+        while self.token == ("op", ","):
+            self.advance()
+            kind, n = self.advance()
+            if kind != "number" or not isinstance(n, integer_types):
+                raise ValueError("exponent is not a nonnegative integer")
+            key.append(n)
+        self.expect(")")
+        return tuple(key), coefficient
+
+
+def parse(text, variables=()):
+    """Return {exponents: coefficient} for the text, exponents are tuples."""
+    # Klucze bez zer na koncu, () dla stalej, zera nie sa usuwane.
+    return _Parser(text, variables).parse()
+
+# EOF
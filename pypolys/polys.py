@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 
+import numbers
 from fractions import Fraction
+from pypolys import dense
+from pypolys import modular
+from pypolys import parser
+from pypolys.domains import common_domain
 
 try:
     rational_types = (int, long, Fraction)
@@ -8,31 +13,198 @@ try:
 except NameError:   # Python 3
     rational_types = (int, Fraction)
 
+try:
+    import numpy
+except ImportError:   # numpy jest opcjonalne
+    numpy = None
+
+# Minimalny udzial niezerowych wspolczynnikow, przy ktorym mnozymy listy.
+DENSITY_THRESHOLD = 0.5
+
+# Do tylu wyrazow compile() generuje kod zrodlowy funkcji.
+COMPILE_SOURCE_LIMIT = 32
+
+# Brak klucza w slowniku (inny niz kazdy wspolczynnik).
+_MISSING = object()
+
+# Od tego stopnia combine() uzywa metody Brenta-Kunga.
+COMBINE_THRESHOLD = 16
+
+
+def _order_value(coefficient):
+    """Return the coefficient as a pair for the order of polys."""
+    # Liczby zespolone leksykograficznie wg (Re, Im), zgodnie z dodawaniem.
+    if isinstance(coefficient, complex):
+        return (coefficient.real, coefficient.imag)
+    return (coefficient, 0)
+
+
+def _monic(data, domain=None):
+    """Return the list of coefficients divided by the last one."""
+    if not data:
+        return data
+    if domain is not None and domain.modulus is not None:
+        return modular.gf_monic(data, domain.modulus)
+    lc = data[-1]
+    if isinstance(lc, rational_types):
+        return [Fraction(item, lc) for item in data]
+    else:   # float, complex
+        return [item / lc for item in data]
+
+
+def _resultant_field(a, b):
+    """Return the resultant of list polys (Euclidean algorithm)."""
+    # res(a, b) = (-1)**(deg(a)*deg(b)) * lc(b)**(deg(a)-deg(r)) * res(b, r)
+    if not a or not b:
+        return 0
+    result = 1
+    while len(b) > 1:
+        r = dense.trim(dense.divmod(a, b)[1])
+        if not r:
+            return 0
+        if (len(a) - 1) * (len(b) - 1) % 2 == 1:
+            result = -result
+        result = result * b[-1] ** (len(a) - len(r))
+        a, b = b, r
+    return result * b[-1] ** (len(a) - 1)
+
+
+def _power_source(name, k):
+    if k == 1:
+        return name
+    else:
+        return "{} ** {}".format(name, k)
+
 
 class Poly(dict):
     """The class defining a poly."""
 
+    # Zapamietane is_zero(), degree() itp., kasowane przy kazdej zmianie.
+    _cache = None
+
+    # Dziedzina wspolczynnikow (pypolys.domains), None - dowolne liczby.
+    domain = None
+
     def __init__(self, coefficient=0, n=0):
         """Load up a poly instance."""
         # Na bazie Sedgewicka - tworzymy wielomian c*(x**n).
         # Wielomiany maja byc unormowane, bez zer przy wspolczynnikach.
         if coefficient != 0:
-            self[n] = coefficient
+            dict.__setitem__(self, n, coefficient)
+
+    @classmethod
+    def _fromdict(cls, data, domain=None):
+        """Create a poly from a dict {exponent: coefficient}."""
+        # Petle obliczeniowe pracuja na zwyklym slowniku,
+        # bo Poly.__setitem__ jest wolniejsze.
+        new_poly = cls()
+        dict.update(new_poly, data)
+        if domain is not None:
+            new_poly.domain = domain
+        return new_poly
+
+    @classmethod
+    def _fromresult(cls, data, domain):
+        """Create a poly from a computed dict, reduced in the domain."""
+        if domain is None:
+            return cls._fromdict(data)
+        return cls._fromdict(domain.normalize(data), domain)
+
+    def todomain(self, domain):
+        """Return the poly with coefficients from the domain."""
+        if domain is None:
+            return Poly._fromdict(self)
+        return Poly._fromdict(domain.normalize(dict((k, domain.convert(item))
+            for (k, item) in self.items())), domain)
+
+    def _coerce(self, other):
+        """Return (self, other, domain), polys from the common domain."""
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        domain = common_domain(self.domain, other.domain)
+        if self.domain != domain:
+            self = self.todomain(domain)
+        if other.domain != domain:
+            other = other.todomain(domain)
+        return self, other, domain
+
+    def _coerce_inplace(self, other):
+        """Return other from the domain of self, self can be converted."""
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        if other.domain != self.domain:
+            domain = common_domain(self.domain, other.domain)
+            if self.domain != domain:
+                converted = self.todomain(domain)
+                dict.clear(self)
+                dict.update(self, converted)
+                self.domain = domain
+                self._cache = None
+            if other.domain != domain:
+                other = other.todomain(domain)
+        elif other is self:
+            other = other.copy()
+        return other
+
+    def _get_cache(self):
+        cache = self._cache
+        if cache is None:
+            cache = self._cache = dict()
+        return cache
+
+    def __setitem__(self, k, coefficient):   # poly[k] = coefficient
+        dict.__setitem__(self, k, coefficient)
+        self._cache = None
+
+    def __delitem__(self, k):   # del poly[k]
+        dict.__delitem__(self, k)
+        self._cache = None
+
+    def update(self, *arguments, **kwargs):
+        dict.update(self, *arguments, **kwargs)
+        self._cache = None
+
+    def setdefault(self, k, coefficient=None):
+        self._cache = None
+        return dict.setdefault(self, k, coefficient)
+
+    def pop(self, *arguments):
+        self._cache = None
+        return dict.pop(self, *arguments)
+
+    def popitem(self):
+        self._cache = None
+        return dict.popitem(self)
+
+    def clear(self):
+        dict.clear(self)
+        self._cache = None
+
+    def __ior__(self, other):   # poly |= dict
+        dict.update(self, other)
+        self._cache = None
+        return self
 
     def is_zero(self):
         """Test if the poly is the zero polynomial."""
-        # Pierwszy sposob dziala tez dla zerowych wspolczynnikow.
-        # To jest szybkie, bo pierwszy niezerowy konczy petle.
-        return all(self[k] == 0 for k in self)
-        # Drugi sposob - gdy zer nie trzymamy.
-        #return not self
+        cache = self._get_cache()
+        if "is_zero" not in cache:
+            # Pierwszy sposob dziala tez dla zerowych wspolczynnikow.
+            # To jest szybkie, bo pierwszy niezerowy konczy petle.
+            cache["is_zero"] = all(self[k] == 0 for k in self)
+            # Drugi sposob - gdy zer nie trzymamy.
+            #cache["is_zero"] = not self
+        return cache["is_zero"]
 
     def degree(self):
         """Return the degree of the poly."""
-        if self.is_zero():
-            return 0
-        else:   # jest zabezpieczenie na zerowe wspolczynniki
-            return max(k for k in self if self[k] != 0)
+        cache = self._get_cache()
+        if "degree" not in cache:
+            if self.is_zero():
+                cache["degree"] = 0
+            else:   # jest zabezpieczenie na zerowe wspolczynniki
+                cache["degree"] = max(k for k in self if self[k] != 0)
+        return cache["degree"]
 
     key_deg = degree
 
@@ -69,13 +241,40 @@ class Poly(dict):
             return " + ".join(L)
 
     @classmethod
-    def fromiterable(cls, data):
+    def fromiterable(cls, data, domain=None):
         """Create a poly from coefficients."""
-        new_poly = cls()
-        for (k, coefficient) in enumerate(data):
-            if coefficient != 0:   # zer nie trzymamy
-                new_poly[k] = coefficient
-        return new_poly
+        if domain is not None:
+            return cls._fromdict(domain.normalize(dict((k, domain.convert(item))
+                for (k, item) in enumerate(data))), domain)
+        return cls._fromdict((k, coefficient)
+            for (k, coefficient) in enumerate(data)
+            if coefficient != 0)   # zer nie trzymamy
+
+    @classmethod
+    def parse(cls, text, variables="x", domain=None):
+        """Create a poly from text like 3*x**2 - 1/2 or repr() output."""
+        # Jeden przebieg po tekscie, liczba/liczba daje Fraction.
+        if isinstance(variables, str):
+            variables = [variables]
+        data = parser.parse(text, variables)
+        if any(len(key) > 1 for key in data):
+            raise ValueError("too many exponents")
+        poly = cls._fromdict(((key[0] if key else 0), coefficient)
+            for (key, coefficient) in data.items() if coefficient != 0)
+        if domain is not None:
+            return poly.todomain(domain)
+        return poly
+
+    def tolist(self):
+        """Return the list of coefficients [c0, c1, ..., cn]."""
+        if not self:
+            return []
+        if min(self) < 0:
+            raise ValueError("negative exponent")
+        data = [0] * (max(self) + 1)
+        for k in self:
+            data[k] = self[k]
+        return data
 
     def __getitem__(self, k):   # poly[k]
         """Return the coefficient."""
@@ -84,81 +283,259 @@ class Poly(dict):
 
     def __add__(self, other):   # poly1 + poly2, poly + number, number + poly
         """Return the sum of polys."""
-        if not isinstance(other, Poly):
-            other = Poly(other)
-        new_poly = Poly()
-        for k in self:
-            new_poly[k] = new_poly.get(k, 0) + self[k]
+        self, other, domain = self._coerce(other)
+        data = dict(self)
         for k in other:
-            new_poly[k] = new_poly.get(k, 0) + other[k]
+            data[k] = data.get(k, 0) + other[k]
         # To moze zwolnic kod.
         #new_poly.cancel()   # moze byc x + (-x) = 0
-        return new_poly
+        return Poly._fromresult(data, domain)
 
     __radd__ = __add__
 
     def __sub__(self, other):       # poly1 - poly2
         """Return the difference of polys."""
-        if not isinstance(other, Poly):
-            other = Poly(other)
-        new_poly = Poly()
-        for k in self:
-            new_poly[k] = new_poly.get(k, 0) + self[k]
+        self, other, domain = self._coerce(other)
+        data = dict(self)
         for k in other:
-            new_poly[k] = new_poly.get(k, 0) - other[k]
+            data[k] = data.get(k, 0) - other[k]
         # To moze zwolnic kod.
         #new_poly.cancel()   # moze byc x - x = 0
-        return new_poly
+        return Poly._fromresult(data, domain)
 
     def __rsub__(self, other):       # poly1 - poly2
         """Return the difference of polys."""
-        if not isinstance(other, Poly):
-            other = Poly(other)
-        new_poly = Poly()
+        self, other, domain = self._coerce(other)
+        data = dict(other)
         for k in self:
-            new_poly[k] = new_poly.get(k, 0) - self[k]
-        for k in other:
-            new_poly[k] = new_poly.get(k, 0) + other[k]
+            data[k] = data.get(k, 0) - self[k]
         # To moze zwolnic kod.
         #new_poly.cancel()
-        return new_poly
+        return Poly._fromresult(data, domain)
+
+    def __iadd__(self, other):   # poly1 += poly2, w miejscu
+        """Add other to the poly in place."""
+        other = self._coerce_inplace(other)
+        modulus = self.domain.modulus if self.domain is not None else None
+        for (k, coefficient) in other.items():
+            value = self.get(k, 0) + coefficient
+            if modulus is not None:
+                value = value % modulus
+            if value == 0:
+                dict.pop(self, k, None)
+            else:
+                dict.__setitem__(self, k, value)
+        self._cache = None
+        return self
+
+    def __isub__(self, other):   # poly1 -= poly2, w miejscu
+        """Subtract other from the poly in place."""
+        other = self._coerce_inplace(other)
+        modulus = self.domain.modulus if self.domain is not None else None
+        for (k, coefficient) in other.items():
+            value = self.get(k, 0) - coefficient
+            if modulus is not None:
+                value = value % modulus
+            if value == 0:
+                dict.pop(self, k, None)
+            else:
+                dict.__setitem__(self, k, value)
+        self._cache = None
+        return self
+
+    def add_mul(self, poly1, poly2, scalar=1):
+        """Add scalar * poly1 * poly2 to the poly in place."""
+        poly1 = self._coerce_inplace(poly1)
+        poly2 = self._coerce_inplace(poly2)
+        if self.domain is not None:
+            scalar = self.domain.convert(scalar)
+        if min(len(poly1), len(poly2)) < dense.KARATSUBA_THRESHOLD:
+            # Iloczyny wyrazow trafiaja od razu do slownika.
+            terms = poly2.items()
+            for (i, coefficient1) in poly1.items():
+                coefficient1 = coefficient1 * scalar
+                for (j, coefficient2) in terms:
+                    k = i + j
+                    dict.__setitem__(self, k,
+                        self.get(k, 0) + coefficient1 * coefficient2)
+        else:
+            for (k, coefficient) in (poly1 * poly2).items():
+                dict.__setitem__(self, k, self.get(k, 0) + scalar * coefficient)
+        if self.domain is not None:
+            data = self.domain.normalize(self)
+            dict.clear(self)
+            dict.update(self, data)
+        self._cache = None
+        return self
+
+    def copy(self):
+        """Return a copy of the poly."""
+        return self._fromdict(self, self.domain)
+
+    def __reduce__(self):
+        """Support pickle (the pypolys.serialize format)."""
+        from pypolys import serialize   # serialize importuje ten modul
+        try:
+            return (serialize.loads, (serialize.dumps(self),))
+        except ValueError:   # wspolczynniki spoza formatu
+            return (_restore, (dict(self), self.domain,
+                isinstance(self, FrozenPoly)))
 
     def __eq__(self, other):   # poly1 == poly2
         """Test if polys are equal."""
-        return (self - other).is_zero()
+        # Bez wielomianu roznicy: porownujemy wyrazy, zera sa dopuszczone.
+        if not isinstance(other, Poly):
+            if not isinstance(other, numbers.Number):   # np. DensePoly
+                return NotImplemented
+            for (k, coefficient) in self.items():
+                if k != 0 and coefficient != 0:
+                    return False
+            return self.get(0, 0) == other
+        if other.domain != self.domain:
+            try:
+                self, other, domain = self._coerce(other)
+            except ValueError:   # np. GF(5) i GF(7)
+                return False
+        missing = 0
+        for (k, coefficient) in self.items():
+            item = other.get(k, _MISSING)
+            if item is _MISSING:
+                if coefficient != 0:
+                    return False
+                missing += 1
+            elif item != coefficient:
+                return False
+        if missing == 0 and len(other) == len(self):
+            return True   # inne klucze nie istnieja
+        return all(coefficient == 0 for (k, coefficient) in other.items()
+            if k not in self)
 
     def __ne__(self, other):   # poly1 != poly2
         """Test if polys are not equal."""
         return not self == other
 
-    def __mul__(self, other):        # poly1 * poly2
-        """Return the product of polys."""
+    def __lt__(self, other):   # poly1 < poly2
+        """Compare polys (the total order of sort_key())."""
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        return self.sort_key() < other.sort_key()
+
+    def __le__(self, other):   # poly1 <= poly2
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        return self.sort_key() <= other.sort_key()
+
+    def __gt__(self, other):   # poly1 > poly2
+        if not isinstance(other, Poly):
+            other = Poly(other)
+        return self.sort_key() > other.sort_key()
+
+    def __ge__(self, other):   # poly1 >= poly2
         if not isinstance(other, Poly):
             other = Poly(other)
-        new_poly = Poly()
+        return self.sort_key() >= other.sort_key()
+
+    def sort_key(self):
+        """Return the key of the total order of polys."""
+        # p < q, gdy wiodacy wyraz q - p ma dodatni wspolczynnik.
+        # Wyrazy wg malejacych wykladnikow, (0, 0, 0) zamyka klucz.
+        cache = self._get_cache()
+        if "sort_key" not in cache:
+            items = []
+            for k in sorted(self, reverse=True):
+                value = _order_value(self[k])
+                if value > (0, 0):
+                    items.append((1, k, value))
+                elif value < (0, 0):
+                    items.append((-1, -k, value))
+            items.append((0, 0, 0))
+            cache["sort_key"] = tuple(items)
+        return cache["sort_key"]
+
+    def _mul1(self, other):        # poly1 * poly2
+        """Return the product of polys."""
+        self, other, domain = self._coerce(other)
+        data = dict()
         for i in self:
             for j in other:
-                new_poly[i+j] = new_poly.get(i+j, 0) + self[i] * other[j]
+                data[i+j] = data.get(i+j, 0) + self[i] * other[j]
         # To moze zwolnic kod.
         #new_poly.cancel()  # (x-2)*(x+2)=x**2-4, znika x**1
-        return new_poly
+        return Poly._fromresult(data, domain)
+
+    def _mul2(self, other):        # poly1 * poly2, dense.mul()
+        """Return the product of polys."""
+        # Gesty wielomian mnozymy jako liste wspolczynnikow,
+        # rzadki klasycznie przez slownik.
+        self, other, domain = self._coerce(other)
+        if min(len(self), len(other)) < min(dense.KARATSUBA_THRESHOLD,
+                                            dense.KRONECKER_THRESHOLD):
+            return self._mul1(other)
+        if min(self) < 0 or min(other) < 0:
+            return self._mul1(other)
+        n1 = max(self) + 1
+        n2 = max(other) + 1
+        if (len(self) < DENSITY_THRESHOLD * n1 or
+            len(other) < DENSITY_THRESHOLD * n2):
+                return self._mul1(other)
+        data = dense.mul(self.tolist(), other.tolist())
+        return Poly._fromresult(dict(enumerate(data)), domain)
+
+    __mul__ = _mul2
 
     __rmul__ = __mul__
 
-    def __pos__(self):
-        """Return +poly."""
+    def __imul__(self, other):        # poly1 *= poly2
+        """Multiply the poly by other in place."""
+        if isinstance(other, Poly):
+            product = self * other
+            dict.clear(self)
+            dict.update(self, product)
+            self.domain = product.domain
+        elif other == 0:
+            dict.clear(self)
+        elif self.domain is not None:
+            other = self.domain.convert(other)
+            data = self.domain.normalize(dict((k, coefficient * other)
+                for (k, coefficient) in self.items()))
+            dict.clear(self)
+            dict.update(self, data)
+        else:   # mnozenie przez liczbe bez nowego slownika
+            for (k, coefficient) in self.items():
+                dict.__setitem__(self, k, coefficient * other)
+        self._cache = None
         return self
 
+    def __pos__(self):
+        """Return +poly (a copy)."""
+        return self.copy()
+
+    def freeze(self):
+        """Return the immutable hashable copy of the poly."""
+        data = dict(self)
+        if self.domain is not None:
+            data = self.domain.normalize(data)
+        else:
+            data = dict((k, item) for (k, item) in data.items() if item != 0)
+        new_poly = FrozenPoly._fromdict(data, self.domain)
+        hash(new_poly)
+        return new_poly
+
     def __neg__(self):
         """Return -poly."""
-        new_poly = Poly()
-        for k in self:
-            new_poly[k] = -self[k]
-        return new_poly
+        return Poly._fromresult(dict((k, -self[k]) for k in self),
+            self.domain)
 
     def _eval1(self, x):   # schemat Hornera
         k = self.degree()
         result = self[k]   # istnieje
+        if self.domain is not None and self.domain.modulus is not None:
+            p = self.domain.modulus
+            x = self.domain.convert(x)
+            while k > 0:
+                k = k - 1
+                result = (result * x + self.get(k, 0)) % p
+            return result
         while k > 0:
             k = k - 1
             result = result * x + self.get(k, 0)
@@ -166,19 +543,207 @@ class Poly(dict):
 
     eval = _eval1
 
+    def eval_many(self, xs):
+        """Return the values of the poly at many points."""
+        # Dla numpy.ndarray schemat Hornera na calych tablicach,
+        # w przeciwnym razie lista wartosci.
+        k = self.degree()
+        data = [self.get(i, 0) for i in range(k+1)]
+        data.reverse()
+        if self.domain is not None and self.domain.modulus is not None:
+            return self._eval_many_modular(data, xs)
+        if numpy is not None and isinstance(xs, numpy.ndarray):
+            if (xs.dtype.kind in "biu" and
+                all(isinstance(item, rational_types) for item in data)):
+                    # wynik ma byc dokladny, bez przepelnienia int64
+                    xs = xs.astype(object)
+            result = numpy.zeros_like(xs) + data[0]
+            for item in data[1:]:
+                result = result * xs + item
+            return result
+        values = []
+        for x in xs:
+            result = 0
+            for item in data:
+                result = result * x + item
+            values.append(result)
+        return values
+
+    def _eval_many_modular(self, data, xs):
+        """Return the values in GF(p) at many points, like eval."""
+        domain = self.domain
+        p = domain.modulus
+        if numpy is not None and isinstance(xs, numpy.ndarray):
+            xs = numpy.array([domain.convert(x)
+                for x in xs.astype(object).flat],
+                dtype=object).reshape(xs.shape)
+            result = numpy.zeros_like(xs) + data[0]
+            for item in data[1:]:
+                result = (result * xs + item) % p
+            return result
+        values = []
+        for x in xs:
+            x = domain.convert(x)
+            result = 0
+            for item in data:
+                result = (result * x + item) % p
+            values.append(result)
+        return values
+
+    def multi_eval(self, points):
+        """Return the list of values of the poly at points."""
+        # Dla GF(p) drzewo podiloczynow, inaczej schemat Hornera
+        # (wspolczynniki drzewa nad Q rosna zbyt szybko).
+        data = self.tolist()
+        if self.domain is not None and self.domain.modulus is not None:
+            return modular.gf_multi_eval(data, points, self.domain.modulus)
+        return [dense.horner(data, x) for x in points]
+
+    @classmethod
+    def interpolate(cls, points, values, domain=None):
+        """Return the poly of the lowest degree with given values."""
+        points = list(points)
+        values = list(values)
+        if domain is not None and domain.modulus is not None:
+            return cls.fromiterable(modular.gf_interpolate(
+                [domain.convert(x) for x in points],
+                [domain.convert(y) for y in values], domain.modulus), domain)
+        if len(points) != len(values):
+            raise ValueError("different numbers of points and values")
+        if len(set(points)) != len(points):
+            raise ValueError("points are not distinct")
+        # Wielomian interpolacyjny lezy w ciele ulamkow (ZZ -> QQ).
+        return cls.fromiterable(dense.interpolate_newton(points, values),
+            domain if domain is None else domain.field)
+
+    def compile(self):
+        """Return a fast callable computing the value of the poly."""
+        # Tabela Hornera (wykladnik, wspolczynnik) wg malejacych wykladnikow.
+        table = sorted(((k, self[k]) for k in self if self[k] != 0),
+            reverse=True)
+        if not table:
+            return lambda x: 0
+        if self.domain is not None and self.domain.modulus is not None:
+            return self._compile_modular(table)
+        if len(table) <= COMPILE_SOURCE_LIMIT:
+            namespace = dict()
+            source = "c0"
+            namespace["c0"] = table[0][1]
+            for i in range(1, len(table)):
+                gap = table[i-1][0] - table[i][0]
+                source = "({}) * {} + c{}".format(
+                    source, _power_source("x", gap), i)
+                namespace["c{}".format(i)] = table[i][1]
+            if table[-1][0] != 0:
+                source = "({}) * {}".format(
+                    source, _power_source("x", table[-1][0]))
+            exec("def _compiled(x):\n    return " + source, namespace)
+            return namespace["_compiled"]
+        first = table[0][1]
+        steps = [(table[i-1][0] - table[i][0], table[i][1])
+            for i in range(1, len(table))]
+        last = table[-1][0]
+
+        def _compiled(x):
+            result = first
+            for (gap, coefficient) in steps:
+                if gap == 1:
+                    result = result * x + coefficient
+                else:
+                    result = result * x ** gap + coefficient
+            if last:
+                result = result * x ** last
+            return result
+
+        return _compiled
+
+    def _compile_modular(self, table):
+        """Return the callable computing the poly in GF(p), like eval."""
+        # Redukcja modulo p po kazdym kroku, jak w _eval1().
+        domain = self.domain
+        p = domain.modulus
+        first = table[0][1]
+        steps = [(table[i-1][0] - table[i][0], table[i][1])
+            for i in range(1, len(table))]
+        last = table[-1][0]
+
+        def _compiled(x):
+            x = domain.convert(x)
+            result = first
+            for (gap, coefficient) in steps:
+                result = (result * pow(x, gap, p) + coefficient) % p
+            if last:
+                result = result * pow(x, last, p) % p
+            return result
+
+        return _compiled
+
     def _combine1(self, other):  # zlozenie funkcji/wielomianow
         """Return the composition of two polys."""
         if not isinstance(other, Poly):
             other = Poly(other)
         k = self.degree()         # tez schemat Hornera
-        new_poly = Poly(self[k])
+        new_poly = Poly._fromdict({0: self[k]}, self.domain)
         while k > 0:
             k = k - 1
-            new_poly = new_poly * other + Poly(self.get(k, 0))
+            new_poly *= other
+            new_poly += self.get(k, 0)
         #new_poly.cancel()   # niepotrzebne, bo jest w + i *
         return new_poly
 
-    combine = _combine1
+    def _combine2(self, other):  # zlozenie wielomianow, Brent-Kung
+        """Return the composition of two polys."""
+        # Kroki male: other**i dla i < m, kroki duze: Horner w other**m,
+        # m = sqrt(n), razem O(sqrt(n)) pelnych mnozen zamiast n.
+        self, other, domain = self._coerce(other)
+        n = self.degree()
+        if other.degree() <= 1 and not other.is_zero():
+            # p(b*x + a) = q(b*x), gdzie q(x) = p(x + a).
+            b = other[1] if 1 in other else 0
+            if b == 0:
+                return Poly._fromresult({0: self.eval(other[0])}, domain)
+            new_poly = self.shift(other.get(0, 0))
+            if b != 1:
+                new_poly = Poly._fromresult(dict((k, item * b ** k)
+                    for (k, item) in new_poly.items()), domain)
+            return new_poly
+        if n < COMBINE_THRESHOLD:
+            return self._combine1(other)
+        m = 1
+        while m * m < n + 1:
+            m = m + 1
+        powers = [Poly._fromresult({0: 1}, domain), other]
+        while len(powers) < m + 1:
+            powers.append(powers[-1] * other)
+        giant = powers.pop()
+        new_poly = Poly._fromdict({}, domain)
+        for j in range(n - n % m, -1, -m):
+            data = dict()
+            for (i, power) in enumerate(powers):
+                coefficient = self.get(j + i, 0)
+                if coefficient == 0:
+                    continue
+                for (k, item) in power.items():
+                    data[k] = data.get(k, 0) + coefficient * item
+            block = Poly._fromresult(data, domain)
+            if new_poly:
+                block += new_poly * giant
+            new_poly = block
+        new_poly.cancel()
+        return new_poly
+
+    combine = _combine2
+
+    def shift(self, a):
+        """Return the poly p(x + a) (the Taylor shift)."""
+        data = dense.trim(self.tolist())
+        domain = self.domain
+        if domain is not None and domain.modulus is not None:
+            return Poly.fromiterable(modular.gf_taylor_shift(data,
+                domain.convert(a), domain.modulus), domain)
+        if domain is not None:
+            a = domain.convert(a)
+        return Poly.fromiterable(dense.taylor_shift(data, a), domain)
 
     def _power1(self, n):   # poly1 ** n
         new_poly = Poly(1)
@@ -195,9 +760,9 @@ class Poly(dict):
         if n < 0:
             raise ValueError("negative power")
         elif n == 0:
-            return Poly(1)
+            return Poly._fromresult({0: 1}, self.domain)
         elif n == 1:
-            return self
+            return self.copy()
         elif n == 2:
             return self * self
         else:
@@ -220,24 +785,29 @@ class Poly(dict):
     def diff(self):   # rozniczkowanie
         """Return the derivative of the poly."""
         # [c*x**n]' = c*n*x**(n-1)
-        new_poly = Poly()
+        data = dict()
         for k in self:
             if k > 0:
-                new_poly[k-1] = k * self[k]
-        # Normowanie nie jest potrzebne.
-        return new_poly
+                data[k-1] = k * self[k]
+        # Normowanie jest potrzebne tylko w GF(p).
+        return Poly._fromresult(data, self.domain)
 
     def integrate(self):   # calkowanie
         """Return the integral of the poly."""
         # integrate(c*x**n, x) = c*x**(n+1)/(n+1) + const
-        new_poly = Poly()
+        data = dict()
+        if self.domain is not None:   # bez sprawdzania typow
+            field = self.domain.field
+            for k in self:
+                data[k+1] = field.div(self[k], k+1)
+            return Poly._fromresult(data, field)
         for k in self:
             if isinstance(self[k], rational_types):
-                new_poly[k+1] = self[k] * Fraction(1, k+1)
+                data[k+1] = self[k] * Fraction(1, k+1)
             else:
-                new_poly[k+1] = self[k] / (k+1.0)
+                data[k+1] = self[k] / (k+1.0)
         # Normowanie nie jest potrzebne.
-        return new_poly
+        return Poly._fromdict(data)
 
     def __div__(self, other):        # poly / number, monomial / monomial
         """Dividing polys."""
@@ -254,6 +824,10 @@ class Poly(dict):
                 raise ValueError("other is greater than self")
             coefficient1 = self[k1]
             coefficient2 = other[k2]
+            domain = self.domain or other.domain
+            if domain is not None:
+                coefficient = domain.field.div(coefficient1, coefficient2)
+                return Poly._fromdict({k1 - k2: coefficient}, domain.field)
             if (isinstance(coefficient1, rational_types) and
                 isinstance(coefficient2, rational_types)):   # AND
                     # Python 2.7: Fraction(Fraction, Fraction)
@@ -261,6 +835,14 @@ class Poly(dict):
             else:   # float, complex
                 coefficient = coefficient1 / coefficient2
             return Poly(coefficient, k1 - k2)
+        elif self.domain is not None:
+            field = self.domain.field
+            if field.modulus is not None:   # mnozymy przez odwrotnosc
+                inverse = field.inverse(field.convert(other))
+                return Poly._fromresult(dict((k, item * inverse)
+                    for (k, item) in self.items()), field)
+            return Poly._fromresult(dict((k, field.div(item, other))
+                for (k, item) in self.items()), field)
         # Python 2.7: Fraction(Fraction, Fraction)
         elif isinstance(other, rational_types):
             return self * Poly(Fraction(1, other))
@@ -269,17 +851,112 @@ class Poly(dict):
 
     __truediv__ = __div__
 
+    def __divmod__(self, other):   # divmod(poly1, poly2)
+        """Return the quotient and the remainder of polys."""
+        # Dzielenie z reszta, wynik dokladny dla int i Fraction.
+        self, other, domain = self._coerce(other)
+        if other.is_zero():
+            raise ZeroDivisionError("division by zero poly")
+        divisor = other.tolist()[:other.degree() + 1]
+        if domain is not None and domain.modulus is not None:
+            quotient, remainder = modular.gf_divmod(
+                dense.trim(self.tolist()), divisor, domain.modulus)
+        else:
+            quotient, remainder = dense.divmod(self.tolist(), divisor)
+        if domain is not None:
+            domain = domain.field
+        return (Poly.fromiterable(quotient, domain),
+            Poly.fromiterable(remainder, domain))
+
+    def __floordiv__(self, other):   # poly1 // poly2
+        """Return the quotient of polys."""
+        return divmod(self, other)[0]
+
+    def __mod__(self, other):   # poly1 % poly2
+        """Return the remainder of polys."""
+        return divmod(self, other)[1]
+
+    def gcd(self, other):
+        """Return the greatest common divisor of polys (monic)."""
+        self, other, domain = self._coerce(other)
+        a = dense.trim(self.tolist())
+        b = dense.trim(other.tolist())
+        if domain is not None:
+            domain = domain.field
+        if domain is not None and domain.modulus is not None:
+            return Poly.fromiterable(
+                modular.gf_gcd(a, b, domain.modulus), domain)
+        if dense.is_rational_list(a) and dense.is_rational_list(b):
+            # Mnozenie przez stala nie zmienia NWD, liczymy nad Z.
+            g = modular.gcd_integer(dense.to_integers(a)[0],
+                                    dense.to_integers(b)[0])
+        else:   # float, complex, algorytm Euklidesa
+            while b:
+                a, b = b, dense.trim(dense.divmod(a, b)[1])
+            g = a
+        return Poly.fromiterable(_monic(g), domain)
+
+    def xgcd(self, other):
+        """Return (g, s, t), where g = s * self + t * other is monic gcd."""
+        self, other, domain = self._coerce(other)
+        if domain is not None:
+            domain = domain.field
+        r0 = dense.trim(self.tolist())
+        r1 = dense.trim(other.tolist())
+        s0, s1 = [1], []
+        t0, t1 = [], [1]
+        if domain is not None and domain.modulus is not None:
+            p = domain.modulus
+            while r1:   # rozszerzony algorytm Euklidesa w GF(p)
+                q, r = modular.gf_divmod(r0, r1, p)
+                r0, r1 = r1, r
+                s0, s1 = s1, modular.gf_sub(s0, modular.gf_mul(q, s1, p), p)
+                t0, t1 = t1, modular.gf_sub(t0, modular.gf_mul(q, t1, p), p)
+        else:
+            while r1:   # rozszerzony algorytm Euklidesa
+                q, r = dense.divmod(r0, r1)
+                r0, r1 = r1, dense.trim(r)
+                s0, s1 = s1, dense.trim(dense._sub(s0, dense.mul(q, s1)))
+                t0, t1 = t1, dense.trim(dense._sub(t0, dense.mul(q, t1)))
+        if not r0:
+            zero = Poly._fromdict({}, domain)
+            return zero, zero.copy(), zero.copy()
+        lc = r0[-1]
+        return (Poly.fromiterable(_monic(r0, domain), domain),
+                Poly.fromiterable(s0, domain) / lc,
+                Poly.fromiterable(t0, domain) / lc)
+
+    def resultant(self, other):
+        """Return the resultant of polys."""
+        self, other, domain = self._coerce(other)
+        a = dense.trim(self.tolist())
+        b = dense.trim(other.tolist())
+        if domain is not None and domain.modulus is not None:
+            return modular.gf_resultant(a, b, domain.modulus)
+        if dense.is_rational_list(a) and dense.is_rational_list(b):
+            a, d1 = dense.to_integers(a)
+            b, d2 = dense.to_integers(b)
+            result = modular.resultant_integer(a, b)
+            d = d1 ** max(len(b) - 1, 0) * d2 ** max(len(a) - 1, 0)
+            return result if d == 1 else Fraction(result, d)
+        return _resultant_field(a, b)
+
     def lcm(self, other):
-        """Return the least common multiple of two monomials."""
-        if not isinstance(other, Poly):
-            other = Poly(other)
+        """Return the least common multiple of polys (monic)."""
+        self, other, domain = self._coerce(other)
         self.cancel()
         other.cancel()
-        if len(self) != 1 or len(other) != 1:
-            raise ValueError("only monomials have lcm")
-        k1 = list(self)[0]
-        k2 = list(other)[0]
-        return Poly(1, max(k1, k2))
+        if domain is not None:
+            domain = domain.field
+        if len(self) == 1 and len(other) == 1:   # jednomiany
+            k1 = list(self)[0]
+            k2 = list(other)[0]
+            return Poly._fromdict({max(k1, k2): 1}, domain)
+        if self.is_zero() or other.is_zero():
+            return Poly._fromdict({}, domain)
+        product = (self * other) // self.gcd(other)
+        return Poly.fromiterable(
+            _monic(dense.trim(product.tolist()), domain), domain)
 
     def __call__(self, x):
         if isinstance(x, Poly):
@@ -317,4 +994,69 @@ class Poly(dict):
         for k in self:
             yield Poly(self[k], k)
 
+
+def _frozen(*arguments, **kwargs):
+    raise TypeError("frozen poly is immutable")
+
+
+class FrozenPoly(Poly):
+    """The immutable hashable poly, zero terms are removed."""
+
+    # Hash liczony raz, freeze() liczy go od razu.
+    _hash = None
+
+    __setitem__ = __delitem__ = update = _frozen
+    clear = pop = popitem = setdefault = __ior__ = _frozen
+    add_mul = _frozen
+
+    def __iadd__(self, other):   # p += q daje nowy wielomian
+        return NotImplemented
+
+    __isub__ = __imul__ = __iadd__
+
+    def cancel(self):   # zer nie ma
+        pass
+
+    def __hash__(self):
+        if self._hash is None:
+            # Stala ma hash liczby, bo Poly(5).freeze() == 5.
+            if not self:
+                self._hash = hash(0)
+            elif len(self) == 1 and dict.__contains__(self, 0):
+                self._hash = hash(dict.__getitem__(self, 0))
+            else:
+                self._hash = hash(frozenset(self.items()))
+        return self._hash
+
+    def __eq__(self, other):   # poly1 == poly2
+        """Test if polys are equal."""
+        # Bez zer przy wspolczynnikach wystarczy porownac slowniki.
+        if isinstance(other, FrozenPoly):
+            if hash(self) != hash(other):
+                return False
+            return dict.__eq__(self, other)
+        return Poly.__eq__(self, other)
+
+    def __ne__(self, other):   # poly1 != poly2
+        """Test if polys are not equal."""
+        return not self == other
+
+    def __pos__(self):
+        """Return +poly."""
+        return self
+
+    def freeze(self):
+        """Return the frozen poly (self)."""
+        return self
+
+    def thaw(self):
+        """Return a mutable copy of the poly."""
+        return Poly._fromdict(dict(self), self.domain)
+
+
+def _restore(data, domain, frozen):
+    """Recreate the poly (pickle)."""
+    poly = Poly._fromdict(data, domain=domain)
+    return poly.freeze() if frozen else poly
+
 # EOF
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+# Liczniki operacji na wielomianach, wlaczane na zadanie:
+#
+# with pypolys.profile() as stats:
+#     ...
+# print(stats.report())
+#
+# Metody klas sa podmieniane tylko wewnatrz bloku with, poza nim
+# dzialaja oryginalne metody, wiec wylaczone liczniki nic nie kosztuja.
+# Klasy spoza pypolys (np. Fraction) nie sa zmieniane.
+
+import threading
+import time
+from fractions import Fraction
+
+# Mierzone metody (jezeli klasa je definiuje), czasy sa wlacznie
+# z wywolaniami zagniezdzonymi.
+OPERATIONS = ("__init__", "__add__", "__radd__", "__sub__", "__rsub__",
+    "__mul__", "__rmul__", "__iadd__", "__isub__", "__imul__", "add_mul",
+    "__pow__", "__div__", "__truediv__", "__divmod__", "combine", "eval",
+    "eval_many", "diff", "integrate", "cancel", "__repr__", "gcd", "reduce",
+    "_fromdict")
+
+# Metody mnozace wyrazy: liczymy pary wyrazow.
+_PRODUCTS = ("__mul__", "__rmul__", "__imul__")
+
+_lock = threading.RLock()
+_active = []   # aktywne obiekty Stats
+_saved = []   # (klasa, nazwa, oryginalny atrybut)
+
+
+class Stats(object):
+    """Counters of poly operations."""
+
+    def __init__(self):
+        self.calls = dict()   # operacja -> liczba wywolan
+        self.time = dict()   # operacja -> czas w sekundach
+        self.pairs = dict()   # operacja -> mnozenia par wyrazow
+        self.fractions = 0   # wspolczynniki Fraction nowych wielomianow
+
+    @property
+    def allocations(self):
+        """Return the number of created polys."""
+        return sum(count for (name, count) in self.calls.items()
+            if name.endswith(".__init__"))
+
+    def _add(self, name, elapsed, pairs, fractions):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        self.time[name] = self.time.get(name, 0.0) + elapsed
+        if pairs:
+            self.pairs[name] = self.pairs.get(name, 0) + pairs
+        self.fractions += fractions
+
+    def as_dict(self):
+        """Return the counters as a dict (JSON serializable)."""
+        return {"calls": dict(self.calls), "time": dict(self.time),
+            "pairs": dict(self.pairs), "fractions": self.fractions,
+            "allocations": self.allocations}
+
+    def report(self):
+        """Return the table of counters sorted by time."""
+        lines = ["{:<40} {:>10} {:>12} {:>12}".format(
+            "operation", "calls", "time [s]", "pairs")]
+        for name in sorted(self.calls, key=lambda name: -self.time[name]):
+            lines.append("{:<40} {:>10} {:>12.6f} {:>12}".format(name,
+                self.calls[name], self.time[name], self.pairs.get(name, 0)))
+        lines.append("allocations {}, fractions {}".format(
+            self.allocations, self.fractions))
+        return "\n".join(lines)
+
+
+def _count_pairs(name, arguments):
+    if name in _PRODUCTS:
+        self, other = arguments[:2]
+        return len(self) * (len(other) if isinstance(other, dict) else 1)
+    if name == "add_mul":
+        poly1, poly2 = arguments[1:3]
+        return ((len(poly1) if isinstance(poly1, dict) else 1) *
+            (len(poly2) if isinstance(poly2, dict) else 1))
+    return 0
+
+
+def _count_fractions(name, arguments, result):
+    # Wspolczynniki Fraction nowych wielomianow, _fromdict buduje
+    # wyniki petli obliczeniowych.
+    if name == "__init__":
+        poly = arguments[0]
+    elif name == "_fromdict" and result is not None:
+        poly = result
+    else:
+        return 0
+    return sum(1 for coefficient in dict.values(poly)
+        if isinstance(coefficient, Fraction))
+
+
+def _wrap(function, label, name):
+    def wrapper(*arguments, **kwargs):
+        start = time.perf_counter()
+        result = None
+        try:
+            result = function(*arguments, **kwargs)
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            pairs = _count_pairs(name, arguments)
+            fractions = _count_fractions(name, arguments, result)
+            with _lock:
+                for stats in _active:
+                    stats._add(label, elapsed, pairs, fractions)
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    return wrapper
+
+
+def _classes():
+    from pypolys import polys
+    from pypolys import mpolys
+    return [(polys.Poly, "polys.Poly"), (mpolys.Poly, "mpolys.Poly")]
+
+
+def _patch():
+    for (cls, prefix) in _classes():
+        for name in OPERATIONS:
+            if name not in cls.__dict__:
+                continue
+            original = cls.__dict__[name]
+            _saved.append((cls, name, original))
+            label = "{}.{}".format(prefix, name)
+            if isinstance(original, classmethod):
+                setattr(cls, name,
+                    classmethod(_wrap(original.__func__, label, name)))
+            else:
+                setattr(cls, name, _wrap(original, label, name))
+
+
+def _unpatch():
+    while _saved:
+        (cls, name, original) = _saved.pop()
+        setattr(cls, name, original)
+
+
+class profile(object):
+    """The context manager collecting Stats of poly operations."""
+
+    def __init__(self):
+        self.stats = Stats()
+
+    def __enter__(self):
+        with _lock:
+            if not _active:
+                _patch()
+            _active.append(self.stats)
+        return self.stats
+
+    def __exit__(self, *exc_info):
+        with _lock:
+            _active.remove(self.stats)
+            if not _active:
+                _unpatch()
+        return False
+
+# EOF
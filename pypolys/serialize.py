@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+
+# Binarny format wielomianow (polys.Poly i mpolys.Poly):
+#
+# naglowek: b"PYP", wersja, flagi (1 - mpolys, 2 - FrozenPoly), dziedzina
+# wyrazy: znacznik wspolczynnika, wykladnik(i), wartosc
+# koniec: znacznik END
+#
+# Wykladniki to varint (7 bitow na bajt), jednomian mpolys to dlugosc
+# klucza i kolejne wykladniki. Zapis i odczyt ida wyraz po wyrazie.
+
+import io
+import numbers
+import struct
+from fractions import Fraction
+from pypolys import polys
+from pypolys import mpolys
+from pypolys.domains import FiniteField, GF, QQ, RR, ZZ
+
+MAGIC = b"PYP"
+VERSION = 1
+
+MPOLY = 1
+FROZEN = 2
+
+# Znaczniki wspolczynnikow.
+END = 0
+INT = 1   # zigzag varint
+BIGINT = 2   # dlugosc varint i bajty (little endian, ze znakiem)
+FRACTION = 3   # licznik i mianownik jak INT lub BIGINT
+FLOAT = 4
+COMPLEX = 5
+
+# Znaczniki dziedzin, GF(p) ma jeszcze varint p.
+_DOMAINS = [None, ZZ, QQ, RR]
+_GF = 4
+
+# Wielkosc bufora zapisu i odczytu.
+BUFFER_SIZE = 1 << 16
+
+_float = struct.Struct("<d")
+_complex = struct.Struct("<dd")
+
+
+def _write_varint(out, n):
+    """Append the varint of n >= 0 to the bytearray."""
+    while n >= 0x80:
+        out.append((n & 0x7f) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _write_integer(out, a):
+    if a.bit_length() <= 63:
+        out.append(INT)
+        _write_varint(out, (a << 1) if a >= 0 else (((-a) << 1) - 1))
+    else:   # bez petli po 7 bitach dla duzych liczb
+        out.append(BIGINT)
+        data = a.to_bytes(a.bit_length() // 8 + 1, "little", signed=True)
+        _write_varint(out, len(data))
+        out.extend(data)
+
+
+def _write_coefficient(out, a):
+    if isinstance(a, bool):
+        a = int(a)
+    if isinstance(a, int):
+        _write_integer(out, a)
+    elif isinstance(a, Fraction):
+        out.append(FRACTION)
+        _write_integer(out, a.numerator)
+        _write_integer(out, a.denominator)
+    elif isinstance(a, float):
+        out.append(FLOAT)
+        out.extend(_float.pack(a))
+    elif isinstance(a, complex):
+        out.append(COMPLEX)
+        out.extend(_complex.pack(a.real, a.imag))
+    elif isinstance(a, numbers.Integral):   # np. numpy.int64
+        _write_integer(out, int(a))
+    elif isinstance(a, numbers.Rational):
+        _write_coefficient(out, Fraction(a.numerator, a.denominator))
+    else:
+        raise ValueError("unsupported coefficient {!r}".format(a))
+
+
+def _write_domain(out, domain):
+    if isinstance(domain, FiniteField):
+        out.append(_GF)
+        _write_varint(out, domain.modulus)
+    else:
+        out.append(_DOMAINS.index(domain))
+
+
+def dump(poly, stream):
+    """Write the poly to the binary stream."""
+    # Zerowe wspolczynniki sa pomijane.
+    is_mpoly = isinstance(poly, mpolys.Poly)
+    flags = MPOLY if is_mpoly else 0
+    if isinstance(poly, (polys.FrozenPoly, mpolys.FrozenPoly)):
+        flags |= FROZEN
+    out = bytearray(MAGIC)
+    out.append(VERSION)
+    out.append(flags)
+    _write_domain(out, poly.domain)
+    for (k, a) in poly.items():
+        if a == 0:
+            continue
+        _write_coefficient(out, a)
+        if is_mpoly:
+            _write_varint(out, len(k))
+            for item in k:
+                _write_varint(out, item)
+        elif k >= 0:
+            _write_varint(out, k)
+        else:
+            raise ValueError("negative exponent")
+        if len(out) >= BUFFER_SIZE:
+            stream.write(bytes(out))
+            del out[:]
+    out.append(END)
+    stream.write(bytes(out))
+
+
+def dumps(poly):
+    """Return the poly as bytes."""
+    stream = io.BytesIO()
+    dump(poly, stream)
+    return stream.getvalue()
+
+
+class _Reader(object):
+    """The buffered reader of the binary stream."""
+
+    # Strumien nie moze stracic bajtow za znacznikiem END:
+    # z peek() (BufferedReader, takze potoki i gniazda) bajty sa
+    # zuzywane dopiero po przetworzeniu, strumien z seek() jest cofany
+    # w finish(), pozostale strumienie czytamy dokladnie tyle, ile trzeba.
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = b""
+        self.position = 0
+        self.peeked = False   # bufor z peek(), jeszcze w strumieniu
+        if hasattr(stream, "peek"):
+            self.mode = "peek"
+        elif getattr(stream, "seekable", lambda: False)():
+            self.mode = "seek"
+        else:
+            self.mode = "exact"
+
+    def _fill(self, n):
+        # Zapewnia n bajtow w buforze od pozycji position.
+        if self.mode == "peek":
+            # Bufor jest przetworzony do konca albo pochodzi z peek().
+            if self.peeked:
+                self.stream.read(self.position)
+            chunk = self.stream.peek(n)
+            self.peeked = len(chunk) >= n
+            if not self.peeked:   # wiecej niz bufor strumienia
+                chunk = self.stream.read(n)
+                if len(chunk) < n:
+                    raise ValueError("truncated data")
+            self.buffer = chunk
+            self.position = 0
+            return
+        chunks = [self.buffer[self.position:]]
+        size = len(chunks[0])
+        while size < n:
+            if self.mode == "seek":
+                chunk = self.stream.read(max(BUFFER_SIZE, n - size))
+            else:
+                chunk = self.stream.read(n - size)
+            if not chunk:
+                raise ValueError("truncated data")
+            chunks.append(chunk)
+            size += len(chunk)
+        self.buffer = b"".join(chunks)
+        self.position = 0
+
+    def finish(self):
+        """Leave the stream just after the processed bytes."""
+        if self.mode == "peek" and self.peeked:
+            self.stream.read(self.position)
+        elif self.mode == "seek":
+            extra = len(self.buffer) - self.position
+            if extra:
+                self.stream.seek(-extra, io.SEEK_CUR)
+        self.buffer = b""
+        self.position = 0
+        self.peeked = False
+
+    def read(self, n):
+        if self.position + n > len(self.buffer):
+            self._fill(n)
+        start = self.position
+        self.position = start + n
+        return self.buffer[start:self.position]
+
+    def byte(self):
+        if self.position >= len(self.buffer):
+            self._fill(1)
+        value = self.buffer[self.position]
+        self.position += 1
+        return value
+
+    def varint(self):
+        result = 0
+        shift = 0
+        while True:
+            value = self.byte()
+            result |= (value & 0x7f) << shift
+            if value < 0x80:
+                return result
+            shift += 7
+
+
+def _read_integer(reader, tag):
+    if tag == INT:
+        n = reader.varint()
+        return -((n + 1) >> 1) if n & 1 else n >> 1
+    elif tag == BIGINT:
+        return int.from_bytes(reader.read(reader.varint()), "little",
+            signed=True)
+    raise ValueError("integer expected")
+
+
+def _read_coefficient(reader, tag):
+    if tag == INT or tag == BIGINT:
+        return _read_integer(reader, tag)
+    elif tag == FRACTION:
+        numerator = _read_integer(reader, reader.byte())
+        denominator = _read_integer(reader, reader.byte())
+        return Fraction(numerator, denominator)
+    elif tag == FLOAT:
+        return _float.unpack(reader.read(8))[0]
+    elif tag == COMPLEX:
+        return complex(*_complex.unpack(reader.read(16)))
+    raise ValueError("unknown coefficient tag {}".format(tag))
+
+
+def _read_header(reader):
+    """Return (flags, domain)."""
+    if reader.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a pypolys stream")
+    if reader.byte() != VERSION:
+        raise ValueError("unsupported version")
+    flags = reader.byte()
+    return flags, _read_domain(reader)
+
+
+def _read_domain(reader):
+    tag = reader.byte()
+    if tag == _GF:
+        return GF(reader.varint())
+    elif tag < len(_DOMAINS):
+        return _DOMAINS[tag]
+    raise ValueError("unknown domain tag {}".format(tag))
+
+
+def load(stream):
+    """Read the poly from the binary stream."""
+    # Wyrazy trafiaja wprost do wielomianu, bez slownika posredniego.
+    # Czyta tylko do znacznika END, strumien moze zawierac kolejne dane.
+    reader = _Reader(stream)
+    flags, domain = _read_header(reader)
+    module = mpolys if flags & MPOLY else polys
+    cls = module.FrozenPoly if flags & FROZEN else module.Poly
+    poly = cls()
+    if domain is not None:
+        poly.domain = domain
+    is_mpoly = flags & MPOLY
+    while True:
+        tag = reader.byte()
+        if tag == END:
+            break
+        a = _read_coefficient(reader, tag)
+        if is_mpoly:
+            k = tuple(reader.varint() for i in range(reader.varint()))
+        else:
+            k = reader.varint()
+        dict.__setitem__(poly, k, a)
+    reader.finish()
+    return poly
+
+
+def loads(data):
+    """Return the poly from bytes."""
+    return load(io.BytesIO(data))
+
+# EOF
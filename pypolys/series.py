@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+# Szeregi sum c_k * p_k(x) dla rodzin wielomianow ortogonalnych
+# z pypolys.factory (Hermite, Czebyszew, Legendre), bez rozwijania
+# p_k w bazie jednomianow.
+
+from fractions import Fraction
+from pypolys import dense
+from pypolys.factory import FAMILIES
+from pypolys.polys import Poly
+
+try:
+    import numpy
+except ImportError:   # numpy jest opcjonalne
+    numpy = None
+
+
+class OrthogonalSeries(object):
+    """The series sum c_k * p_k(x) for an orthogonal family."""
+
+    def __init__(self, coefficients=(), family="chebyshev"):
+        """Load up a series instance."""
+        if family not in FAMILIES:
+            raise ValueError("unknown family")
+        self.family = family
+        self.coefficients = dense.trim(list(coefficients))
+
+    def __repr__(self):
+        return "OrthogonalSeries({!r}, {!r})".format(
+            self.coefficients, self.family)
+
+    def degree(self):
+        """Return the degree of the series."""
+        return max(len(self.coefficients) - 1, 0)
+
+    def tolist(self):
+        """Return the list of coefficients [c0, c1, ..., cn]."""
+        return list(self.coefficients)
+
+    def __eq__(self, other):
+        """Test if series are equal."""
+        if not isinstance(other, OrthogonalSeries):
+            other = OrthogonalSeries([other], self.family)
+        return (self.family == other.family and
+            self.coefficients == other.coefficients)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None   # obiekt zmienny
+
+    def _coerce(self, other):
+        if not isinstance(other, OrthogonalSeries):
+            other = OrthogonalSeries([other], self.family)
+        if other.family != self.family:
+            raise ValueError("different families")
+        return other
+
+    def __add__(self, other):
+        """Return the sum of series."""
+        other = self._coerce(other)
+        return OrthogonalSeries(dense._add(self.coefficients,
+            other.coefficients), self.family)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """Return the difference of series."""
+        other = self._coerce(other)
+        return OrthogonalSeries(dense._sub(self.coefficients,
+            other.coefficients), self.family)
+
+    def __neg__(self):
+        return OrthogonalSeries([-item for item in self.coefficients],
+            self.family)
+
+    def __mul__(self, other):   # tylko przez liczbe
+        """Return the series times a number."""
+        return OrthogonalSeries([item * other
+            for item in self.coefficients], self.family)
+
+    __rmul__ = __mul__
+
+    def _clenshaw(self, x, zero):
+        """Return the value of the series at x (Clenshaw)."""
+        # Z oznaczeniami z FAMILIES (beta_k to b_k z rekurencji):
+        # s_k = c_k + a_{k+1} * x * s_{k+1} + beta_{k+2} * s_{k+2},
+        # wynik = c_0 + c * x * s_1 + beta_2 * s_2.
+        first, recurrence = FAMILIES[self.family]
+        data = self.coefficients
+        n = len(data) - 1
+        if n < 0:
+            return zero
+        if n == 0:
+            return zero + data[0]
+        s1 = zero + data[n]   # s_{k+1}
+        s2 = zero   # s_{k+2}
+        for k in range(n - 1, 0, -1):
+            a = recurrence(k + 1)[0]
+            beta = recurrence(k + 2)[1]
+            s1, s2 = x * s1 * a + s2 * beta + data[k], s1
+        return x * s1 * first + s2 * recurrence(2)[1] + data[0]
+
+    def eval(self, x):
+        """Return the value of the series at x."""
+        return self._clenshaw(x, 0)
+
+    __call__ = eval
+
+    def eval_many(self, xs):
+        """Return the values of the series at many points."""
+        # Dla numpy.ndarray rekurencja Clenshawa na calych tablicach,
+        # w przeciwnym razie lista wartosci.
+        if numpy is not None and isinstance(xs, numpy.ndarray):
+            if (xs.dtype.kind in "biu" and all(isinstance(item,
+                (int, Fraction)) for item in self.coefficients)):
+                    # wynik ma byc dokladny, bez przepelnienia int64
+                    xs = xs.astype(object)
+            return self._clenshaw(xs, numpy.zeros_like(xs))
+        return [self._clenshaw(x, 0) for x in xs]
+
+    def topoly(self, poly_class=Poly):
+        """Return the poly in the monomial basis (exact)."""
+        # Clenshaw z x = Poly(1, 1), bez zapamietywania p_k.
+        return self._clenshaw(poly_class(1, 1), poly_class())
+
+    @classmethod
+    def frompoly(cls, poly, family="chebyshev"):
+        """Return the series equal to the poly (exact)."""
+        # Schemat Hornera w bazie p_k, mnozenie przez x:
+        # x * p_k = (p_{k+1} - b_{k+1} * p_{k-1}) / a_{k+1}, x * p_0 = p_1 / c.
+        if family not in FAMILIES:
+            raise ValueError("unknown family")
+        first, recurrence = FAMILIES[family]
+        data = dense.trim(poly.tolist())
+        result = []
+        for item in reversed(data):
+            new = [0] * (len(result) + 1)
+            for (k, c) in enumerate(result):
+                if c == 0:
+                    continue
+                if k == 0:
+                    new[1] += c * dense._inverse(first)
+                    continue
+                a, b = recurrence(k + 1)
+                inverse = dense._inverse(a)
+                new[k+1] += c * inverse
+                new[k-1] -= c * b * inverse
+            new[0] += item
+            result = new
+        # Wspolczynniki calkowite bez ulamkow Fraction(n, 1).
+        return cls([item.numerator if isinstance(item, Fraction) and
+            item.denominator == 1 else item for item in result], family)
+
+# EOF
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import unittest
+import contextlib
+import io
+import json
+import os
+import tempfile
+from fractions import Fraction
+from pypolys import bench
+from pypolys import polys
+from pypolys import mpolys
+
+
+class TestBench(unittest.TestCase):
+
+    def test_random_poly(self):
+        p = bench.random_poly(10, 1.0, "int")
+        self.assertIsInstance(p, polys.Poly)
+        self.assertEqual(p.degree(), 10)
+        self.assertEqual(len(p), 11)
+        self.assertEqual(p, bench.random_poly(10, 1.0, "int"))   # seed
+        p = bench.random_poly(10, 1.0, "Fraction")
+        self.assertTrue(all(isinstance(p[k], Fraction) for k in p))
+        p = bench.random_poly(3, 0.5, "complex", nvars=2)
+        self.assertIsInstance(p, mpolys.Poly)
+        self.assertRaises(ValueError, bench.random_poly, 3, 1.0, "str")
+
+    def test_run(self):
+        results = bench.run("factory.geometric/pypolys.polys", quick=True,
+            repeat=1, min_time=0.0)
+        self.assertEqual(list(results), ["factory.geometric/pypolys.polys/n=25"])
+        self.assertTrue(results["factory.geometric/pypolys.polys/n=25"] > 0)
+
+    def test_compare(self):
+        report = bench.compare({"a": 2.0, "b": 1.0, "c": 0.5, "d": 1.0},
+            {"a": 1.0, "b": 1.1, "c": 1.0})
+        self.assertEqual(sorted(report), ["a", "b", "c"])
+        self.assertEqual(report["a"]["status"], "slower")
+        self.assertEqual(report["b"]["status"], "same")
+        self.assertEqual(report["c"]["status"], "faster")
+        self.assertEqual(report["c"]["ratio"], 0.5)
+
+    def test_main(self):
+        handle, name = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        try:
+            arguments = ["--quick", "--filter", "polys.diff/int/deg=25/",
+                "--repeat", "1", "--min-time", "0", "--output", name]
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                self.assertEqual(bench.main(arguments), 0)
+            with open(name) as infile:
+                document = json.load(infile)
+            self.assertEqual(list(document["results"]),
+                ["polys.diff/int/deg=25/density=1.0"])
+            self.assertEqual(json.loads(output.getvalue()), document)
+        finally:
+            os.remove(name)
+
+    def tearDown(self): pass
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
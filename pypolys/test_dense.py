@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import unittest
+import random
+from fractions import Fraction
+from pypolys import dense
+
+
+class TestDense(unittest.TestCase):
+
+    def setUp(self):
+        self.old_thresholds = (dense.KARATSUBA_THRESHOLD,
+            dense.TOOM3_THRESHOLD, dense.NEWTON_DIVISION_THRESHOLD)
+        # Male progi, zeby rekurencja byla glebsza.
+        dense.KARATSUBA_THRESHOLD = 4
+        dense.TOOM3_THRESHOLD = 8
+
+    def random_list(self, n, coefficients=range(-9, 10)):
+        return [random.choice(coefficients) for i in range(n)]
+
+    def test_mul_school(self):
+        self.assertEqual(dense.mul_school([], [1, 2]), [])
+        self.assertEqual(dense.mul_school([1, 1], [1, 1]), [1, 2, 1])
+        self.assertEqual(dense.mul_school([2], [1, 0, 3]), [2, 0, 6])
+
+    def test_mul_int(self):
+        for n, m in [(1, 1), (5, 5), (17, 40), (40, 17), (63, 64), (100, 9)]:
+            a = self.random_list(n)
+            b = self.random_list(m)
+            result = dense.mul_school(a, b)
+            self.assertEqual(dense.mul_karatsuba(a, b), result)
+            self.assertEqual(dense.mul_toom3(a, b), result)
+            self.assertEqual(dense.mul(a, b), result)
+
+    def test_mul_fraction(self):
+        coefficients = [Fraction(i, j) for i in range(-3, 4) for j in (1, 2, 3)]
+        a = self.random_list(50, coefficients)
+        b = self.random_list(45, coefficients)
+        result = dense.mul_school(a, b)
+        self.assertEqual(dense.mul_toom3(a, b), result)
+
+    def test_mul_kronecker(self):
+        self.assertEqual(dense.mul_kronecker([1, 1], [1, -1]), [1, 0, -1])
+        self.assertEqual(dense.mul_kronecker([-3], [-5]), [15])
+        self.assertEqual(dense.mul_kronecker([10**30, -1], [0, 0]), [0, 0, 0])
+        for n, m in [(1, 1), (5, 5), (17, 40), (100, 9)]:
+            a = [random.randint(-10**20, 10**20) for i in range(n)]
+            b = [random.randint(-9, 9) for i in range(m)]
+            self.assertEqual(dense.mul_kronecker(a, b), dense.mul_school(a, b))
+            b = [random.randint(0, 10**30) for i in range(m)]
+            self.assertEqual(dense.mul_kronecker(a, b), dense.mul_school(a, b))
+
+    def test_mul_rational(self):
+        a = [Fraction(random.randint(-99, 99), random.randint(1, 99))
+            for i in range(30)]
+        b = [random.randint(-9, 9) for i in range(20)]
+        self.assertEqual(dense.mul_rational(a, b), dense.mul_school(a, b))
+        self.assertEqual(dense.mul_rational(a, a), dense.mul_school(a, a))
+
+    def test_divmod(self):
+        dense.NEWTON_DIVISION_THRESHOLD = 4
+        self.assertEqual(dense.divmod([-1, 0, 1], [1, 1]), ([-1, 1], [0]))
+        self.assertEqual(dense.divmod([1, 2], [0, 0, 1]), ([], [1, 2]))
+        self.assertRaises(ValueError, dense.divmod, [1, 2], [1, 0])
+        for n, m in [(10, 3), (40, 20), (41, 2), (60, 60)]:
+            a = self.random_list(n)
+            b = self.random_list(m - 1) + [random.randint(1, 9)]
+            q1, r1 = dense.divmod_school(a, b)
+            q2, r2 = dense.divmod_newton(a, b)
+            self.assertEqual((q1, r1), (q2, r2))
+            self.assertEqual(dense.trim(dense._add(dense.mul(b, q1), r1)),
+                dense.trim(list(a)))
+
+    def test_taylor_shift(self):
+        self.assertEqual(dense.taylor_shift([1, 2, 3], 1), [6, 8, 3])
+        a = self.random_list(20)
+        self.assertEqual(dense.taylor_shift(dense.taylor_shift(a, 3), -3), a)
+
+    def test_interpolate_newton(self):
+        self.assertEqual(dense.horner([1, 2, 3], 2), 17)
+        self.assertEqual(dense.interpolate_newton([], []), [])
+        self.assertEqual(dense.interpolate_newton([5], [7]), [7])
+        a = self.random_list(12) + [3]
+        points = [Fraction(i, 2) for i in range(-6, 7)]
+        values = [dense.horner(a, x) for x in points]
+        self.assertEqual(dense.interpolate_newton(points, values), a)
+        self.assertIsInstance(dense.interpolate_newton([0, 1], [1, 3])[1], int)
+
+    def test_inverse_series(self):
+        a = [1, -1]   # 1/(1-x) = 1 + x + x**2 + ...
+        self.assertEqual(dense.inverse_series(a, 6), [1] * 6)
+        a = self.random_list(20)
+        a[0] = 3
+        g = dense.inverse_series(a, 20)
+        self.assertEqual(dense.mul(a, g)[:20], [1] + [0] * 19)
+
+    def test_mul_float(self):
+        a = [random.random() for i in range(50)]
+        b = [random.random() for i in range(50)]
+        result = dense.mul_school(a, b)
+        for (x, y) in zip(dense.mul_toom3(a, b), result):
+            self.assertAlmostEqual(x, y)
+
+    def tearDown(self):
+        (dense.KARATSUBA_THRESHOLD, dense.TOOM3_THRESHOLD,
+            dense.NEWTON_DIVISION_THRESHOLD) = self.old_thresholds
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import unittest
+import os
+import random
+import shutil
+import tempfile
+from fractions import Fraction
+from pypolys.mpolys import Poly
+from pypolys.domains import GF
+from pypolys import diskpoly
+from pypolys.diskpoly import DiskPoly
+
+
+def random_poly(n, nvars, seed):
+    rng = random.Random(seed)
+    poly = Poly()
+    for i in range(n):
+        key = [rng.randint(0, 5) for j in range(nvars)]
+        poly += Poly(rng.randint(-9, 9), *key)
+    return poly
+
+
+class TestDiskPoly(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.p = random_poly(40, 3, seed=1)
+        self.q = random_poly(30, 2, seed=2) + Poly(Fraction(1, 3), 1, 1)
+        self.opened = []
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def store(self, poly, name):
+        result = DiskPoly.frompoly(poly, self.path(name))
+        self.opened.append(result)
+        return result
+
+    def test_frompoly(self):
+        a = self.store(self.p, "a")
+        self.assertEqual(len(a), len(self.p.freeze()))
+        self.assertEqual(a.nvars, 3)
+        self.assertEqual(a.topoly(), self.p)
+        keys = list(a)
+        padded = [key + (0,) * (3 - len(key)) for key in keys]
+        self.assertEqual(padded, sorted(padded))
+        self.assertEqual(dict(a.iterterms()), dict(self.p.freeze()))
+        self.assertEqual(self.store(Poly(), "zero").topoly(), Poly())
+
+    def test_lookup(self):
+        a = self.store(self.p, "a")
+        for key in self.p:
+            self.assertEqual(a[key], self.p[key])
+        self.assertEqual(a[(9, 9, 9)], 0)
+        self.assertEqual(a[(0, 0, 0, 7)], 0)
+        self.assertNotIn((9,), a)
+        b = self.store(Poly(5, 2) + Poly(3), "b")
+        self.assertEqual(b[2], 5)
+        self.assertEqual(b[(0, 0)], 3)
+
+    def test_add(self):
+        a = self.store(self.p, "a")
+        b = self.store(self.q, "b")
+        s = a.add(b, self.path("s"))
+        self.opened.append(s)
+        self.assertEqual(s.topoly(), self.p + self.q)
+        t = a.add(-self.p, self.path("t"))
+        self.opened.append(t)
+        self.assertEqual(len(t), 0)
+
+    def test_mul(self):
+        a = self.store(self.p, "a")
+        b = self.store(self.q, "b")
+        block, fanin = diskpoly.MERGE_BLOCK, diskpoly.MERGE_FANIN
+        try:
+            for (diskpoly.MERGE_BLOCK, diskpoly.MERGE_FANIN) in [(1024, 64),
+                    (4, 3), (1, 2)]:
+                m = a.mul(b, self.path("m"))
+                self.opened.append(m)
+                self.assertEqual(m.topoly(), self.p * self.q)
+                m = a.mul(self.q, self.path("n"))
+                self.opened.append(m)
+                self.assertEqual(m.topoly(), self.p * self.q)
+        finally:
+            diskpoly.MERGE_BLOCK, diskpoly.MERGE_FANIN = block, fanin
+        # Pliki tymczasowe sa usuwane.
+        self.assertEqual(sorted(os.listdir(self.directory)),
+            ["a", "b", "m", "n"])
+
+    def test_same_path(self):
+        # Wynik w pliku argumentu, ktory jest jeszcze mapowany.
+        a = self.store(self.p, "a")
+        s = a.add(a, a.path)
+        self.opened.append(s)
+        self.assertEqual(s.topoly(), self.p * 2)
+        self.assertEqual(a.topoly(), self.p)
+        m = s.mul(self.q, s.path)
+        self.opened.append(m)
+        self.assertEqual(m.topoly(), self.p * self.q * 2)
+        self.assertEqual(os.listdir(self.directory), ["a"])
+
+    def test_domain(self):
+        a = self.store(self.p.todomain(GF(7)), "a")
+        self.assertEqual(a.domain, GF(7))
+        m = a.mul(self.q.todomain(GF(7)), self.path("m"))
+        self.opened.append(m)
+        self.assertEqual(m.topoly(), (self.p * self.q).todomain(GF(7)))
+        self.assertEqual(m.topoly().domain, GF(7))
+        self.assertRaises(ValueError, a.add, self.q.todomain(GF(5)),
+            self.path("s"))
+
+    def test_errors(self):
+        with open(self.path("bad"), "wb") as outfile:
+            outfile.write(b"not a term file, not at all")
+        self.assertRaises(ValueError, DiskPoly, self.path("bad"))
+        self.assertRaises(ValueError, self.store, Poly(1, -1), "c")
+        self.assertEqual(os.listdir(self.directory), ["bad"])
+
+    def tearDown(self):
+        for poly in self.opened:
+            poly.close()
+        shutil.rmtree(self.directory)
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+import unittest
+from fractions import Fraction
+from pypolys.domains import GF, QQ, RR, ZZ
+from pypolys.polys import Poly
+from pypolys.mpolys import Poly as MPoly
+from pypolys import modular
+
+
+class TestDomains(unittest.TestCase):
+
+    def setUp(self):
+        self.F = GF(7)
+
+    def test_domains(self):
+        self.assertTrue(GF(7) is self.F)
+        self.assertEqual(repr(self.F), "GF(7)")
+        self.assertRaises(ValueError, GF, 6)
+        self.assertEqual(self.F.convert(-1), 6)
+        self.assertEqual(self.F.convert(Fraction(1, 2)), 4)
+        self.assertEqual(self.F.div(1, 3), 5)
+        self.assertRaises(ZeroDivisionError, self.F.inverse, 14)
+        self.assertEqual(ZZ.convert(Fraction(4, 2)), 2)
+        self.assertRaises(ValueError, ZZ.convert, 0.5)
+        self.assertEqual(ZZ.field, QQ)
+        self.assertEqual(QQ.div(Fraction(2, 3), 4), Fraction(1, 6))
+        self.assertEqual(RR.convert(1), 1.0)
+
+    def test_gf_arithmetic(self):
+        F = self.F
+        p = Poly.fromiterable([1, 2, 3], F)   # 3*x**2 + 2*x + 1
+        q = Poly.fromiterable([6, 5], F)
+        self.assertEqual(p.domain, F)
+        self.assertEqual(p + q, Poly.fromiterable([0, 0, 3], F))
+        self.assertEqual((p + q).domain, F)
+        self.assertEqual(p - p, Poly())
+        self.assertEqual(-q, Poly.fromiterable([1, 2]))
+        self.assertEqual(p * q, Poly.fromiterable([6, 3, 0, 1]))
+        self.assertEqual((p * 7).tolist(), [])
+        self.assertEqual(p(2), (1 + 4 + 12) % 7)
+        self.assertEqual(p ** 7, Poly.fromiterable([1, 0, 0, 0, 0, 0, 0, 2,
+            0, 0, 0, 0, 0, 0, 3], F))   # Frobenius
+        self.assertEqual(p.diff(), Poly.fromiterable([2, 6]))
+        self.assertEqual(Poly(3, 2).todomain(F).integrate(),
+            Poly(1, 3).todomain(F))
+        self.assertEqual((p / 3).tolist(), [5, 3, 1])
+        # Liczby i wielomiany bez dziedziny sa przeliczane.
+        self.assertEqual((p + 6).domain, F)
+        self.assertEqual((Poly(6) + p).domain, F)
+        self.assertEqual(Poly(5) - p, Poly.fromiterable([4, 5, 4]))
+        self.assertRaises(ValueError, lambda: p + p.todomain(GF(5)))
+
+    def test_gf_inplace(self):
+        F = self.F
+        p = Poly.fromiterable([1, 2, 3], F)
+        p += Poly.fromiterable([6, 5])
+        self.assertEqual(p.tolist(), [0, 0, 3])
+        p *= 5
+        self.assertEqual(p.tolist(), [0, 0, 1])
+        p.add_mul(Poly(1, 1), Poly(1, 1), 6)
+        self.assertTrue(p.is_zero())
+        q = Poly.fromiterable([1, 1])
+        q += q.todomain(F)
+        self.assertEqual(q.domain, F)
+        self.assertEqual(q.copy().domain, F)
+
+    def test_gf_division(self):
+        F = self.F
+        p = Poly.fromiterable([1, 2, 3, 4, 5], F)
+        q = Poly.fromiterable([3, 0, 2], F)
+        quotient, remainder = divmod(p, q)
+        self.assertEqual(quotient * q + remainder, p)
+        self.assertTrue(remainder.degree() < q.degree())
+        g = (p * q).gcd(q * Poly.fromiterable([1, 1], F))
+        self.assertEqual(g, q * 4)   # unormowany, 2 * 4 = 1
+        g, s, t = p.xgcd(q)
+        self.assertEqual(s * p + t * q, g)
+        self.assertEqual(p.resultant(q),
+            Poly.fromiterable([1, 2, 3, 4, 5]).resultant(
+            Poly.fromiterable([3, 0, 2])) % 7)
+
+    def test_integers(self):
+        p = Poly.fromiterable([1, 2, 3], ZZ)
+        self.assertEqual((p / 2).domain, QQ)
+        self.assertEqual((p / 2)[0], Fraction(1, 2))
+        self.assertEqual(p.integrate()[3], 1)
+        self.assertEqual(p.integrate().domain, QQ)
+        self.assertRaises(ValueError, Poly.fromiterable, [0.5], ZZ)
+
+    def test_integer_results(self):
+        # Wyniki z QQ lacza sie z wielomianami z ZZ.
+        a = Poly.fromiterable([1, 2, 3], ZZ)
+        b = Poly.fromiterable([1, 2], ZZ)
+        q, r = divmod(a, b)
+        self.assertEqual(q.domain, QQ)
+        self.assertEqual(q * b + r, a)
+        self.assertEqual((q * b + r).domain, QQ)
+        self.assertEqual(a.integrate().diff(), a)
+        self.assertEqual(a, a.todomain(QQ))
+        self.assertEqual(a.todomain(QQ), a)
+        c = a.copy()
+        c += Poly(Fraction(1, 2), 1).todomain(QQ)
+        self.assertEqual(c.domain, QQ)
+        self.assertEqual(c[1], Fraction(5, 2))
+        self.assertNotEqual(a, a.todomain(GF(5)))
+        self.assertNotEqual(a.todomain(GF(7)), a.todomain(GF(5)))
+        self.assertRaises(ValueError, lambda: a + a.todomain(GF(5)))
+        x = MPoly(1, 1).todomain(ZZ)
+        y = MPoly(1, 0, 1).todomain(ZZ)
+        f = 3 * x * x * y + 5 * y + 1
+        g = 2 * x * y + 3
+        quotients, remainder = f.reduce([g])
+        self.assertEqual(quotients[0] * g + remainder, f)
+        self.assertEqual(f.reduce([g.todomain(QQ)])[1], remainder)
+        self.assertEqual(f, f.todomain(QQ))
+        self.assertNotEqual(f, f.todomain(GF(5)))
+
+    def test_mpolys(self):
+        F = self.F
+        x = MPoly(1, 1).todomain(F)
+        y = MPoly(1, 0, 1)
+        p = x * x + 3 * y   # 3 * y bez dziedziny
+        self.assertEqual(p.domain, F)
+        self.assertEqual(p - p, MPoly())
+        self.assertEqual((p * 7).domain, F)
+        self.assertTrue((p * 7).is_zero())
+        self.assertEqual((-p)[(2,)], 6)
+        self.assertEqual(p ** 7, (x ** 14 + 3 * y ** 7))
+        self.assertEqual((p * (x + y))[(2, 1)], 1)
+        self.assertEqual(p._mul2(x + y), p * (x + y))
+        self.assertEqual((p / 3)[(0, 1)], 1)
+        self.assertEqual(x.integrate(1)[(1, 1)], 1)
+        self.assertEqual(p.diff(0)[(1,)], 2)
+        p += MPoly(6, 2)
+        self.assertEqual(p, 3 * y)
+        p.add_mul(y, y, 1)
+        self.assertEqual(p[(0, 2)], 1)
+        self.assertRaises(ValueError, lambda: x + x.todomain(GF(5)))
+
+    def test_mpolys_division(self):
+        F = self.F
+        result = MPoly(3, 2).todomain(F) / MPoly(2, 1).todomain(F)
+        self.assertEqual(dict(result), {(1,): 5})
+        self.assertEqual(result.domain, F)
+        self.assertEqual((MPoly(3, 2).todomain(ZZ) / MPoly(2, 1)).domain, QQ)
+        x = MPoly(1, 1).todomain(F)
+        y = MPoly(1, 0, 1).todomain(F)
+        f = 3 * x * x * y + 5 * y + 1
+        g = 2 * x * y + 3
+        quotients, remainder = f.reduce([g])
+        self.assertEqual(quotients[0] * g + remainder, f)
+        self.assertEqual(dict(quotients[0]), {(1,): 5})
+        self.assertEqual(quotients[0].domain, F)
+        self.assertEqual(remainder.domain, F)
+        self.assertRaises(ValueError, f.reduce, [MPoly(1, 1).todomain(GF(5))])
+
+    def test_compiled_eval(self):
+        p = (Poly(3, 2) + Poly(5, 4)).todomain(self.F)
+        self.assertEqual(p.eval(3), 5)
+        self.assertEqual(p.compile()(3), 5)
+        self.assertEqual(p.eval_many([3, Fraction(1, 2)]),
+            [5, p.eval(Fraction(1, 2))])
+        m = (MPoly(3, 2) + MPoly(5, 4) + MPoly(1, 1, 1)).todomain(self.F)
+        self.assertEqual(m.compile()(3, 2), 4)
+        self.assertEqual(m.eval_many([(3, 2), (0, 8)]), [4, 0])
+
+    def test_modular(self):
+        p = 7
+        a = [1, 2, 3, 4, 5, 6, 1, 2, 3]
+        b = [3, 0, 2, 1]
+        quotient, remainder = modular.gf_divmod_newton(a, b, p)
+        self.assertEqual(modular.gf_divmod(a, b, p), (quotient, remainder))
+        self.assertEqual(modular.gf_resultant([6, -8, 2], [5, -1, 2], p),
+            modular.resultant_integer([6, -8, 2], [5, -1, 2]) % p)
+
+    def tearDown(self): pass
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+import unittest
+import random
+from fractions import Fraction
+from pypolys.dpolys import DensePoly
+from pypolys.polys import Poly
+from pypolys.factory import PolyFactory
+
+
+class TestDensePoly(unittest.TestCase):
+
+    def setUp(self):
+        self.x0 = DensePoly(1)
+        self.x1 = DensePoly(1, 1)
+        self.x2 = DensePoly(1, 2)
+        self.x3 = DensePoly(1, 3)
+
+    def test_repr(self):
+        self.assertEqual(repr(DensePoly()), "DensePoly()")
+        self.assertEqual(repr(DensePoly(0, 2)), "DensePoly()")
+        self.assertEqual(repr(DensePoly(2, 0)), "DensePoly(2)")
+        self.assertEqual(repr(self.x1 + self.x2),
+            "DensePoly(1, 1) + DensePoly(1, 2)")
+        self.assertEqual(repr(DensePoly(Fraction(3, 1), 2)), "DensePoly(3, 2)")
+        self.assertEqual(repr(DensePoly(Fraction(3, 5), 2)),
+            "DensePoly(Fraction(3, 5), 2)")
+
+    def test_convert(self):
+        p = Poly(4) + Poly(2, 3)
+        self.assertEqual(DensePoly.frompoly(p).tolist(), [4, 0, 0, 2])
+        self.assertEqual(DensePoly.frompoly(p).topoly(), p)
+        self.assertEqual(DensePoly.fromiterable([0, 1, 0, 0]), self.x1)
+        self.assertEqual(DensePoly.frompoly(Poly()), DensePoly())
+
+    def test_degree_len(self):
+        self.assertEqual(DensePoly().degree(), 0)
+        self.assertEqual(self.x3.degree(), 3)
+        self.assertEqual(len(DensePoly()), 0)
+        self.assertEqual(len(self.x1 + self.x3), 2)
+        self.assertEqual(list(self.x1 + self.x3), [1, 3])
+        self.assertTrue(DensePoly().is_zero())
+        self.assertFalse(self.x1.is_zero())
+
+    def test_inplace(self):
+        p = self.x1 + 1
+        q = p
+        q += self.x2
+        self.assertTrue(q is p)
+        self.assertEqual(p, self.x2 + self.x1 + 1)
+        p -= self.x2
+        self.assertEqual(p.tolist(), [1, 1])
+        p *= self.x1 - 1
+        self.assertEqual(p, self.x2 - 1)
+        p *= 2
+        self.assertEqual(p.tolist(), [-2, 0, 2])
+        p.add_mul(self.x1, self.x1, -2)
+        self.assertEqual(p.tolist(), [-2])
+        p -= p
+        self.assertTrue(p.is_zero())
+        self.assertEqual(p.tolist(), [])
+        q = self.x3.copy()
+        q += 1
+        self.assertEqual(self.x3, DensePoly(1, 3))
+        q = +self.x3
+        self.assertIsNot(q, self.x3)
+        q += 1
+        self.assertEqual(self.x3, DensePoly(1, 3))
+
+    def test_getitem_setitem(self):
+        p = DensePoly()
+        p[3] = 5
+        self.assertEqual(p, DensePoly(5, 3))
+        self.assertEqual(p[3], 5)
+        self.assertEqual(p[10], 0)
+        p[3] = 0
+        self.assertEqual(p.degree(), 0)
+
+    def test_add_sub(self):
+        self.assertEqual(self.x2 + self.x2, DensePoly(2, 2))
+        self.assertEqual(self.x1 - self.x1, DensePoly())
+        self.assertEqual(self.x2 + 3, self.x2 + DensePoly(3))
+        self.assertEqual(3 + self.x2, self.x2 + DensePoly(3))
+        self.assertEqual(self.x2 - 3, self.x2 - DensePoly(3))
+        self.assertEqual(3 - self.x2, DensePoly(3) - self.x2)
+        self.assertEqual(self.x2 + Poly(1, 1), self.x1 + self.x2)
+
+    def test_mul_pow(self):
+        self.assertEqual(self.x1 * self.x2, self.x3)
+        self.assertEqual(3 * self.x2, DensePoly(3, 2))
+        p = self.x1 + 1
+        self.assertEqual(p ** 5, p*p*p*p*p)
+        self.assertEqual(p ** 0, self.x0)
+        self.assertRaises(ValueError, lambda: p ** -1)
+        q = Poly.fromiterable(random.randint(-9, 9) for i in range(200))
+        self.assertEqual((DensePoly.frompoly(q) ** 2).topoly(), q._mul1(q))
+
+    def test_eval_combine(self):
+        self.assertEqual(self.x3.eval(3), 27)
+        self.assertEqual(self.x2(2), 4)
+        self.assertEqual(self.x2(self.x3), DensePoly(1, 6))
+        self.assertEqual(self.x2.combine(self.x1 + 3),
+            self.x2 + DensePoly(6, 1) + DensePoly(9))
+
+    def test_diff_integrate(self):
+        self.assertEqual(self.x0.diff(), DensePoly())
+        self.assertEqual(self.x3.diff(), DensePoly(3, 2))
+        self.assertEqual(self.x1.integrate(), DensePoly(Fraction(1, 2), 2))
+        self.assertEqual(DensePoly(1.5, 1).integrate(), DensePoly(0.75, 2))
+
+    def test_div_lcm(self):
+        self.assertEqual(self.x2 / 2, DensePoly(Fraction(1, 2), 2))
+        self.assertEqual(self.x2 / 2.0, DensePoly(0.5, 2))
+        self.assertEqual(DensePoly(6, 5) / DensePoly(3, 2), DensePoly(2, 3))
+        self.assertRaises(ValueError, lambda: self.x1 / self.x2)
+        self.assertEqual(self.x2.lcm(self.x3), self.x3)
+
+    def test_eq_poly(self):
+        p = DensePoly(1, 1) + DensePoly(2)
+        q = Poly(1, 1) + Poly(2)
+        self.assertTrue(p == q)
+        self.assertTrue(q == p)
+        self.assertFalse(q != p)
+        self.assertFalse(Poly(1, 1) == DensePoly(2, 1))
+        self.assertTrue(Poly(1, 1) != DensePoly(2, 1))
+        self.assertFalse(Poly(1, 1) == "x")
+
+    def test_leading_term(self):
+        p = pow(3 * self.x1 + 1, 2)
+        self.assertEqual(p.leading_term(key=DensePoly.key_lex), 9 * self.x2)
+        self.assertEqual(p.leading_monomial(key=DensePoly.key_lex), self.x2)
+        self.assertEqual(p.leading_coefficient(key=DensePoly.key_lex), 9)
+        self.assertRaises(ValueError, DensePoly().leading_term)
+        self.assertEqual(len(list(p.iterterms())), 3)
+
+    def test_factory(self):
+        factory1 = PolyFactory(DensePoly)
+        factory2 = PolyFactory(Poly)
+        for name in ["natural", "geometric", "hermite", "chebyshev", "legendre"]:
+            p1 = getattr(factory1, name)(n=8)
+            p2 = getattr(factory2, name)(n=8)
+            self.assertEqual(p1.topoly(), p2)
+
+    def tearDown(self): pass
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
@@ -2,6 +2,7 @@
 
 import unittest
 import math
+import threading
 from fractions import Fraction
 from pypolys.polys import Poly
 #from pypolys.mpolys import Poly
@@ -85,6 +86,44 @@ class TestPolyFactory(unittest.TestCase):
         self.assertEqual(p5, Poly(Fraction(15, 8), 1) 
             + Poly(Fraction(-35, 4), 3) + Poly(Fraction(63, 8), 5))
 
+    def test_cache(self):
+        factory = PolyFactory(Poly, cache_size=2)
+        p = factory.chebyshev(n=self.N)
+        p[0] = 100   # kopia, pamiec sie nie zmienia
+        self.assertEqual(factory.chebyshev(n=self.N)[0], -1)
+        factory.chebyshev(n=self.N+1)
+        factory.legendre(n=3)
+        factory.hermite(n=3)
+        self.assertEqual(len(factory._cache), 2)
+        self.assertEqual(factory.chebyshev(n=self.N+2),
+            PolyFactory(Poly).chebyshev(n=self.N+2))
+        factory.clear_cache()
+        self.assertEqual(len(factory._cache), 0)
+        self.assertRaises(ValueError, factory.hermite, -1)
+
+    def test_large(self):
+        # Bez rekurencji, wiec bez limitu glebokosci stosu.
+        p = self.poly_factory.chebyshev(n=1200)
+        self.assertEqual(p.degree(), 1200)
+        self.assertEqual(p[1200], 2 ** 1199)
+        self.assertEqual(p.eval(1), 1)
+
+    def test_threads(self):
+        factory = PolyFactory(Poly, cache_size=4)
+        results = dict()
+        def worker(i):
+            results[i] = factory.legendre(n=20 + i % 5)
+        threads = [threading.Thread(target=worker, args=(i,))
+            for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for i in range(10):
+            self.assertEqual(results[i],
+                self.poly_factory.legendre(n=20 + i % 5))
+            self.assertEqual(results[i].eval(1), 1)
+
     def tearDown(self): pass
 
 if __name__ == "__main__":
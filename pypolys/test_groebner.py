@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import unittest
+from fractions import Fraction
+from pypolys.mpolys import Poly
+from pypolys.groebner import groebner
+
+
+class TestGroebner(unittest.TestCase):
+
+    def setUp(self):
+        self.x = Poly(1, 1)
+        self.y = Poly(1, 0, 1)
+        self.z = Poly(1, 0, 0, 1)
+        x, y, z = self.x, self.y, self.z
+        self.cyclic3 = [x + y + z, x * y + y * z + z * x, x * y * z - 1]
+
+    def assertGroebner(self, basis, polys, key=Poly.key_deglex):
+        # Wielomiany z ideału redukuja sie do zera.
+        for poly in polys:
+            self.assertTrue(poly.reduce(basis, key=key)[1].is_zero())
+        for f in basis:
+            for g in basis:
+                m = f.leading_monomial(key=key).lcm(
+                    g.leading_monomial(key=key))
+                s = ((m / f.leading_term(key=key)) * f -
+                     (m / g.leading_term(key=key)) * g)
+                self.assertTrue(s.reduce(basis, key=key)[1].is_zero())
+
+    def test_simple(self):
+        x, y = self.x, self.y
+        basis = groebner([x ** 2 + y ** 2 - 1, x - y], key=Poly.key_lex)
+        self.assertEqual(basis, [x - y, y ** 2 - Fraction(1, 2)])
+        basis = groebner([x ** 2 - y, x ** 3 - x])
+        self.assertEqual(basis, [x ** 2 - y, x * y - x, y ** 2 - y])
+
+    def test_special(self):
+        x, y = self.x, self.y
+        self.assertEqual(groebner([]), [])
+        self.assertEqual(groebner([Poly(), x - x]), [])
+        self.assertEqual(groebner([x + 1, x - 1]), [Poly(1)])
+        self.assertEqual(groebner([2 * x * y, Poly()]), [x * y])
+        self.assertRaises(ValueError, groebner, [x], method="f5")
+
+    def test_cyclic(self):
+        for key in [Poly.key_lex, Poly.key_deglex]:
+            for method in ["buchberger", "f4"]:
+                basis = groebner(self.cyclic3, key=key, method=method)
+                self.assertGroebner(basis, self.cyclic3, key=key)
+                self.assertEqual(basis, groebner(self.cyclic3, key=key))
+
+    def test_random(self):
+        x, y, z = self.x, self.y, self.z
+        polys = [x * y - z ** 2 + 3, y ** 2 * z - 2 * x + 1, x * z ** 2 - y]
+        for method in ["buchberger", "f4"]:
+            basis = groebner(polys, method=method)
+            self.assertGroebner(basis, polys)
+            self.assertEqual(basis, groebner(polys))
+
+    def test_modulus(self):
+        x, y, z = self.x, self.y, self.z
+        p = 32003
+        basis = groebner(self.cyclic3, modulus=p)
+        self.assertEqual(basis[0], z ** 3 + (p - 1))
+        polys = [x * y - z ** 2 + 3, y ** 2 * z - 2 * x + 1, x * z ** 2 - y]
+        basis1 = groebner(polys, modulus=p)
+        basis2 = groebner(polys, modulus=p, method="f4")
+        self.assertEqual(basis1, basis2)
+        for poly in basis1:
+            for coefficient in poly.values():
+                self.assertTrue(0 <= coefficient < p)
+        # Nad Q baza jest inna, w GF(2) x + 1 = x - 1.
+        self.assertEqual(groebner([x + 1, x - 1], modulus=2), [x + 1])
+
+    def tearDown(self): pass
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
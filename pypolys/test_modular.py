@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import unittest
+import random
+from pypolys import dense
+from pypolys import modular
+
+
+class TestModular(unittest.TestCase):
+
+    def setUp(self):
+        self.p = 1000003
+        self.old_thresholds = (modular.HGCD_THRESHOLD,
+            modular.MODULAR_GCD_THRESHOLD, modular.SUBPRODUCT_THRESHOLD,
+            modular.TAYLOR_SHIFT_THRESHOLD)
+
+    def random_list(self, n, p=19):
+        return [random.randint(-p, p) for i in range(n)] + [random.randint(1, p)]
+
+    def euclid(self, a, b, p):
+        a = modular.gf_reduce(a, p)
+        b = modular.gf_reduce(b, p)
+        while b:
+            a, b = b, modular.gf_divmod(a, b, p)[1]
+        return modular.gf_monic(a, p)
+
+    def test_primes(self):
+        self.assertTrue(modular.is_prime(2))
+        self.assertTrue(modular.is_prime(2**31 - 1))
+        self.assertFalse(modular.is_prime(1))
+        self.assertFalse(modular.is_prime(561))   # liczba Carmichaela
+        generator = modular.primes(100)
+        self.assertEqual([next(generator) for i in range(3)], [97, 89, 83])
+
+    def test_crt(self):
+        x = modular.crt(2, 3, 3, 5)
+        self.assertEqual((x % 3, x % 5), (2, 3))
+        self.assertEqual(modular.symmetric([0, 1, 6], 7), [0, 1, -1])
+
+    def test_gf_divmod(self):
+        p = self.p
+        a = modular.gf_reduce(self.random_list(20), p)
+        b = modular.gf_reduce(self.random_list(7), p)
+        q, r = modular.gf_divmod(a, b, p)
+        self.assertTrue(len(r) < len(b))
+        self.assertEqual(modular.gf_add(modular.gf_mul(b, q, p), r, p), a)
+
+    def test_gf_gcd(self):
+        for (p, threshold) in [(self.p, 2), (self.p, 5), (3, 2), (self.p, 128)]:
+            modular.HGCD_THRESHOLD = threshold
+            for i in range(20):
+                g = self.random_list(random.randint(0, 10))
+                a = modular.gf_mul(g, self.random_list(random.randint(0, 40)), p)
+                b = modular.gf_mul(g, self.random_list(random.randint(0, 40)), p)
+                self.assertEqual(modular.gf_gcd(a, b, p), self.euclid(a, b, p))
+
+    def test_gcd_integer(self):
+        for i in range(20):
+            g = self.random_list(random.randint(0, 10))
+            a = dense.mul(g, self.random_list(random.randint(0, 15)))
+            b = dense.mul(g, self.random_list(random.randint(0, 15)))
+            a = [item * 6 for item in a]
+            result = modular.gcd_subresultant(a, b)
+            self.assertEqual(modular.gcd_modular(a, b), result)
+            self.assertEqual(modular.gcd_integer(a, b), result)
+            self.assertEqual(dense.divmod(result, modular.primitive(g))[1],
+                [0] * (len(g) - 1))
+        self.assertEqual(modular.gcd_modular([2, 4], []), [1, 2])
+        self.assertEqual(modular.gcd_subresultant([6], [4, 2]), [2])
+
+    def test_resultant_integer(self):
+        self.assertEqual(modular.resultant_integer([-3, 1], [0, 0, 1]), 9)
+        self.assertEqual(modular.resultant_integer([1, 0, 1], [-2, 0, 1]), 9)
+        self.assertEqual(modular.resultant_integer([5], [0, 0, 1]), 25)
+        self.assertEqual(modular.resultant_integer([], [1, 1]), 0)
+        self.assertEqual(modular.resultant_integer([-1, 1], [-2, 2]), 0)
+        # res(a, b) = lc(a)**deg(b) * prod(b(x_i)), a(x) = 2*(x-1)*(x-3)
+        b = [5, -1, 2]
+        value = lambda x: b[0] + b[1] * x + b[2] * x * x
+        self.assertEqual(modular.resultant_integer([6, -8, 2], b),
+            2**2 * value(1) * value(3))
+
+    def test_multi_eval(self):
+        p = self.p
+        for threshold in (1, 4, 1000):
+            modular.SUBPRODUCT_THRESHOLD = threshold
+            for n in (1, 2, 7, 30):
+                a = modular.gf_reduce(self.random_list(n - 1), p)
+                points = random.sample(range(-p, p), n)
+                values = modular.gf_multi_eval(a, points, p)
+                self.assertEqual(values,
+                    [dense.horner(a, x) % p for x in points])
+                self.assertEqual(modular.gf_interpolate(points, values, p), a)
+        self.assertEqual(modular.gf_multi_eval([], [1, 2], p), [0, 0])
+        self.assertEqual(modular.gf_interpolate([], [], p), [])
+        self.assertRaises(ValueError, modular.gf_interpolate, [1, 1 + p],
+            [1, 2], p)
+
+    def test_taylor_shift(self):
+        p = self.p
+        self.assertEqual(modular.gf_taylor_shift([], 3, p), [])
+        for threshold in (2, 5, 1000):
+            modular.TAYLOR_SHIFT_THRESHOLD = threshold
+            for n in (1, 2, 9, 40):
+                a = self.random_list(n - 1)
+                self.assertEqual(modular.gf_taylor_shift(a, -5, p),
+                    modular.gf_reduce(dense.taylor_shift(a, -5), p))
+
+    def tearDown(self):
+        (modular.HGCD_THRESHOLD, modular.MODULAR_GCD_THRESHOLD,
+            modular.SUBPRODUCT_THRESHOLD,
+            modular.TAYLOR_SHIFT_THRESHOLD) = self.old_thresholds
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
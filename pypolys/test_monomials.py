@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import unittest
+import random
+from pypolys.monomials import MonomialPacker
+from pypolys.mpolys import Poly
+
+
+class TestMonomialPacker(unittest.TestCase):
+
+    def setUp(self):
+        self.packer = MonomialPacker(3, bits=7)
+        self.keys = [(0,), (1,), (0, 1), (0, 0, 1), (2, 1), (1, 0, 3),
+            (0, 2, 2), (5, 5, 5), (127, 0, 1)]
+
+    def test_pack(self):
+        packer = self.packer
+        self.assertEqual(packer.bits, 7)
+        for key in self.keys:
+            self.assertEqual(packer.unpack(packer.pack(key)), key)
+            self.assertEqual(packer.degree(packer.pack(key)), sum(key))
+        self.assertEqual(packer.pack((1, 0, 0)), packer.pack((1,)))
+        self.assertRaises(ValueError, packer.pack, (1, 2, 3, 4))
+        self.assertRaises(ValueError, packer.pack, (-1,))
+        self.assertRaises(ValueError, packer.pack, (128,))
+        packer = MonomialPacker(2, bits=100)   # bez struct
+        self.assertEqual(packer.unpack(packer.pack((2**90, 3))), (2**90, 3))
+
+    def test_order(self):
+        packer = self.packer
+        poly = lambda key: Poly(1, *key)
+        for key1 in self.keys:
+            for key2 in self.keys:
+                m1, m2 = packer.pack(key1), packer.pack(key2)
+                self.assertEqual(m1 < m2,
+                    poly(key1).key_deglex() < poly(key2).key_deglex())
+                self.assertEqual(packer.lex(m1) < packer.lex(m2),
+                    poly(key1).key_lex() < poly(key2).key_lex())
+
+    def test_mul(self):
+        packer = self.packer
+        self.assertEqual(packer.unpack(
+            packer.pack((1, 2)) + packer.pack((0, 1, 3))), (1, 3, 3))
+        self.assertFalse(packer.overflow(
+            packer.pack((64,)) + packer.pack((63,))))
+        self.assertTrue(packer.overflow(
+            packer.pack((64,)) + packer.pack((64,))))
+
+    def test_divides_lcm(self):
+        packer = self.packer
+        for i in range(100):
+            key1 = tuple(random.randint(0, 5) for j in range(3))
+            key2 = tuple(random.randint(0, 5) for j in range(3))
+            m1, m2 = packer.pack(key1), packer.pack(key2)
+            self.assertEqual(packer.divides(m1, m2),
+                all(x <= y for (x, y) in zip(key1, key2)))
+            self.assertEqual(packer.unpack(packer.lcm(m1, m2)),
+                packer.unpack(packer.pack(
+                tuple(max(x, y) for (x, y) in zip(key1, key2)))))
+            self.assertEqual(packer.degree(packer.lcm(m1, m2)),
+                sum(max(x, y) for (x, y) in zip(key1, key2)))
+
+    def test_fromkeys(self):
+        packer = MonomialPacker.fromkeys([(1, 2), (300,)], factor=2)
+        self.assertEqual(packer.nvars, 2)
+        self.assertEqual(packer.bits, 15)
+
+    def tearDown(self): pass
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
@@ -2,8 +2,14 @@
 
 import unittest
 import random
+import pickle
 from fractions import Fraction
-from pypolys.mpolys import Poly
+from pypolys.mpolys import Poly, FrozenPoly
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestPoly(unittest.TestCase):
@@ -89,6 +95,76 @@ class TestPoly(unittest.TestCase):
         self.assertEqual(self.y * 3, Poly(3, 0, 1))
         self.assertEqual(3 * self.z, Poly(3, 0, 0, 1))
 
+    def test_mul_packed(self):
+        x, y, z = self.x, self.y, self.z
+        p = x ** 300 * y + z ** 2 - 1
+        self.assertEqual(p * p, p._mul_tuples(p))
+        self.assertEqual(list(p * (z - z)), [])
+        self.assertEqual(list((x * z) * (x - x + z)), [(1, 0, 2)])
+        # Wykladniki ujemne, bez pakowania.
+        self.assertEqual(Poly(1, -1, 2) * Poly(1, 1), Poly(1, 0, 2))
+
+    def test_mul_heap(self):
+        x, y, z = self.x, self.y, self.z
+        p = (x + 2 * y - z + 1) ** 3
+        q = x * y - z ** 2 + 3
+        self.assertEqual(p._mul2(q), p._mul1(q))
+        self.assertEqual(p._mul2(3), 3 * p)
+        self.assertEqual(p._mul2(q - q), Poly())
+        self.assertEqual(Poly(1, -1, 2)._mul2(x), Poly(1, 0, 2))
+        for key in [None, Poly.key_lex, Poly.key_deglex]:
+            terms = list(p.iterproduct(q, key=key))
+            self.assertEqual(terms, (p * q).sorted_terms(key=key))
+            self.assertEqual(len(terms), len(p * q))
+        terms = list(p.iterproduct(q, key=Poly.key_lex))
+        keys = [Poly(1, *k).key_lex() for (k, c) in terms]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_sorted_terms(self):
+        x, y = self.x, self.y
+        p = x ** 2 + 2 * y ** 3 + 3 * x * y
+        self.assertEqual(p.sorted_terms(),
+            [((0, 3), 2), ((2,), 1), ((1, 1), 3)])
+        self.assertEqual(p.sorted_terms(key=Poly.key_lex),
+            [((2,), 1), ((1, 1), 3), ((0, 3), 2)])
+        self.assertEqual(Poly().sorted_terms(), [])
+
+    def test_inplace(self):
+        x, y = self.x, self.y
+        p = x + y
+        q = p
+        q += x
+        self.assertTrue(q is p)
+        self.assertEqual(p, 2 * x + y)
+        p -= 2 * x
+        self.assertEqual(list(p), [(0, 1)])
+        p += 1
+        self.assertEqual(p, y + 1)
+        self.assertEqual(p.degree(), 1)
+        p *= y - 1
+        self.assertEqual(p, y ** 2 - 1)
+        self.assertEqual(p.degree(), 2)   # cache skasowany
+        p *= Fraction(1, 2)
+        self.assertEqual(p, (y ** 2 - 1) / 2)
+        p += p
+        self.assertEqual(p, y ** 2 - 1)
+        p -= p
+        self.assertTrue(p.is_zero())
+        p = x ** 1
+        p += 1
+        self.assertEqual(self.x, Poly(1, 1))   # potega to kopia
+        self.assertTrue(isinstance(p.copy(), Poly))
+
+    def test_add_mul(self):
+        x, y, z = self.x, self.y, self.z
+        p = x * y
+        p.add_mul(x + 1, y - 1, -1)
+        self.assertEqual(p, x - y + 1)
+        p.add_mul(Poly(3, 0, 2), z)
+        self.assertEqual(p, x - y + 1 + 3 * y * y * z)
+        p.add_mul(Poly(1, 0, 0, 1), Poly(1, 0, 0, -1))   # klucz (0, 0, 0)
+        self.assertEqual(list(p.items()).count(((0,), 2)), 1)
+
     def test_pos_neg(self):
         self.assertEqual(+self.x, self.x)
         self.assertEqual(-self.x, Poly(-1, 1))
@@ -152,6 +228,96 @@ class TestPoly(unittest.TestCase):
             Poly(Fraction(3, 4), 1, 2))
         self.assertEqual(Poly(1.5, 1).integrate(0), Poly(0.75, 2))
 
+    def test_freeze(self):
+        p = Poly(1) + Poly(2, 1) + Poly(3, 0, 2)
+        p[(5, 1)] = 0   # zero nie trafia do wersji zamrozonej
+        f = p.freeze()
+        self.assertIsInstance(f, FrozenPoly)
+        self.assertEqual(f, p)
+        self.assertEqual(len(f), 3)
+        self.assertEqual(hash(f), hash((Poly(3, 0, 2) + Poly(2, 1) + 1).freeze()))
+        self.assertEqual(len(set([f, p.freeze(), (p + 1).freeze()])), 2)
+        self.assertRaises(TypeError, f.__setitem__, (0,), 5)
+        self.assertRaises(TypeError, f.__delitem__, (0,))
+        self.assertRaises(TypeError, f.pop, (0,))
+        self.assertRaises(TypeError, f.add_mul, f, f)
+        g = f
+        g += 1   # nowy wielomian, f bez zmian
+        self.assertIsNot(g, f)
+        self.assertEqual(f, p)
+        self.assertIsInstance(f * f, Poly)
+        self.assertNotIsInstance(f * f, FrozenPoly)
+        self.assertIs(+f, f)
+        self.assertIs(f.freeze(), f)
+        q = f.thaw()
+        q[(0,)] = 7
+        self.assertEqual(f[(0,)], 1)
+        repr(f)
+        self.assertEqual(pickle.loads(pickle.dumps(f)), f)
+        self.assertIsInstance(pickle.loads(pickle.dumps(f)), FrozenPoly)
+
+    def test_freeze_scalar_hash(self):
+        # Stale rowne liczbom maja ich hash (jeden element zbioru).
+        for (poly, number) in [(Poly(5), 5), (Poly(), 0),
+                (Poly(Fraction(1, 2)), Fraction(1, 2)), (Poly(2.5), 2.5)]:
+            f = poly.freeze()
+            self.assertEqual(f, number)
+            self.assertEqual(hash(f), hash(number))
+            self.assertEqual(len(set([f, number])), 1)
+        self.assertEqual(len(set([Poly(5).freeze(), Poly(5, 1).freeze(), 5])),
+            2)
+
+    def test_pos_copy(self):
+        p = Poly(1, 1)
+        q = +p
+        self.assertIsNot(q, p)
+        q += 1
+        self.assertEqual(p, Poly(1, 1))
+
+    def test_freeze_keys(self):
+        p = Poly._fromdict({(1, 0): 2, (1,): 3, (0, 1): 0})
+        self.assertEqual(dict(p.freeze()), {(1,): 5})
+
+    def test_eq_direct(self):
+        p = Poly._fromdict({(0,): 1, (1, 1): 0, (0, 2): 4})
+        self.assertEqual(p, Poly(1) + Poly(4, 0, 2))
+        self.assertEqual(Poly(1) + Poly(4, 0, 2), p)
+        self.assertNotEqual(p, Poly(1) + Poly(4, 2, 0))
+        self.assertEqual(Poly._fromdict({(0,): 3, (1,): 0}), 3)
+        self.assertNotEqual(Poly(3) + self.x, 3)
+        self.assertEqual(Poly._fromdict({(1,): 0}), 0)
+
+    def test_order(self):
+        x, y = self.x, self.y
+        self.assertTrue(Poly(1) < y)
+        self.assertTrue(y < x)   # x > y
+        self.assertTrue(x < y * y)   # deglex
+        self.assertTrue(x.sort_key(Poly.key_lex) > (y * y).sort_key(Poly.key_lex))
+        self.assertTrue(-x < Poly(-5))
+        self.assertTrue(x * y >= x * y)
+        items = [x * y, Poly(3), -y, Poly(), x - 1]
+        self.assertEqual(sorted(items), [-y, Poly(), Poly(3), x - 1, x * y])
+        for key in (Poly.key_lex, Poly.key_deglex):
+            result = sorted(items, key=lambda p: p.sort_key(key))
+            for (p, q) in zip(result, result[1:]):
+                self.assertTrue((q - p).leading_coefficient(key=key) > 0)
+        self.assertTrue(1j * x > x * 0.5j)
+        self.assertEqual(sorted([1j * x, -1j * y, y + 1]),
+            [-1j * y, y + 1, 1j * x])
+        self.assertRaises(ValueError, x.sort_key, len)
+
+    def test_parse(self):
+        self.assertEqual(Poly.parse("3*x**2 + 5*y*z - 1/2", "x, y, z"),
+            3 * self.x ** 2 + 5 * self.y * self.z - Fraction(1, 2))
+        self.assertEqual(Poly.parse("x*y^2 - y*x*y", ["x", "y"]), Poly())
+        self.assertEqual(Poly.parse("(2/3)*z", "x y z"),
+            Fraction(2, 3) * self.z)
+        p = Poly(Fraction(-1, 2), 1, 2) + Poly(-3) + Poly(1, 0, 0, 1)
+        self.assertEqual(Poly.parse(repr(p)), p)
+        self.assertEqual(dict(Poly.parse("Poly(2, 0, 0) + 1")), {(0,): 3})
+        self.assertRaises(ValueError, Poly.parse, "x + 1")
+        self.assertRaises(ValueError, Poly.parse, "(x + y)*x", "x, y")
+
     def test_combine(self):
         self.assertEqual(Poly(1, 3).combine(Poly(1, 2), var=0), Poly(1, 6))
         self.assertEqual((self.x ** 3).combine(self.y ** 2, var=0), self.y ** 6)
@@ -166,6 +332,102 @@ class TestPoly(unittest.TestCase):
         self.assertEqual(Poly(1, 0, 3).combine(2, var=1), 8)
         self.assertEqual((Poly(3, 1, 2) + Poly(5, 0, 2, 1)).combine(
             2 * self.x, var=1), Poly(12, 3) + Poly(20, 2, 0, 1))
+        p = Poly()
+        for i in range(12):
+            p += Poly(random.randint(-9, 9), random.randint(0, 9),
+                random.randint(0, 3), random.randint(0, 2))
+        q = self.x + self.y * self.z + 2
+        for var in (0, 1, 2, 3):
+            self.assertEqual(p._combine2(q, var), p._combine1(q, var))
+
+    def test_eval_many(self):
+        p = 3 * self.x ** 2 + 5 * self.y * self.z - 1
+        points = [(0, 0, 0), (1, 2, 3), (2, 0, 1), (Fraction(1, 2), 1, 1)]
+        self.assertEqual(p.eval_many(points), [-1, 32, 11, Fraction(19, 4)])
+        self.assertEqual(p.eval_many([(0.5, 1.0, 1.0)]), [4.75])
+        self.assertEqual(Poly(7).eval_many([(1,), (2,)]), [7, 7])
+        self.assertEqual(Poly().eval_many([(1,), (2,)]), [0, 0])
+        p = (self.x + self.y) ** 5 * self.z ** 3
+        point = (2, 3, 5)
+        self.assertEqual(p.eval_many([point]), [5 ** 5 * 5 ** 3])
+
+    def test_compile(self):
+        p = 3 * self.x ** 2 + 5 * self.y * self.z - 1
+        f = p.compile()
+        self.assertEqual(f(1, 2, 3), 32)
+        self.assertEqual(f(Fraction(1, 2), 1, 1), Fraction(19, 4))
+        self.assertEqual(Poly().compile()(1, 2), 0)
+        self.assertEqual(Poly(7).compile()(3), 7)
+        p = (self.x + 2 * self.y + self.z + 1) ** 6   # bez generowania kodu
+        f = p.compile()
+        point = (1, -2, 3)
+        self.assertEqual(f(*point), p.eval_many([point])[0])
+        self.assertEqual(f(*point), 1)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_eval_many_numpy(self):
+        p = 3 * self.x ** 2 + 5 * self.y * self.z - 1
+        points = numpy.array([(0.0, 0.0, 0.0), (1.0, 2.0, 3.0), (2.0, 0.0, 1.0)])
+        self.assertEqual(list(p.eval_many(points)), [-1.0, 32.0, 11.0])
+        p = Poly(Fraction(1, 2), 1)
+        values = p.eval_many(numpy.array([[1], [2], [3]]))
+        self.assertEqual(list(values), [Fraction(1, 2), 1, Fraction(3, 2)])
+        values = (self.x * self.y).eval_many(numpy.array([[10**10, 10**10]]))
+        self.assertEqual(list(values), [10**20])
+
+    def test_cache(self):
+        p = self.x + self.y
+        self.assertEqual(p.key_lex(), (0, 1))
+        self.assertEqual(p.leading_term(key=Poly.key_lex), self.x)
+        p[(2,)] = 5
+        self.assertEqual(p.key_lex(), (0, 2))
+        self.assertEqual(p.leading_term(key=Poly.key_lex), Poly(5, 2))
+        self.assertEqual(p.degree(), 2)
+        p[0, 0, 3] = 1
+        self.assertEqual(p.degree(), 3)
+        self.assertEqual(p.key_deglex(), (3, 0, 0, 3))
+        del p[0, 0, 3]
+        self.assertEqual(p.key_deglex(), (2, 2))
+        p.clear()
+        self.assertTrue(p.is_zero())
+        self.assertEqual(p.degree(), 0)
+
+    def test_reduce(self):
+        x, y = self.x, self.y
+        f = x ** 2 * y + x * y ** 2 + y ** 2
+        q, r = f.reduce([x * y - 1, y ** 2 - 1], key=Poly.key_lex)
+        self.assertEqual(q, [x + y, Poly(1)])
+        self.assertEqual(r, x + y + 1)
+        q, r = f.reduce([y ** 2 - 1, x * y - 1], key=Poly.key_lex)
+        self.assertEqual(q, [x + 1, x])
+        self.assertEqual(r, 2 * x + 1)
+        q, r = (x ** 2 - y ** 2).reduce([x - y])
+        self.assertEqual((q, r), ([x + y], Poly()))
+        q, r = (x + 1).reduce([Poly(2)])
+        self.assertEqual((q, r), ([(x + 1) / 2], Poly()))
+        self.assertRaises(ZeroDivisionError, x.reduce, [Poly()])
+        self.assertRaises(ValueError, x.reduce, [Poly(1, -1)])
+        # Przepelnienie pol przy porzadku lex.
+        q, r = (x ** 3).reduce([x - y ** 200], key=Poly.key_lex)
+        self.assertEqual(r, y ** 600)
+
+    def test_reduce_random(self):
+        x, y, z = self.x, self.y, self.z
+        variables = [x, y, z]
+        random_poly = lambda n: sum((random.randint(-5, 5) *
+            random.choice(variables) ** random.randint(0, 3) *
+            random.choice(variables) ** random.randint(0, 2)
+            for i in range(n)), Poly())
+        for key in [Poly.key_lex, Poly.key_deglex]:
+            divisors = [x * y - z + 1, y ** 2 - 2 * x, z ** 2 + x]
+            f = random_poly(12)
+            q, r = f.reduce(divisors, key=key)
+            self.assertEqual(sum((a * b for (a, b) in zip(q, divisors)),
+                Poly()) + r, f)
+            leading = [d.leading_monomial(key=key) for d in divisors]
+            for term in r.iterterms():
+                for monomial in leading:
+                    self.assertRaises(ValueError, lambda: term / monomial)
 
     def test_sort(self):
         lex_list = [Poly(1), self.z, self.z ** 2, 
@@ -2,8 +2,15 @@
 
 import unittest
 import random
+import pickle
 from fractions import Fraction
-from pypolys.polys import Poly
+from pypolys.polys import Poly, FrozenPoly
+from pypolys.domains import GF, QQ, ZZ
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class TestPoly(unittest.TestCase):
@@ -64,16 +71,188 @@ class TestPoly(unittest.TestCase):
         self.assertEqual(self.x2 * 3, Poly(3, 2))
         self.assertEqual(3 * self.x2, Poly(3, 2))
 
+    def test_mul_dense(self):
+        p = Poly.fromiterable(random.randint(-9, 9) for i in range(100))
+        q = Poly.fromiterable(random.randint(-9, 9) for i in range(300))
+        self.assertEqual(p * q, p._mul1(q))
+        self.assertEqual(q * q, q._mul1(q))
+        p = Poly.fromiterable(Fraction(i, 7) for i in range(60))
+        self.assertEqual(p * p, p._mul1(p))
+        p = Poly.fromiterable(random.randint(-10**9, 10**9) for i in range(500))
+        self.assertEqual(p * p, p._mul1(p))
+        p = Poly(1, 1000) + Poly(2, 500) + Poly(3)   # rzadki
+        self.assertEqual(p * p, p._mul1(p))
+
+    def test_inplace(self):
+        p = self.x1 + 1
+        q = p
+        q += self.x2
+        self.assertTrue(q is p)
+        self.assertEqual(p, self.x2 + self.x1 + 1)
+        p -= self.x1
+        self.assertEqual(p, self.x2 + 1)
+        self.assertEqual(sorted(p), [0, 2])
+        p += p
+        self.assertEqual(p, 2 * self.x2 + 2)
+        p -= p
+        self.assertTrue(p.is_zero())
+        p = self.x1 + 1
+        self.assertEqual(p.degree(), 1)
+        p *= self.x1 - 1
+        self.assertEqual(p, self.x2 - 1)
+        self.assertEqual(p.degree(), 2)   # cache skasowany
+        p *= 3
+        self.assertEqual(p, 3 * self.x2 - 3)
+        p *= 0
+        self.assertTrue(p.is_zero())
+        p = self.x1 ** 1
+        p += 1
+        self.assertEqual(self.x1, Poly(1, 1))   # potega to kopia
+        self.assertTrue(isinstance(p.copy(), Poly))
+
+    def test_add_mul(self):
+        p = Poly(1)
+        p.add_mul(self.x1 + 1, self.x1 - 1, 2)
+        self.assertEqual(p, 2 * self.x2 - 1)
+        p.add_mul(p, p)
+        self.assertEqual(p, (2 * self.x2 - 1) * (2 * self.x2))
+        a = Poly.fromiterable(range(1, 40))
+        b = Poly.fromiterable(range(5, 45))
+        p = Poly(7)
+        p.add_mul(a, b, Fraction(1, 2))
+        self.assertEqual(p, 7 + a * b / 2)
+
+    def test_tolist(self):
+        self.assertEqual(Poly().tolist(), [])
+        self.assertEqual(self.x2.tolist(), [0, 0, 1])
+        self.assertEqual((self.x1 + 3).tolist(), [3, 1])
+
     def test_pos_neg(self):
         self.assertEqual(+self.x1, self.x1)
         self.assertEqual(-self.x1, Poly(-1, 1))
         self.assertEqual(-self.x2, Poly(-1, 2))
 
+    def test_freeze(self):
+        p = Poly(1) + Poly(2, 1) + Poly(3, 2)
+        p[5] = 0   # zero nie trafia do wersji zamrozonej
+        f = p.freeze()
+        self.assertIsInstance(f, FrozenPoly)
+        self.assertEqual(f, p)
+        self.assertEqual(len(f), 3)
+        self.assertEqual(hash(f), hash((Poly(3, 2) + Poly(2, 1) + 1).freeze()))
+        self.assertEqual(len(set([f, p.freeze(), (p + 1).freeze()])), 2)
+        self.assertRaises(TypeError, f.__setitem__, 0, 5)
+        self.assertRaises(TypeError, f.__delitem__, 0)
+        self.assertRaises(TypeError, f.pop, 0)
+        self.assertRaises(TypeError, f.add_mul, f, f)
+        g = f
+        g += 1   # nowy wielomian, f bez zmian
+        self.assertIsNot(g, f)
+        self.assertEqual(f, p)
+        self.assertIsInstance(f * f, Poly)
+        self.assertNotIsInstance(f * f, FrozenPoly)
+        self.assertIs(+f, f)
+        self.assertIs(f.freeze(), f)
+        q = f.thaw()
+        q[0] = 7
+        self.assertEqual(f[0], 1)
+        repr(f)
+        self.assertEqual(pickle.loads(pickle.dumps(f)), f)
+        self.assertIsInstance(pickle.loads(pickle.dumps(f)), FrozenPoly)
+
+    def test_freeze_scalar_hash(self):
+        # Stale rowne liczbom maja ich hash (jeden element zbioru).
+        for (poly, number) in [(Poly(5), 5), (Poly(), 0),
+                (Poly(Fraction(1, 2)), Fraction(1, 2)), (Poly(2.5), 2.5)]:
+            f = poly.freeze()
+            self.assertEqual(f, number)
+            self.assertEqual(hash(f), hash(number))
+            self.assertEqual(len(set([f, number])), 1)
+        self.assertEqual(len(set([Poly(5).freeze(), Poly(5, 1).freeze(), 5])),
+            2)
+
+    def test_pos_copy(self):
+        p = Poly(1, 1)
+        q = +p
+        self.assertIsNot(q, p)
+        q += 1
+        self.assertEqual(p, Poly(1, 1))
+
+    def test_eq_direct(self):
+        p = Poly._fromdict({0: 1, 2: 0, 3: 4})
+        self.assertEqual(p, Poly(1) + Poly(4, 3))
+        self.assertEqual(Poly(1) + Poly(4, 3), p)
+        self.assertNotEqual(p, Poly(1) + Poly(4, 2))
+        self.assertEqual(Poly._fromdict({0: 3, 1: 0}), 3)
+        self.assertNotEqual(Poly(3) + Poly(1, 1), 3)
+        self.assertEqual(Poly._fromdict({1: 0}), 0)
+
+    def test_order(self):
+        x = Poly(1, 1)
+        self.assertTrue(Poly(1) < x)
+        self.assertTrue(-x < Poly(-5))
+        self.assertTrue(x < x + 1)
+        self.assertTrue(x + 1 <= Poly(2, 1))
+        self.assertTrue(x * x > 100 * x)
+        self.assertTrue(x >= x)
+        self.assertFalse(x < 2)
+        items = [x * x, Poly(3), -x, Poly(), x - 1, Poly(-2)]
+        self.assertEqual(sorted(items),
+            [-x, Poly(-2), Poly(), Poly(3), x - 1, x * x])
+        p = Poly._fromdict({0: 1, 5: 0})
+        self.assertEqual(p.sort_key(), Poly(1).sort_key())
+        # zespolone wg (Re, Im)
+        items = [Poly(1j, 1), Poly(1, 1), Poly(-1j), Poly(2), Poly(1 - 1j, 1)]
+        self.assertEqual(sorted(items), [Poly(-1j), Poly(2), Poly(1j, 1),
+            Poly(1 - 1j, 1), Poly(1, 1)])
+        self.assertTrue(Poly(1j) > 0)
+
+    def test_parse(self):
+        self.assertEqual(Poly.parse("3*x**2 + 5*x - 1/2"),
+            Poly(3, 2) + Poly(5, 1) + Poly(Fraction(-1, 2)))
+        self.assertEqual(Poly.parse("x^2 - (1/3)*x + 2*x*x - 3*x**2"),
+            Poly(Fraction(-1, 3), 1))
+        self.assertEqual(Poly.parse("-t**2 + 2**3", variables="t"),
+            Poly(-1, 2) + Poly(8))
+        self.assertEqual(Poly.parse(" x - x "), Poly())
+        self.assertEqual(Poly.parse("0.5*x/2"), Poly(0.25, 1))
+        self.assertIsInstance(Poly.parse("4/2")[0], int)
+        p = (Poly(Fraction(1, 2), 1) + Poly(-3) + Poly(1.5, 2) +
+            Poly(2-1j, 3) + Poly(1e-300, 5))
+        self.assertEqual(Poly.parse(repr(p)), p)
+        self.assertEqual(Poly.parse("Poly()"), Poly())
+        p = Poly.fromiterable(range(-500, 500))
+        self.assertEqual(Poly.parse(repr(p)), p)
+        self.assertEqual(Poly.parse("3*x + 6", domain=GF(5)).domain, GF(5))
+        for text in ["", "x +", "2x", "x*y", "1/x", "(x + 1)*x", "x**y",
+                "Poly(1, 2, 3)", "x $ 1"]:
+            self.assertRaises(ValueError, Poly.parse, text)
+
     def test_combine(self):
         self.assertEqual(self.x3.combine(self.x2), Poly(1, 6))
         self.assertEqual(self.x2.combine(self.x3), Poly(1, 6))
         self.assertEqual(self.x2.combine(self.x1 + Poly(3)), 
             self.x2 + Poly(6, 1) + Poly(9))
+        self.assertEqual(self.x2.combine(Poly(5)), Poly(25))
+        self.assertEqual(self.x2.combine(Poly(2, 1) - 1),
+            Poly(4, 2) - Poly(4, 1) + 1)
+        p = Poly.fromiterable([random.randint(-9, 9) for i in range(40)])
+        for q in [Poly(1, 1) + 3, Poly.fromiterable([1, -1, 2]),
+                  Poly(1, 1), Poly(Fraction(1, 2), 2) + Poly(1, 1)]:
+            self.assertEqual(p._combine2(q), p._combine1(q))
+        q = Poly.fromiterable([1, 2, 3], GF(7))
+        self.assertEqual(p.combine(q), p.todomain(GF(7))._combine1(q))
+        self.assertEqual(p.combine(q).domain, GF(7))
+
+    def test_shift(self):
+        p = Poly.fromiterable([1, 2, 3])   # 3*x**2 + 2*x + 1
+        self.assertEqual(p.shift(1), Poly.fromiterable([6, 8, 3]))
+        self.assertEqual(p.shift(0), p)
+        self.assertEqual(Poly().shift(5), Poly())
+        p = Poly.fromiterable([random.randint(-9, 9) for i in range(300)])
+        q = p.todomain(GF(1000003))
+        self.assertEqual(q.shift(-12), p.shift(-12).todomain(GF(1000003)))
+        self.assertEqual(q.shift(-12).shift(12), q)
 
     def test_pow(self):
         self.assertEqual(self.x1 ** 3, self.x3)
@@ -87,6 +266,67 @@ class TestPoly(unittest.TestCase):
         self.assertEqual(self.x2.eval(2), 4)
         self.assertEqual(self.x3.eval(3), 27)
 
+    def test_eval_many(self):
+        p = Poly(2, 3) + Poly(-1, 1) + 4
+        xs = [0, 1, 2, Fraction(1, 2), 0.5]
+        self.assertEqual(p.eval_many(xs), [p.eval(x) for x in xs])
+        self.assertIsInstance(p.eval_many(xs)[3], Fraction)
+        self.assertEqual(Poly().eval_many([1, 2]), [0, 0])
+        self.assertEqual(p.eval_many([]), [])
+
+    def test_multi_eval(self):
+        p = Poly(2, 3) + Poly(-1, 1) + 4
+        xs = [0, 1, 2, Fraction(1, 2), 0.5]
+        self.assertEqual(p.multi_eval(xs), [p.eval(x) for x in xs])
+        self.assertEqual(Poly().multi_eval([1, 2]), [0, 0])
+        q = p.todomain(GF(101))
+        xs = list(range(-100, 100, 3))
+        self.assertEqual(q.multi_eval(xs), [q.eval(x) for x in xs])
+
+    def test_interpolate(self):
+        p = Poly(2, 3) + Poly(-1, 1) + 4
+        xs = [0, 1, 2, Fraction(1, 2)]
+        self.assertEqual(Poly.interpolate(xs, p.multi_eval(xs)), p)
+        self.assertEqual(Poly.interpolate([], []), Poly())
+        self.assertRaises(ValueError, Poly.interpolate, [1, 1], [2, 3])
+        self.assertRaises(ValueError, Poly.interpolate, [1, 2], [2])
+        q = Poly.interpolate(range(300), [x * x for x in range(300)], GF(1009))
+        self.assertEqual(q, Poly(1, 2).todomain(GF(1009)))
+        self.assertEqual(q.domain, GF(1009))
+        q = Poly.interpolate([0, 1, 2], [0, 1, 5], ZZ)   # wynik w QQ
+        self.assertEqual(q, Poly(Fraction(3, 2), 2) + Poly(Fraction(-1, 2), 1))
+        self.assertEqual(q.domain, QQ)
+
+    def test_compile(self):
+        p = Poly(2, 3) + Poly(-1, 1) + 4
+        f = p.compile()
+        for x in [0, 1, -2, Fraction(1, 3), 0.25]:
+            self.assertEqual(f(x), p.eval(x))
+        self.assertEqual(Poly().compile()(5), 0)
+        self.assertEqual(Poly(1, 7).compile()(2), 128)
+        p = Poly.fromiterable(range(100))   # bez generowania kodu
+        f = p.compile()
+        self.assertEqual(f(3), p.eval(3))
+        self.assertEqual(f(Fraction(1, 2)), p.eval(Fraction(1, 2)))
+        p = Poly(3, 50) + Poly(1, 10)   # przerwy w wykladnikach
+        self.assertEqual(p.compile()(2), p.eval(2))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_eval_many_numpy(self):
+        p = Poly(2, 3) + Poly(-1, 1) + 4
+        xs = numpy.linspace(-1.0, 1.0, 11)
+        values = p.eval_many(xs)
+        for (x, value) in zip(xs, values):
+            self.assertAlmostEqual(value, p.eval(float(x)))
+        p = Poly(Fraction(1, 3), 2)
+        values = p.eval_many(numpy.arange(4))
+        self.assertEqual(list(values), [Fraction(i * i, 3) for i in range(4)])
+        # int wspolczynniki i duze punkty bez przepelnienia int64
+        values = Poly(1, 2).eval_many(numpy.array([10**10, 3]))
+        self.assertEqual(list(values), [10**20, 9])
+        values = Poly(2**70, 1).eval_many(numpy.array([1, 2]))
+        self.assertEqual(list(values), [2**70, 2**71])
+
     def test_diff(self):
         self.assertEqual(self.x0.diff(), Poly())
         self.assertEqual(self.x1.diff(), self.x0)
@@ -118,11 +358,89 @@ class TestPoly(unittest.TestCase):
         self.assertRaises(ValueError, lambda: self.x3 / (self.x2 + self.x1))
         self.assertRaises(ValueError, lambda: (self.x3 + self.x2) / self.x1)
 
+    def test_divmod(self):
+        p = Poly(1, 3) + Poly(-2, 2) + Poly(-4)   # x**3 - 2*x**2 - 4
+        q = self.x1 - 3
+        self.assertEqual(divmod(p, q),
+            (self.x2 + self.x1 + Poly(3), Poly(5)))
+        self.assertEqual(p // q, self.x2 + self.x1 + Poly(3))
+        self.assertEqual(p % q, Poly(5))
+        self.assertEqual(divmod(self.x1, self.x2), (Poly(), self.x1))
+        self.assertEqual(divmod(p, 2), (p / 2, Poly()))
+        self.assertEqual(self.x2 // (2 * self.x1), Poly(Fraction(1, 2), 1))
+        self.assertIsInstance((self.x2 // Poly(3))[2], Fraction)
+        self.assertRaises(ZeroDivisionError, lambda: p // Poly())
+        q, r = divmod(Poly(1.0, 2) + 1.0, Poly(2.0, 1))
+        self.assertEqual((q, r), (Poly(0.5, 1), Poly(1.0)))
+
+    def test_divmod_newton(self):
+        a = Poly.fromiterable(random.randint(-9, 9) for i in range(300))
+        b = Poly.fromiterable([random.randint(-9, 9) for i in range(120)] + [7])
+        q, r = divmod(a, b)
+        self.assertTrue(r.degree() < b.degree())
+        self.assertEqual(b * q + r, a)
+        self.assertEqual((a * b) // b, a)
+        self.assertEqual((a * b + r) % b, r)
+
     def test_lcm(self):
         self.assertEqual(self.x2.lcm(1), self.x2)
         self.assertEqual(self.x2.lcm(self.x3), self.x3)
-        self.assertRaises(ValueError, lambda: self.x1.lcm(self.x2 + self.x3))
-        self.assertRaises(ValueError, lambda: (self.x1 + self.x2).lcm(self.x3))
+        self.assertEqual(self.x1.lcm(self.x2 + self.x3), self.x2 + self.x3)
+        self.assertEqual((self.x1 + self.x2).lcm(self.x3), self.x3 + Poly(1, 4))
+        p = (self.x1 - 1) * (self.x1 + 2)
+        q = 3 * (self.x1 - 1) * (self.x1 - 5)
+        self.assertEqual(p.lcm(q), (self.x1 - 1) * (self.x1 + 2) * (self.x1 - 5))
+        self.assertEqual(p.lcm(Poly()), Poly())
+
+    def test_gcd(self):
+        p = (self.x1 - 1) * (self.x1 + 2)
+        q = 3 * (self.x1 - 1) * (self.x1 - 5)
+        self.assertEqual(p.gcd(q), self.x1 - 1)
+        self.assertEqual(p.gcd(Poly()), p)
+        self.assertEqual(Poly().gcd(Poly()), Poly())
+        self.assertEqual(p.gcd(self.x1 + 7), Poly(1))
+        self.assertEqual((2 * p).gcd(4 * p), p)
+        p = Poly(Fraction(1, 2), 2) - Poly(Fraction(1, 2))   # (x**2-1)/2
+        self.assertEqual(p.gcd(Poly(Fraction(2, 3), 1) + Fraction(2, 3)),
+            self.x1 + 1)
+        # Duze stopnie, algorytm modularny.
+        g = Poly.fromiterable(random.randint(-9, 9) for i in range(20)) + self.x0
+        g = g + Poly(1, 20)
+        a = g * Poly.fromiterable(random.randint(-9, 9) for i in range(30))
+        b = g * (Poly.fromiterable(random.randint(-9, 9) for i in range(30))
+            + Poly(1, 30))
+        self.assertEqual(a.gcd(b) % g, Poly())
+        self.assertEqual(a % a.gcd(b), Poly())
+        self.assertEqual(b % a.gcd(b), Poly())
+        p = Poly(1.0, 2) - Poly(1.0)
+        self.assertEqual(p.gcd(Poly(2.0, 1) - Poly(2.0)), Poly(1.0, 1) - 1.0)
+
+    def test_xgcd(self):
+        p = (self.x1 - 1) * (self.x1 + 2)
+        q = 3 * (self.x1 - 1) * (self.x1 - 5)
+        g, s, t = p.xgcd(q)
+        self.assertEqual(g, self.x1 - 1)
+        self.assertEqual(s * p + t * q, g)
+        g, s, t = (self.x3 + 1).xgcd(self.x2)
+        self.assertEqual(g, Poly(1))
+        self.assertEqual(s * (self.x3 + 1) + t * self.x2, g)
+        self.assertEqual(Poly().xgcd(Poly()), (Poly(), Poly(), Poly()))
+
+    def test_resultant(self):
+        p = (self.x1 - 1) * (self.x1 + 2)
+        self.assertEqual(p.resultant(3 * (self.x1 - 1)), 0)
+        self.assertEqual(self.x2.resultant(self.x1 - 3), 9)   # p(3)
+        self.assertEqual((self.x1 - 3).resultant(self.x2), 9)
+        self.assertEqual((self.x2 + 1).resultant(self.x2 - 2), 9)
+        q = self.x3 - 2 * self.x1 + 5
+        r = self.x2 + 3 * self.x1 - 1
+        self.assertEqual(q.resultant(r), r.resultant(q))
+        self.assertEqual(q.resultant(self.x1 - 2), -q.eval(2))
+        self.assertEqual((self.x1 - 2).resultant(q), q.eval(2))
+        self.assertEqual((q / 2).resultant(r), Fraction(q.resultant(r), 4))
+        self.assertEqual(Poly(2).resultant(self.x3), 8)
+        self.assertEqual(Poly().resultant(self.x3), 0)
+        self.assertAlmostEqual((self.x2 + 1.0).resultant(self.x2 - 2.0), 9.0)
 
     def test_cancel(self):
         p1 = pow(self.x1 + 1, 2) - self.x2
@@ -130,6 +448,30 @@ class TestPoly(unittest.TestCase):
         p1 = self.x3 + Poly(-1, 3)
         self.assertEqual(p1.degree(), 0)
 
+    def test_cache(self):
+        p = self.x1 + self.x3
+        self.assertEqual(p.degree(), 3)
+        p[5] = 2
+        self.assertEqual(p.degree(), 5)
+        p[5] = 0
+        self.assertEqual(p.degree(), 3)
+        del p[3]
+        self.assertEqual(p.degree(), 1)
+        self.assertEqual(p.key_lex(), 1)
+        p.update({7: 1})
+        self.assertEqual(p.key_deglex(), 7)
+        p.pop(7)
+        self.assertEqual(p.degree(), 1)
+        p.setdefault(4, 3)
+        self.assertEqual(p.degree(), 4)
+        self.assertFalse(p.is_zero())
+        p.clear()
+        self.assertTrue(p.is_zero())
+        p |= {2: 1}
+        self.assertEqual(p.degree(), 2)
+        p.popitem()
+        self.assertEqual(p.degree(), 0)
+
     def test_sort(self):
         alist = [self.x0, self.x1, self.x2, self.x3]
         blist = list(alist)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+import unittest
+import threading
+from fractions import Fraction
+import pypolys
+from pypolys import profiling
+from pypolys.polys import Poly
+from pypolys.mpolys import Poly as MPoly
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.p = Poly.fromiterable([1, 2, 3])
+        self.q = Poly.fromiterable([Fraction(1, 2), 1])
+
+    def test_counters(self):
+        with pypolys.profile() as stats:
+            self.p * self.q
+            self.p * 2
+            repr(self.q)
+            MPoly(1, 1) * MPoly(2, 0, 1)
+        self.assertEqual(stats.calls["polys.Poly.__mul__"], 2)
+        self.assertEqual(stats.pairs["polys.Poly.__mul__"], 3 * 2 + 3)
+        self.assertEqual(stats.calls["polys.Poly.__repr__"], 1)
+        self.assertEqual(stats.calls["mpolys.Poly.__mul__"], 1)
+        self.assertEqual(stats.pairs["mpolys.Poly.__mul__"], 1)
+        self.assertTrue(stats.allocations > 0)
+        self.assertTrue(stats.fractions > 0)
+        self.assertIn("polys.Poly.__mul__", stats.report())
+        self.assertEqual(stats.as_dict()["calls"], stats.calls)
+
+    def test_fractions(self):
+        # Tylko wspolczynniki Fraction wielomianow z pypolys.
+        with pypolys.profile() as stats:
+            self.p * 2
+            Fraction(1, 3) + Fraction(1, 6)
+        self.assertEqual(stats.fractions, 0)
+        with pypolys.profile() as stats:
+            r = self.q * Poly(4, 1)   # Fraction(2) i 4
+            Poly(Fraction(1, 3), 2)
+            self.assertEqual(Poly._fromdict({1: Fraction(1, 5)})[1],
+                Fraction(1, 5))
+        self.assertEqual(r, Poly(2, 1) + Poly(4, 2))
+        self.assertEqual(stats.fractions, 3)
+        self.assertEqual(stats.calls["polys.Poly._fromdict"], 2)
+
+    def test_nested_time(self):
+        with pypolys.profile() as stats:
+            self.p ** 5
+        # Czas ** obejmuje zagniezdzone mnozenia.
+        self.assertEqual(stats.calls["polys.Poly.__pow__"], 1)
+        self.assertTrue(stats.calls["polys.Poly.__mul__"] >= 3)
+        self.assertTrue(stats.time["polys.Poly.__pow__"] >=
+            stats.time["polys.Poly.__mul__"])
+
+    def test_disabled(self):
+        # Poza blokiem with dzialaja oryginalne metody.
+        original = Poly.__dict__["__mul__"]
+        fromdict = Poly.__dict__["_fromdict"]
+        with pypolys.profile() as stats:
+            self.assertIsNot(Poly.__dict__["__mul__"], original)
+            self.assertIsNot(Poly.__dict__["_fromdict"], fromdict)
+        self.assertIs(Poly.__dict__["__mul__"], original)
+        self.assertIs(Poly.__dict__["_fromdict"], fromdict)
+        self.p * self.q
+        self.assertEqual(stats.calls.get("polys.Poly.__mul__", 0), 0)
+        self.assertEqual(Fraction(2, 4), Fraction(1, 2))
+
+    def test_nested(self):
+        with pypolys.profile() as stats1:
+            self.p + self.q
+            with pypolys.profile() as stats2:
+                self.p - self.q
+            self.assertTrue(profiling._active)
+        self.assertFalse(profiling._active)
+        self.assertEqual(stats1.calls["polys.Poly.__add__"], 1)
+        self.assertEqual(stats1.calls["polys.Poly.__sub__"], 1)
+        self.assertNotIn("polys.Poly.__add__", stats2.calls)
+        self.assertEqual(stats2.calls["polys.Poly.__sub__"], 1)
+
+    def test_exception(self):
+        with pypolys.profile() as stats:
+            self.assertRaises(ValueError, pow, self.p, -1)
+        self.assertEqual(stats.calls["polys.Poly.__pow__"], 1)
+        self.assertFalse(profiling._active)
+
+    def test_threads(self):
+        def worker():
+            for i in range(20):
+                self.p * self.p
+        with pypolys.profile() as stats:
+            threads = [threading.Thread(target=worker) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(stats.calls["polys.Poly.__mul__"], 80)
+
+    def tearDown(self): pass
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
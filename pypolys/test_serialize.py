@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import unittest
+import io
+import os
+import pickle
+from fractions import Fraction
+from pypolys.polys import Poly
+from pypolys.mpolys import Poly as MPoly
+from pypolys.domains import GF, QQ
+from pypolys import serialize
+
+
+class TestSerialize(unittest.TestCase):
+
+    def setUp(self):
+        self.polys = [
+            Poly(),
+            Poly(3) + Poly(-5, 1) + Poly(7, 200),
+            Poly(Fraction(-1, 3), 2) + Poly(Fraction(10**30, 7), 5),
+            Poly(0.25, 1) + Poly(-1e300, 3),
+            Poly(1j, 4) + Poly(complex(2.5, -1), 0),
+            Poly(2**100, 1) + Poly(-2**200 - 1, 2) + Poly(2**63, 3),
+            Poly(3, 5).todomain(GF(7)),
+            Poly(1, 2).todomain(QQ),
+            MPoly(),
+            MPoly(2, 1, 0, 3) + MPoly(-1, 0, 200) + MPoly(Fraction(1, 2)),
+            MPoly(0.5, 1, 1).todomain(None),
+            MPoly(4, 2, 1).todomain(GF(5)),
+        ]
+
+    def test_roundtrip(self):
+        for p in self.polys:
+            q = serialize.loads(serialize.dumps(p))
+            self.assertIs(type(q), type(p))
+            self.assertEqual(q, p)
+            self.assertEqual(q.domain, p.domain)
+            self.assertEqual(dict(q), dict((k, c) for (k, c) in p.items()
+                if c != 0))
+            for k in q:
+                self.assertIs(type(q[k]), type(p[k]))
+
+    def test_zero_terms(self):
+        p = Poly._fromdict({0: 1, 3: 0})
+        self.assertEqual(dict(serialize.loads(serialize.dumps(p))), {0: 1})
+
+    def test_frozen(self):
+        for p in (Poly(1, 2) + Poly(3), MPoly(1, 2, 1) - MPoly(1)):
+            f = p.freeze()
+            g = serialize.loads(serialize.dumps(f))
+            self.assertIsInstance(g, type(f))
+            self.assertEqual(g, f)
+            self.assertEqual(hash(g), hash(f))
+
+    def test_stream(self):
+        stream = io.BytesIO()
+        for p in self.polys:
+            serialize.dump(p, stream)
+        stream.seek(0)
+        for p in self.polys:
+            self.assertEqual(serialize.load(stream), p)
+        self.assertEqual(stream.read(), b"")
+
+    def test_pipe(self):
+        # Strumienie bez seek(): z peek() i bez buforowania.
+        data = b"".join(serialize.dumps(p) for p in self.polys)
+        for buffering in (-1, 0):
+            r, w = os.pipe()
+            os.write(w, data)
+            os.close(w)
+            with os.fdopen(r, "rb", buffering=buffering) as stream:
+                self.assertFalse(stream.seekable())
+                for p in self.polys:
+                    self.assertEqual(serialize.load(stream), p)
+                self.assertEqual(stream.read(), b"")
+
+    def test_stream_large(self):
+        # Wspolczynniki dluzsze niz bufor strumienia.
+        polys = [Poly(7 ** 100000, 1), Poly(1, 2), MPoly(-3 ** 50000, 1, 2)]
+        data = b"".join(serialize.dumps(p) for p in polys)
+        stream = io.BufferedReader(io.BytesIO(data), buffer_size=64)
+        for p in polys:
+            self.assertEqual(serialize.load(stream), p)
+        self.assertEqual(stream.read(), b"")
+
+    def test_large(self):
+        p = Poly.fromiterable((-1) ** k * k for k in range(1, 20000))
+        data = serialize.dumps(p)
+        self.assertLess(len(data), 8 * len(p))
+        self.assertLess(len(data), len(repr(p)) // 2)
+        self.assertEqual(serialize.loads(data), p)
+
+    def test_pickle(self):
+        for p in self.polys:
+            data = pickle.dumps(p)
+            q = pickle.loads(data)
+            self.assertIs(type(q), type(p))
+            self.assertEqual(q, p)
+            self.assertEqual(q.domain, p.domain)
+        # Wspolczynniki spoza formatu przez zwykly slownik.
+        p = Poly(Poly(1, 1), 2)
+        self.assertEqual(pickle.loads(pickle.dumps(p)), p)
+
+    def test_errors(self):
+        self.assertRaises(ValueError, serialize.loads, b"XYZ\x01\x00\x00\x00")
+        self.assertRaises(ValueError, serialize.loads, b"PYP\x09\x00\x00\x00")
+        data = serialize.dumps(Poly(5, 3) + Poly(1))
+        self.assertRaises(ValueError, serialize.loads, data[:-2])
+        self.assertRaises(ValueError, serialize.dumps, Poly("x", 1))
+
+    def tearDown(self): pass
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import unittest
+import math
+import random
+from fractions import Fraction
+from pypolys.polys import Poly
+from pypolys.mpolys import Poly as MPoly
+from pypolys.factory import PolyFactory
+from pypolys.series import OrthogonalSeries
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestOrthogonalSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = PolyFactory(Poly)
+        self.families = ["hermite", "chebyshev", "legendre"]
+
+    def expand(self, coefficients, family):
+        result = Poly()
+        for (k, c) in enumerate(coefficients):
+            result += getattr(self.factory, family)(n=k) * c
+        return result
+
+    def test_create(self):
+        s = OrthogonalSeries([1, 2, 0, 0])
+        self.assertEqual(s.tolist(), [1, 2])
+        self.assertEqual(s.degree(), 1)
+        self.assertEqual(s.family, "chebyshev")
+        self.assertRaises(ValueError, OrthogonalSeries, [1], "laguerre")
+        self.assertEqual(OrthogonalSeries([]).eval(3), 0)
+        self.assertEqual(OrthogonalSeries([5]).eval(3), 5)
+
+    def test_arithmetic(self):
+        s1 = OrthogonalSeries([1, 2, 3])
+        s2 = OrthogonalSeries([1, -2])
+        self.assertEqual(s1 + s2, OrthogonalSeries([2, 0, 3]))
+        self.assertEqual(s1 - s1, OrthogonalSeries())
+        self.assertEqual(-s2, OrthogonalSeries([-1, 2]))
+        self.assertEqual(2 * s2, OrthogonalSeries([2, -4]))
+        self.assertEqual(s2 + 1, OrthogonalSeries([2, -2]))
+        self.assertRaises(ValueError, lambda:
+            s1 + OrthogonalSeries([1], "legendre"))
+
+    def test_eval(self):
+        for family in self.families:
+            coefficients = [random.randint(-9, 9) for i in range(10)]
+            s = OrthogonalSeries(coefficients, family)
+            p = self.expand(coefficients, family)
+            for x in [0, 1, -2, Fraction(1, 3)]:
+                self.assertEqual(s(x), p.eval(x))
+            self.assertEqual(s.eval_many([0, 1]), [p.eval(0), p.eval(1)])
+
+    def test_chebyshev_float(self):
+        # T_k(cos t) = cos(k t), stopien 300 w float bez rozwijania.
+        coefficients = [random.random() for i in range(301)]
+        s = OrthogonalSeries(coefficients, "chebyshev")
+        x = 0.3
+        t = math.acos(x)
+        value = sum(c * math.cos(k * t) for (k, c) in enumerate(coefficients))
+        self.assertAlmostEqual(s(x), value, places=10)
+
+    def test_topoly(self):
+        for family in self.families:
+            coefficients = [random.randint(-9, 9) for i in range(10)]
+            s = OrthogonalSeries(coefficients, family)
+            p = self.expand(coefficients, family)
+            self.assertEqual(s.topoly(), p)
+            self.assertEqual(OrthogonalSeries.frompoly(p, family), s)
+        p = OrthogonalSeries([1, 2, 3]).topoly(MPoly)
+        self.assertEqual(p, MPoly(-2) + MPoly(2, 1) + MPoly(6, 2))
+        self.assertEqual(OrthogonalSeries.frompoly(Poly(1, 2)),
+            OrthogonalSeries([Fraction(1, 2), 0, Fraction(1, 2)]))
+        self.assertEqual(OrthogonalSeries.frompoly(Poly()), OrthogonalSeries())
+        self.assertIsInstance(OrthogonalSeries.frompoly(
+            Poly(2, 2) - 1).tolist()[2], int)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_eval_many_numpy(self):
+        s = OrthogonalSeries([1, 2, 3], "legendre")
+        xs = numpy.linspace(-1.0, 1.0, 11)
+        values = s.eval_many(xs)
+        self.assertIsInstance(values, numpy.ndarray)
+        for (x, value) in zip(xs, values):
+            self.assertAlmostEqual(value, s(x))
+        values = s.eval_many(numpy.arange(3))   # dokladnie, dtype=object
+        self.assertEqual(list(values), [s(0), s(1), s(2)])
+        s = OrthogonalSeries([1, 2, 3], "chebyshev")
+        values = s.eval_many(numpy.array([10**10, 2]))
+        self.assertEqual(list(values), [s(10**10), s(2)])
+
+    def tearDown(self): pass
+
+if __name__ == "__main__":
+
+    unittest.main()
+
+# EOF